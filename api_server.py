@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+성적 조회 JSON HTTP 서버 (표준 라이브러리만 사용, Streamlit 불필요)
+
+LMS 연동이나 알림 메일 발송처럼 화면이 필요 없는 시스템을 위한 진입점입니다.
+HTTP/1.1 keep-alive, 데이터 버전 기반 ETag(If-None-Match → 304), gzip 응답을 지원합니다.
+
+엔드포인트:
+    GET  /classes                           분반 목록과 데이터 버전
+    GET  /lookup?class=1분반&sid=0066       학생 한 명 (상세 성적 포함)
+    POST /lookup/batch                      여러 학생의 총점·등수
+         {"queries": [["1분반", "0066"], {"class_name": "2분반", "student_id": "0000"}]}
+
+사용법:
+    python api_server.py --host 127.0.0.1 --port 8502
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import grades
+from query_service import lookup_totals, submit_lookup
+
+# 한 번의 일괄 조회 요청에서 받는 최대 학생 수
+MAX_BATCH_SIZE = 10_000
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# 이보다 작은 응답은 압축하지 않음 (바이트)
+GZIP_MIN_BYTES = 1024
+
+class GradeRequestHandler(BaseHTTPRequestHandler):
+    """성적 조회 요청 처리기 (연결 유지를 위해 HTTP/1.1 사용)"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "GradeAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        snapshot = grades.get_snapshot()
+        if url.path == "/classes":
+            etag = _etag(snapshot, url.path)
+            if self._not_modified(etag):
+                return
+            # 분반 메타데이터만 사용 (샤드 저장소의 분반을 읽지 않음)
+            self._send_json({
+                "version": snapshot["version"],
+                "classes": {entry["name"]: entry["count"] for entry in grades.get_class_catalog()},
+            }, etag=etag)
+        elif url.path == "/lookup":
+            params = parse_qs(url.query)
+            class_name = params.get("class", [""])[0]
+            student_id = params.get("sid", [""])[0]
+            etag = _etag(snapshot, url.path, class_name, student_id)
+            if self._not_modified(etag):
+                return
+            result = submit_lookup(class_name, student_id, snapshot).result()
+            if result is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "존재하지 않는 분반 또는 학번입니다.")
+                return
+            self._send_json(result, etag=etag)
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "알 수 없는 경로입니다.")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/lookup/batch":
+            self._send_error(HTTPStatus.NOT_FOUND, "알 수 없는 경로입니다.")
+            return
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            self._send_error(HTTPStatus.LENGTH_REQUIRED, "Content-Length 헤더가 필요합니다.")
+            return
+        if not length.strip().isdigit():
+            # 본문 길이를 알 수 없으므로 응답 후 연결을 닫음
+            self.close_connection = True
+            self._send_error(HTTPStatus.BAD_REQUEST, f"잘못된 Content-Length: {length!r}")
+            return
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            # 본문을 읽지 않으므로 응답 후 연결을 닫음
+            self.close_connection = True
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "요청 본문이 너무 큽니다.")
+            return
+        body = self.rfile.read(length)
+        queries = _parse_queries(body)
+        if queries is None:
+            self._send_error(HTTPStatus.BAD_REQUEST,
+                             "본문은 {\"queries\": [[분반, 학번], ...]} 형식이어야 합니다 "
+                             "(분반·학번은 문자열).")
+            return
+        if len(queries) > MAX_BATCH_SIZE:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                             f"한 번에 최대 {MAX_BATCH_SIZE}명까지 조회할 수 있습니다.")
+            return
+        snapshot = grades.get_snapshot()
+        etag = _etag(snapshot, url.path, hashlib.sha1(body).hexdigest())
+        if self._not_modified(etag):
+            return
+        self._send_json({
+            "version": snapshot["version"],
+            "results": lookup_totals(queries, snapshot),
+        }, etag=etag)
+
+    def _not_modified(self, etag):
+        """요청의 If-None-Match가 현재 ETag와 같으면 304 응답 후 True 반환"""
+        if etag not in (self.headers.get("If-None-Match") or ""):
+            return False
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def _send_json(self, payload, status=HTTPStatus.OK, etag=None):
+        """JSON 응답 전송 (클라이언트가 허용하면 gzip 압축)"""
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        """오류 응답을 JSON으로 전송"""
+        self._send_json({"error": message}, status=status)
+
+    def log_message(self, format, *args):
+        # 요청마다 표준 오류로 출력하지 않음 (--verbose에서만 출력)
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def _etag(snapshot, *parts):
+    """데이터 버전과 요청 내용으로 ETag 생성"""
+    digest = hashlib.sha1("\x00".join((snapshot["version"],) + parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+def _parse_queries(body):
+    """
+    일괄 조회 요청 본문을 [(분반, 학번)] 리스트로 변환
+
+    Args:
+        body (bytes): 요청 본문 (JSON)
+
+    Returns:
+        list | None: [(분반, 학번)] 리스트, 형식이 잘못되었거나 분반·학번이 문자열이 아니면 None
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return None
+    items = payload.get("queries") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return None
+    queries = []
+    for item in items:
+        if isinstance(item, dict):
+            item = (item.get("class_name"), item.get("student_id"))
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            return None
+        if not all(isinstance(value, str) for value in item):
+            return None
+        queries.append((item[0], item[1]))
+    return queries
+
+def create_server(host="127.0.0.1", port=8502, verbose=False):
+    """
+    성적 조회 HTTP 서버 생성 (serve_forever()로 실행)
+
+    Args:
+        host (str): 바인드 주소
+        port (int): 포트 (0이면 임의 포트)
+        verbose (bool): 요청 로그 출력 여부
+
+    Returns:
+        ThreadingHTTPServer: 서버 객체
+    """
+    server = ThreadingHTTPServer((host, port), GradeRequestHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+def main():
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="성적 조회 JSON HTTP 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=8502, help="포트")
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+
+    grades.start_store_watcher()
+    grades.get_snapshot()  # 첫 요청 전에 스냅샷 준비
+    server = create_server(args.host, args.port, args.verbose)
+    print(f"성적 조회 API: http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,23 @@
 자바 프로그래밍 성적 조회 Streamlit 웹앱
 """
 
+import hmac
+import os
+import time
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from grades import (
-    get_grades_by_class, 
-    calc_score, 
-    get_all_scores, 
-    get_student_rank, 
-    get_student_data_dict,
-    get_available_classes
+    get_approximate_rank,
+    get_peer_classes,
+    get_rejected_rows,
+    get_section_stats,
+    get_shard_cache_info,
+    search_student_ids,
+    start_store_watcher
 )
+import metrics
+from query_service import submit_lookup, submit_snapshot
+from request_governor import DEBOUNCED, LIMITED, SessionGovernor, minimal_result, render_slot
 
 # 페이지 설정 (다크모드 지원)
 st.set_page_config(
@@ -52,37 +57,339 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def main():
-    """메인 앱 함수"""
+# 학번 목록 한 페이지에 표시할 버튼 수
+ID_PAGE_SIZE = 40
+
+# 관리자 디버그 화면 토큰 (설정하면 ?admin=<토큰> 주소에서만 디버그 화면 표시)
+ADMIN_TOKEN = os.environ.get("GRADES_ADMIN_TOKEN", "")
+
+# 분반별 차트 색상 (분반 순서대로 사용)
+CHART_COLORS = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'magenta', 'teal']
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_summary_frame(data_version, class_name, _section):
+    """분반 요약 표를 데이터 버전·분반별로 캐시 (모든 세션이 공유)"""
+    metrics.count("app.cache.summary_frame.miss")
+    from summary import build_summary_frame  # pandas는 요약 표가 필요할 때만 불러옴
+    return build_summary_frame(_section)
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_summary_csv(data_version, class_name, _section):
+    """
+    분반 요약 CSV 바이트를 데이터 버전·분반별로 한 번만 인코딩 (모든 세션이 공유)
     
-    # 앱 제목
-    st.markdown('<h1 class="main-header">📊 자바 프로그래밍 성적 조회</h1>', 
-                unsafe_allow_html=True)
+    Streamlit 1.37의 download_button은 전체 내용을 bytes 하나로 받으므로 스트리밍 대신
+    같은 bytes 객체를 재사용합니다 (summary.encode_summary_csv 참고).
+    """
+    metrics.count("app.cache.summary_csv.miss")
+    from summary import encode_summary_csv
+    summary_df, _ = load_summary_frame(data_version, class_name, _section)
+    return encode_summary_csv(summary_df)
+
+def get_smart_label_positions(chart_data):
+    """
+    스마트 라벨 위치 계산 (분반 수와 관계없이 항목별로 값 순서대로 위아래로 분리)
     
-    # 분반 선택 섹션
-    available_classes = get_available_classes()
+    Args:
+        chart_data (pandas.DataFrame): 항목(행) × 분반(열) 점수 표
     
-    col1, col2, col3 = st.columns([1, 2, 1])
+    Returns:
+        dict: {분반: 항목별 라벨 y 위치 리스트}
+    """
+    positions = {name: [] for name in chart_data.columns}
+    for _, row in chart_data.iterrows():
+        values = row.tolist()
+        # 값이 높은 분반부터 (같으면 뒤 분반이 위)
+        order = sorted(range(len(values)), key=lambda i: (-values[i], -i))
+        gaps = [values[order[k]] - values[order[k + 1]] for k in range(len(order) - 1)]
+        # 값이 가까우면 강제로 분리 (임계값 25), 충분히 떨어져 있으면 기본 위치
+        offset = 15 if gaps and min(gaps) < 25 else 8
+        for rank, i in enumerate(order):
+            shift = offset if len(order) == 1 else offset * (1 - 2 * rank / (len(order) - 1))
+            positions[chart_data.columns[i]].append(values[i] + shift)
+    return positions
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def load_section_chart(data_version, chart_classes, _section_stats):
+    """
+    분반 비교 차트를 데이터 버전·분반 구성별로 한 번만 생성 (모든 세션이 같은 Figure를 공유)
     
-    with col2:
-        st.write("### 🏫 분반을 선택하세요")
-        selected_class = st.selectbox(
-            "분반 선택",
-            available_classes,
-            index=0,
-            help="소속 분반을 선택하세요"
+    Args:
+        data_version (str): 스냅샷 버전 (캐시 키)
+        chart_classes (tuple): 차트에 표시할 분반 이름 (캐시 키)
+        _section_stats (dict): {분반: 통계} (캐시 키에서 제외)
+    
+    Returns:
+        plotly.graph_objects.Figure: 분반 비교 꺾은선 차트
+    """
+    metrics.count("app.cache.section_chart.miss")
+    
+    # 차트를 만들 때만 불러옴 (앱 시작 시 import 시간 단축)
+    import pandas as pd
+    import plotly.graph_objects as go
+    
+    # 차트 데이터 준비
+    chart_data = pd.DataFrame({
+        name: [_section_stats[name]["avg"], _section_stats[name]["max"], _section_stats[name]["min"]]
+        for name in chart_classes
+    }, index=["평균 점수", "최고 점수", "최저 점수"])
+    
+    # Plotly를 사용한 꺾은선 차트
+    fig = go.Figure()
+    
+    # 스마트 위치 계산
+    label_positions = get_smart_label_positions(chart_data)
+    colors = {name: CHART_COLORS[i % len(CHART_COLORS)] for i, name in enumerate(chart_classes)}
+    
+    # 분반별 텍스트
+    for name in chart_classes:
+        fig.add_trace(go.Scatter(
+            x=chart_data.index,
+            y=label_positions[name],
+            mode='text',
+            name=f'{name} 점수',
+            text=[f'{val:.1f}' for val in chart_data[name]],
+            textfont=dict(size=11, color=colors[name], family='Arial Black'),
+            showlegend=False,
+            hoverinfo='skip'
+        ))
+    
+    # 분반별 선
+    for name in chart_classes:
+        fig.add_trace(go.Scatter(
+            x=chart_data.index,
+            y=chart_data[name],
+            mode='lines+markers',
+            name=name,
+            line=dict(color=colors[name], width=4),
+            marker=dict(size=10, color=colors[name]),
+            hovertemplate=f'<b>{name}</b><br>%{{x}}: %{{y:.1f}}점<extra></extra>'
+        ))
+    
+    # 차트 레이아웃 설정
+    fig.update_layout(
+        title=dict(
+            text="분반별 점수 비교",
+            font=dict(size=16, color='#2E86C1')
+        ),
+        xaxis_title="항목",
+        yaxis_title="점수",
+        yaxis=dict(range=[-25, 125]),
+        height=500,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        ),
+        margin=dict(t=100, b=80, l=60, r=60),
+        font=dict(size=12),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    
+    return fig
+
+def count_rerun(region):
+    """
+    영역별 재실행 횟수를 세션과 전체 측정값에 기록
+    
+    Args:
+        region (str): 영역 이름 ("app", "lookup", "statistics")
+    """
+    counts = st.session_state.setdefault("rerun_counts", {})
+    counts[region] = counts.get(region, 0) + 1
+    metrics.count(f"app.rerun.{region}")
+
+def is_admin():
+    """현재 세션이 관리자 토큰으로 접속했는지 여부"""
+    token = st.query_params.get("admin", "")
+    if not ADMIN_TOKEN or not token:
+        return False
+    # 문자열 비교는 ASCII가 아닌 값에서 TypeError가 나므로 UTF-8 바이트로 비교
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+def debug_panel():
+    """관리자 디버그 화면 (세션 재실행 횟수, 단계별 시간, 캐시 적중률, 최근 측정 이벤트)"""
+    import pandas as pd
+    
+    with st.expander("🛠️ 디버그 (관리자)", expanded=False):
+        st.write("**세션 재실행 횟수**", dict(st.session_state.get("rerun_counts", {})))
+        shard_cache = get_shard_cache_info()
+        if shard_cache["sections"]:
+            st.write(f"**샤드 캐시** {shard_cache['used_bytes'] / 2**20:.1f} / "
+                     f"{shard_cache['budget_bytes'] / 2**20:.0f} MB", shard_cache["sections"])
+        # 샤드 저장소는 요약이 계산된 분반만 보고 (조회되지 않은 분반 파일은 읽지 않음)
+        rejected = get_rejected_rows()
+        if rejected:
+            st.write(f"**검증에서 제외된 행 ({len(rejected)}건)**")
+            st.dataframe(pd.DataFrame([
+                {"분반": item["class_name"], "학번": item["student_id"], "사유": item["reason"]}
+                for item in rejected
+            ]), use_container_width=True, hide_index=True)
+        if not metrics.is_enabled():
+            st.info("측정이 꺼져 있습니다. 환경 변수 GRADES_METRICS=ring 등으로 켜세요.")
+            return
+        values = metrics.snapshot()
+        if values["timers"]:
+            st.write("**단계별 소요 시간**")
+            st.dataframe(pd.DataFrame([
+                {"단계": name, "횟수": entry["count"], "평균(ms)": round(entry["avg_s"] * 1000, 3),
+                 "최대(ms)": round(entry["max_s"] * 1000, 3), "합계(s)": round(entry["total_s"], 3)}
+                for name, entry in sorted(values["timers"].items())
+            ]), use_container_width=True, hide_index=True)
+        counters = values["counters"]
+        caches = sorted({name.rsplit(".", 1)[0] for name in counters if name.startswith("app.cache.")})
+        if caches:
+            st.write("**캐시 적중률**")
+            rows = []
+            for cache in caches:
+                requests = counters.get(f"{cache}.request", 0)
+                misses = counters.get(f"{cache}.miss", 0)
+                rows.append({"캐시": cache, "요청": requests, "실패": misses,
+                             "적중률": f"{(requests - misses) / requests:.1%}" if requests else "-"})
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        st.write("**카운터**", counters)
+        ring = metrics.get_exporter(metrics.RingBufferExporter)
+        if ring is not None:
+            st.write("**최근 측정 이벤트**")
+            events = [(time.strftime("%H:%M:%S", time.localtime(at)), kind, name, value)
+                      for at, kind, name, value in ring.recent(50)]
+            st.dataframe(pd.DataFrame(events, columns=["시각", "종류", "이름", "값"]),
+                         use_container_width=True, hide_index=True)
+
+def toggle_id_list():
+    """학번 목록 열기/닫기 (버튼 콜백)"""
+    st.session_state['expander_open'] = not st.session_state.get('expander_open', False)
+
+def select_student_id(student_id):
+    """학번 버튼 콜백: 학번을 입력하고 자동 조회, 목록은 닫음"""
+    st.session_state['selected_student_id'] = student_id
+    st.session_state['auto_search'] = True
+    st.session_state['expander_open'] = False
+
+def set_id_page(page_key, page):
+    """학번 목록 페이지 이동 (버튼 콜백)"""
+    st.session_state[page_key] = page
+
+def render_result_details(snapshot, selected_class, sid, result):
+    """
+    조회 결과의 무거운 부분 (상세 성적표, 분반 전체 성적 요약 표, CSV 다운로드)
+    
+    Args:
+        snapshot (Mapping): 성적 스냅샷
+        selected_class (str): 선택된 분반
+        sid (str): 학번
+        result (dict): submit_lookup 결과 (detail 포함)
+    """
+    import pandas as pd  # 상세 성적표·요약 표를 그릴 때만 불러옴
+    
+    section = snapshot["sections"][selected_class]
+    
+    # 상세 성적 표시
+    st.write("### 📋 상세 성적표")
+    
+    # 상세 점수 데이터프레임 생성 (항목과 가중치는 분반의 성적 산출 정책에서 생성)
+    detail_rows = result["detail"]
+    detail_data = {
+        "항목": [name for name, _, _ in detail_rows],
+        "점수": [f"{value}점" for _, value, _ in detail_rows],
+        "가중치": [weight for _, _, weight in detail_rows]
+    }
+    
+    with metrics.timer("app.detail_table"):
+        df = pd.DataFrame(detail_data)
+    
+        # 스타일링된 데이터프레임 표시
+        st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "항목": st.column_config.TextColumn("항목", width="medium"),
+                "점수": st.column_config.TextColumn("점수", width="small"), 
+                "가중치": st.column_config.TextColumn("가중치", width="medium")
+            }
         )
-        
-        # 선택된 분반 정보 표시
-        grades_data = get_grades_by_class(selected_class)
-        total_students = len(grades_data)
-        
-        st.markdown(f"""
-        <div class="class-info">
-            <strong>📚 {selected_class}</strong><br>
-            <small>총 {total_students}명의 학생이 등록되어 있습니다</small>
-        </div>
-        """, unsafe_allow_html=True)
+    
+    # 전체 성적 다운로드 기능 (선택 옵션)
+    st.write(f"### 📊 {selected_class} 전체 성적 현황")
+    
+    with metrics.timer("app.summary_table"):
+        # 전체 성적 요약 표 (데이터 버전별로 한 번만 생성)
+        metrics.count("app.cache.summary_frame.request")
+        summary_df, summary_positions = load_summary_frame(
+            snapshot["version"], selected_class, section)
+    
+        # 현재 학생 행만 하이라이트 (표 전체를 행 단위로 순회하지 않음)
+        current_row = summary_positions[sid]
+        styled_df = summary_df.style.set_properties(
+            subset=pd.IndexSlice[current_row:current_row, :],
+            **{"background-color": "#FFE5B4"}
+        )
+        st.dataframe(styled_df, use_container_width=True, hide_index=True)
+    
+    # 다운로드 버튼 (CSV 바이트는 버전별로 한 번만 인코딩하여 모든 세션이 공유)
+    metrics.count("app.cache.summary_csv.request")
+    st.download_button(
+        label=f"📥 {selected_class} 전체 성적 CSV 다운로드",
+        data=load_summary_csv(snapshot["version"], selected_class, section),
+        file_name=f"java_programming_scores_{selected_class.replace('/', '_')}.csv",
+        mime="text/csv"
+    )
+
+def governed_lookup(snapshot, class_name, sid):
+    """
+    세션별 요청 제어를 거쳐 학생 조회
+    
+    같은 조회를 연달아 누르면 직전 결과를 재사용하고, 세션의 조회 한도를 넘으면
+    스냅샷에 미리 계산된 총점·등수만 읽습니다.
+    
+    Args:
+        snapshot (Mapping): 성적 스냅샷
+        class_name (str): 분반 이름
+        sid (str): 학번
+    
+    Returns:
+        tuple: (result, notice)
+            - result (dict | None): 조회 결과, 없는 학번이면 None
+            - notice (str | None): 간단한 결과로 대신한 이유 (정상 조회이면 None)
+    """
+    governor = st.session_state.get("governor")
+    if governor is None:
+        governor = st.session_state["governor"] = SessionGovernor()
+    key = (snapshot["version"], class_name, sid)
+    decision, retry_after = governor.check(key)
+    metrics.count(f"app.governor.{decision}")
+    if decision == LIMITED:
+        return (minimal_result(snapshot, class_name, sid),
+                f"조회 요청이 많아 약 {max(retry_after, 1):.0f}초 동안 총점과 등수만 표시합니다.")
+    if decision == DEBOUNCED:
+        return governor.last_result, None
+    # 조회 서비스에서 계산 (같은 학번을 동시에 조회하면 한 번만 계산됨)
+    with metrics.timer("app.lookup"):
+        result = submit_lookup(class_name, sid, snapshot).result()
+    governor.remember(key, result)
+    return result, None
+
+@st.fragment
+def lookup_panel(snapshot, selected_class):
+    """
+    학번 목록·학번 입력·조회 결과 영역 (이 영역의 조작은 이 영역만 다시 실행)
+    
+    학번 버튼을 누르면 조회 결과가 바로 바뀌어야 하므로 학번 목록도 같은 프래그먼트에 둡니다.
+    프래그먼트만 다시 실행될 때는 마지막 전체 실행의 스냅샷을 그대로 사용합니다.
+    
+    Args:
+        snapshot (Mapping): 이번 전체 실행에서 읽은 성적 스냅샷
+        selected_class (str): 선택된 분반
+    """
+    count_rerun("lookup")
+    section = snapshot["sections"][selected_class]
+    grades_data = section["grades"]
+    total_students = section["stats"]["count"]
     
     # 입력 섹션
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -97,9 +404,9 @@ def main():
         # Expander 토글 감지를 위한 버튼
         col_exp1, col_exp2 = st.columns([3, 1])
         with col_exp1:
-            if st.button(f"📝 {selected_class} 등록된 학번 목록 {'닫기' if is_expanded else '보기'}", key=f"toggle_expander_{selected_class}"):
-                st.session_state['expander_open'] = not is_expanded
-                st.rerun()
+            # 콜백에서 상태를 바꾸므로 이 프래그먼트만 다시 실행되어도 바로 반영됨
+            st.button(f"📝 {selected_class} 등록된 학번 목록 {'닫기' if is_expanded else '보기'}",
+                      key=f"toggle_expander_{selected_class}", on_click=toggle_id_list)
         
         if is_expanded:
             with st.container():
@@ -108,17 +415,24 @@ def main():
                 # 학번 검색 기능
                 search_term = st.text_input("🔍 학번 검색", placeholder="검색할 학번 입력 (예: 00)", key=f"search_{selected_class}")
                 
-                student_ids = list(grades_data.keys())
+                # 검색어가 바뀌면 첫 페이지로
+                page_key = f"id_page_{selected_class}"
+                if st.session_state.get(f"{page_key}_term") != search_term:
+                    st.session_state[f"{page_key}_term"] = search_term
+                    st.session_state[page_key] = 0
+                page = st.session_state.get(page_key, 0)
+                
+                # 인덱스에서 현재 페이지의 학번만 가져옴
+                match_count, student_ids = search_student_ids(
+                    selected_class, search_term,
+                    offset=page * ID_PAGE_SIZE, limit=ID_PAGE_SIZE, snapshot=snapshot
+                )
                 
-                # 검색어가 있으면 필터링
                 if search_term:
-                    filtered_ids = [sid for sid in student_ids if search_term in sid]
-                    if filtered_ids:
-                        st.write(f"**검색 결과: {len(filtered_ids)}개**")
-                        student_ids = filtered_ids
+                    if match_count:
+                        st.write(f"**검색 결과: {match_count}개**")
                     else:
                         st.write("⚠️ 검색 결과가 없습니다.")
-                        student_ids = []
                 
                 # 학번을 4개씩 한 줄에 표시
                 if student_ids:
@@ -128,11 +442,23 @@ def main():
                         col_idx = i % 4
                         with cols[col_idx]:
                             # 클릭 가능한 버튼으로 표시
-                            if st.button(f"`{student_id}`", key=f"btn_{selected_class}_{student_id}", help="클릭하면 자동으로 성적을 조회합니다"):
-                                st.session_state[f'selected_student_id'] = student_id
-                                st.session_state['auto_search'] = True
-                                st.session_state['expander_open'] = False  # expander 닫기
-                                st.rerun()
+                            st.button(f"`{student_id}`", key=f"btn_{selected_class}_{student_id}",
+                                      help="클릭하면 자동으로 성적을 조회합니다",
+                                      on_click=select_student_id, args=(student_id,))
+                
+                # 페이지 이동 (한 번에 ID_PAGE_SIZE개의 버튼만 표시)
+                page_count = max((match_count + ID_PAGE_SIZE - 1) // ID_PAGE_SIZE, 1)
+                if page_count > 1:
+                    col_prev, col_page, col_next = st.columns([1, 2, 1])
+                    with col_prev:
+                        st.button("◀ 이전", key=f"{page_key}_prev", disabled=page == 0,
+                                  on_click=set_id_page, args=(page_key, page - 1))
+                    with col_page:
+                        st.markdown(f"<div style='text-align: center;'>{page + 1} / {page_count} 페이지</div>",
+                                    unsafe_allow_html=True)
+                    with col_next:
+                        st.button("다음 ▶", key=f"{page_key}_next", disabled=page >= page_count - 1,
+                                  on_click=set_id_page, args=(page_key, page + 1))
         
         # 선택된 학번이 있으면 기본값으로 설정
         default_sid = st.session_state.get(f'selected_student_id', '')
@@ -153,115 +479,56 @@ def main():
         
         # 조회 로직
         if search_triggered:
-            if sid and sid in grades_data:
-                # 성적 데이터 가져오기
-                student_scores = grades_data[sid]
-                student_data = get_student_data_dict(student_scores)
-                total_score = calc_score(student_scores)
-                student_rank = get_student_rank(sid, selected_class)
+            # 요청 제어를 거쳐 조회 (제한에 걸리면 총점·등수만 담긴 간단한 결과)
+            result, notice = governed_lookup(snapshot, selected_class, sid) if sid else (None, None)
+            if result is not None:
+                total_score = result["total"]
+                student_rank = result["rank"]
                 
                 # 성공 메시지
                 st.success(f"**{selected_class} | 총점: {total_score}점** | **등수: {student_rank}/{total_students}등**", 
                           icon="✅")
                 
-                # 상세 성적 표시
-                st.write("### 📋 상세 성적표")
-                
-                # 상세 점수 데이터프레임 생성
-                detail_data = {
-                    "항목": [
-                        "중간고사",
-                        "중간 EXTRA", 
-                        "중간고사 합계 (중간+EXTRA)",
-                        "기말고사",
-                        "연습과제 1",
-                        "연습과제 2", 
-                        "연습과제 3",
-                        "연습과제 4",
-                        "연습과제 5",
-                        "연습과제 합계",
-                        "총점"
-                    ],
-                    "점수": [
-                        f"{student_data['mid']}점",
-                        f"{student_data['mid_extra']}점",
-                        f"{student_data['mid'] + student_data['mid_extra']}점",
-                        f"{student_data['final']}점",
-                        f"{student_data['exercises'][0]}점",
-                        f"{student_data['exercises'][1]}점", 
-                        f"{student_data['exercises'][2]}점",
-                        f"{student_data['exercises'][3]}점",
-                        f"{student_data['exercises'][4]}점",
-                        f"{sum(student_data['exercises'])}점",
-                        f"{total_score}점"
-                    ],
-                    "가중치": [
-                        "-",
-                        "-",
-                        "33.33% (중간 전체)",
-                        "44.44% (기말고사)", 
-                        "-",
-                        "-",
-                        "-", 
-                        "-",
-                        "-",
-                        "22.22% (연습과제 전체)",
-                        "100% (출석 10% 제외)"
-                    ]
-                }
-                
-                df = pd.DataFrame(detail_data)
-                
-                # 스타일링된 데이터프레임 표시
-                st.dataframe(
-                    df,
-                    use_container_width=True,
-                    hide_index=True,
-                    column_config={
-                        "항목": st.column_config.TextColumn("항목", width="medium"),
-                        "점수": st.column_config.TextColumn("점수", width="small"), 
-                        "가중치": st.column_config.TextColumn("가중치", width="medium")
-                    }
-                )
-                
-                # 전체 성적 다운로드 기능 (선택 옵션)
-                st.write(f"### 📊 {selected_class} 전체 성적 현황")
-                
-                # 전체 성적 요약 표
-                all_scores = get_all_scores(selected_class)
-                all_scores_list = sorted(all_scores.items(), key=lambda x: x[1], reverse=True)
-                summary_data = {
-                    "등수": list(range(1, len(all_scores_list) + 1)),
-                    "학번": [item[0] for item in all_scores_list],
-                    "총점": [f"{item[1]}점" for item in all_scores_list]
-                }
-                
-                summary_df = pd.DataFrame(summary_data)
-                
-                # 현재 학생 행 하이라이트
-                def highlight_current_student(row):
-                    if row['학번'] == sid:
-                        return ['background-color: #FFE5B4'] * len(row)
-                    return [''] * len(row)
-                
-                styled_df = summary_df.style.apply(highlight_current_student, axis=1)
-                st.dataframe(styled_df, use_container_width=True, hide_index=True)
+                # 같은 과목·학기 전체 분반 통합 등수 (분반 스케치를 병합한 근사값)
+                peer_classes = get_peer_classes(selected_class)
+                if len(peer_classes) > 1:
+                    overall = get_approximate_rank(total_score, peer_classes, snapshot=snapshot)
+                    st.caption(f"전체 분반 통합: 약 {overall['rank']}/{overall['count']}등 "
+                               f"(상위 {overall['percentile']}%, 오차 ±{overall['max_error']}명)")
                 
-                # 다운로드 버튼
-                csv = summary_df.to_csv(index=False).encode('utf-8-sig')
-                st.download_button(
-                    label=f"📥 {selected_class} 전체 성적 CSV 다운로드",
-                    data=csv,
-                    file_name=f"java_programming_scores_{selected_class}.csv",
-                    mime="text/csv"
-                )
+                if notice is None:
+                    # 무거운 화면은 프로세스 전체에서 동시에 몇 개만 그림
+                    with render_slot() as admitted:
+                        if admitted:
+                            render_result_details(snapshot, selected_class, sid, result)
+                    if not admitted:
+                        metrics.count("app.governor.busy")
+                        notice = "접속자가 많아 총점과 등수만 표시합니다."
+                if notice is not None:
+                    st.info(f"⏳ {notice} 잠시 후 다시 조회하면 상세 성적표를 볼 수 있습니다.", icon="ℹ️")
                 
+            elif sid and sid in snapshot["sections"][selected_class]["rejected"]:
+                # 검증에서 제외된 행 (데이터 오류)
+                reason = snapshot["sections"][selected_class]["rejected"][sid]["reason"]
+                st.error(f"❌ {sid} 학생의 성적 데이터에 오류가 있어 조회할 수 없습니다: {reason}", icon="🚫")
+                st.info("💡 담당 교수님이나 조교에게 문의해주세요.", icon="ℹ️")
             elif sid:
                 # 실패 메시지
                 st.error(f"❌ {selected_class}에 존재하지 않는 학번입니다. 학번을 다시 확인해주세요.", icon="🚫")
                 st.info("💡 위의 '등록된 학번 목록 보기'에서 정확한 학번을 확인하세요!", icon="ℹ️")
             else:
                 st.warning("⚠️ 학번을 입력해주세요.", icon="⚠️")
+
+@st.fragment
+def statistics_panel(snapshot, selected_class):
+    """
+    분반별 현황 차트와 통계 표 영역 (학번 조회 시 다시 그리지 않음)
+    
+    Args:
+        snapshot (Mapping): 이번 전체 실행에서 읽은 성적 스냅샷
+        selected_class (str): 선택된 분반 (같은 과목·학기의 분반만 비교)
+    """
+    count_rerun("statistics")
     
     # 분반별 통계 정보
     st.markdown("---")
@@ -271,125 +538,18 @@ def main():
     with col2:
         st.write("### 📈 분반별 현황")
         
-        # 분반별 데이터 수집
-        class1_data = get_grades_by_class("1분반")
-        class1_scores = get_all_scores("1분반")
-        class2_data = get_grades_by_class("2분반")
-        class2_scores = get_all_scores("2분반")
+        # 분반별 통계 (스냅샷에 미리 계산되어 있음, 학생이 있는 분반만 표시)
+        section_stats, overall_stats = get_section_stats(snapshot, get_peer_classes(selected_class))
+        chart_classes = [name for name, stats in section_stats.items() if stats["count"]]
         
-        if class1_scores and class2_scores:
-            # 1분반 통계
-            class1_avg = sum(class1_scores.values()) / len(class1_scores)
-            class1_max = max(class1_scores.values())
-            class1_min = min(class1_scores.values())
-            
-            # 2분반 통계
-            class2_avg = sum(class2_scores.values()) / len(class2_scores)
-            class2_max = max(class2_scores.values())
-            class2_min = min(class2_scores.values())
-            
-            # 차트 데이터 준비
-            chart_data = pd.DataFrame({
-                "1분반": [class1_avg, class1_max, class1_min],
-                "2분반": [class2_avg, class2_max, class2_min]
-            }, index=["평균 점수", "최고 점수", "최저 점수"])
-            
-            # Plotly를 사용한 꺾은선 차트
-            fig = go.Figure()
-            
-            # 스마트 라벨 위치 계산 함수
-            def get_smart_label_positions(class1_vals, class2_vals):
-                positions = []
-                for i, (val1, val2) in enumerate(zip(class1_vals, class2_vals)):
-                    diff = abs(val1 - val2)
-                    if diff < 25:  # 값이 가까우면 강제로 분리 (임계값 증가)
-                        if val1 > val2:  # 1분반이 더 높으면
-                            pos1, pos2 = val1 + 15, val2 - 15  # 1분반 위로, 2분반 아래로
-                        else:  # 2분반이 더 높으면
-                            pos1, pos2 = val1 - 15, val2 + 15  # 1분반 아래로, 2분반 위로
-                    else:  # 값이 충분히 떨어져 있으면 기본 위치
-                        if val1 > val2:
-                            pos1, pos2 = val1 + 8, val2 - 8
-                        else:
-                            pos1, pos2 = val1 - 8, val2 + 8
-                    positions.append((pos1, pos2))
-                return positions
-            
-            # 스마트 위치 계산
-            label_positions = get_smart_label_positions(chart_data["1분반"], chart_data["2분반"])
+        if chart_classes:
+            with metrics.timer("app.chart"):
+                # 분반 비교 차트 (데이터 버전·분반 구성별로 한 번만 만든 Figure를 모든 세션이 공유)
+                metrics.count("app.cache.section_chart.request")
+                fig = load_section_chart(snapshot["version"], tuple(chart_classes), section_stats)
             
-            # 1분반 텍스트 (빨간색)
-            fig.add_trace(go.Scatter(
-                x=chart_data.index,
-                y=[pos[0] for pos in label_positions],
-                mode='text',
-                name='1분반 점수',
-                text=[f'{val:.1f}' for val in chart_data["1분반"]],
-                textfont=dict(size=11, color='red', family='Arial Black'),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            
-            # 2분반 텍스트 (파란색)
-            fig.add_trace(go.Scatter(
-                x=chart_data.index,
-                y=[pos[1] for pos in label_positions],
-                mode='text',
-                name='2분반 점수',
-                text=[f'{val:.1f}' for val in chart_data["2분반"]],
-                textfont=dict(size=11, color='blue', family='Arial Black'),
-                showlegend=False,
-                hoverinfo='skip'
-            ))
-            
-            # 1분반 선 (빨간색)
-            fig.add_trace(go.Scatter(
-                x=chart_data.index,
-                y=chart_data["1분반"],
-                mode='lines+markers',
-                name='1분반',
-                line=dict(color='red', width=4),
-                marker=dict(size=10, color='red'),
-                hovertemplate='<b>1분반</b><br>%{x}: %{y:.1f}점<extra></extra>'
-            ))
-            
-            # 2분반 선 (파란색)
-            fig.add_trace(go.Scatter(
-                x=chart_data.index,
-                y=chart_data["2분반"],
-                mode='lines+markers',
-                name='2분반',
-                line=dict(color='blue', width=4),
-                marker=dict(size=10, color='blue'),
-                hovertemplate='<b>2분반</b><br>%{x}: %{y:.1f}점<extra></extra>'
-            ))
-            
-            # 차트 레이아웃 설정
-            fig.update_layout(
-                title=dict(
-                    text="분반별 점수 비교",
-                    font=dict(size=16, color='#2E86C1')
-                ),
-                xaxis_title="항목",
-                yaxis_title="점수",
-                yaxis=dict(range=[-25, 125]),
-                height=500,
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                ),
-                margin=dict(t=100, b=80, l=60, r=60),
-                font=dict(size=12),
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)'
-            )
-            
-            # 차트 표시
-            st.plotly_chart(fig, use_container_width=True)
+                # 차트 표시
+                st.plotly_chart(fig, use_container_width=True)
             
             # 차트 설명
             st.markdown("""
@@ -397,6 +557,65 @@ def main():
                 <small>📊 분반별 점수 분포 비교 차트 | 높이는 점수를 나타냅니다</small>
             </div>
             """, unsafe_allow_html=True)
+            
+            # 분반별 상세 통계 표 (표준편차, 사분위수 포함)
+            import pandas as pd  # 표를 그릴 때만 불러옴
+            with metrics.timer("app.stats_table"):
+                stats_rows = {**{name: section_stats[name] for name in chart_classes}, "전체": overall_stats}
+                stats_df = pd.DataFrame({
+                    "분반": list(stats_rows.keys()),
+                    "인원": [stats["count"] for stats in stats_rows.values()],
+                    "평균": [round(stats["avg"], 2) for stats in stats_rows.values()],
+                    "표준편차": [round(stats["std"], 2) for stats in stats_rows.values()],
+                    "하위 25%": [round(stats["quantiles"][0.25], 2) for stats in stats_rows.values()],
+                    "중앙값": [round(stats["quantiles"][0.5], 2) for stats in stats_rows.values()],
+                    "상위 25%": [round(stats["quantiles"][0.75], 2) for stats in stats_rows.values()],
+                })
+                st.dataframe(stats_df, use_container_width=True, hide_index=True)
+
+def main():
+    """메인 앱 함수"""
+    count_rerun("app")
+    
+    # 앱 제목
+    st.markdown('<h1 class="main-header">📊 자바 프로그래밍 성적 조회</h1>', 
+                unsafe_allow_html=True)
+    
+    # 성적 저장소 파일 변경 감시 (프로세스당 한 번만 시작됨)
+    start_store_watcher()
+    
+    # 모든 세션이 공유하는 성적 스냅샷 (데이터 버전별로 한 번만 계산됨)
+    # 계산은 조회 서비스의 작업 스레드에서 하며, 동시에 접속한 세션들은 같은 계산 결과를 기다림
+    # 이번 실행 동안에는 같은 스냅샷만 읽으므로 중간에 데이터가 갱신되어도 일관됨
+    snapshot = submit_snapshot().result()
+    
+    # 분반 선택 섹션
+    available_classes = list(snapshot["sections"].keys())
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        st.write("### 🏫 분반을 선택하세요")
+        selected_class = st.selectbox(
+            "분반 선택",
+            available_classes,
+            index=0,
+            help="소속 분반을 선택하세요"
+        )
+        
+        # 선택된 분반 정보 표시
+        total_students = snapshot["sections"][selected_class]["stats"]["count"]
+        
+        st.markdown(f"""
+        <div class="class-info">
+            <strong>📚 {selected_class}</strong><br>
+            <small>총 {total_students}명의 학생이 등록되어 있습니다</small>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # 입력·조회 섹션과 통계 섹션은 각각 따로 다시 실행되는 프래그먼트
+    lookup_panel(snapshot, selected_class)
+    statistics_panel(snapshot, selected_class)
     
     # 구분선
     st.markdown("---")
@@ -425,6 +644,10 @@ def main():
         <p><small>자바 프로그래밍 성적 조회 시스템 | Developed with Streamlit</small></p>
     </div>
     """, unsafe_allow_html=True)
+    
+    # 관리자 디버그 화면
+    if is_admin():
+        debug_panel()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
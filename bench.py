@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+성적 계산·등수·화면 렌더링 벤치마크
+
+합성 데이터(8열 형식)로 분반 크기별 성능을 측정하고 결과를 JSON으로 출력합니다.
+커밋 간 비교를 위해 결과 파일을 저장해 두세요.
+
+사용법:
+    python bench.py                                  # 1k, 100k, 1M 명
+    python bench.py --sizes 1000 10000 -o bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import grades
+from summary import build_summary_frame, encode_summary_csv
+from what_if import simulate_section
+
+# 기본 분반 크기
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+# Streamlit 화면 렌더링을 측정할 최대 분반 크기 (요약 표 전체를 그리므로 큰 분반은 생략)
+DEFAULT_APP_MAX_SIZE = 100_000
+
+# 등수 조회 지연 시간 측정 횟수
+RANK_SAMPLES = 2_000
+
+# what-if 시뮬레이션 측정에 사용하는 시나리오 수
+WHAT_IF_SCENARIOS = 200
+
+# 시작 시간 보고서에 따로 표시할 무거운 모듈
+STARTUP_MODULES = ("streamlit", "numpy", "pandas", "plotly", "pyarrow", "grades", "query_service")
+
+# 시작 시간 보고서에 포함할 app.py의 가장 느린 직접 import 수
+STARTUP_TOP_IMPORTS = 10
+
+def generate_section(size, seed=0):
+    """
+    합성 분반 데이터 생성
+
+    Args:
+        size (int): 학생 수
+        seed (int): 난수 시드
+
+    Returns:
+        dict: {학번: [중간고사, 중간EXTRA, 기말고사, 연습1~5]}
+    """
+    rng = np.random.default_rng(seed)
+    width = len(str(size * 10))
+    numbers = rng.choice(size * 10, size=size, replace=False)
+    student_ids = [f"{number:0{width}d}" for number in numbers.tolist()]
+    scores = np.column_stack([
+        rng.integers(0, 101, size),        # 중간고사
+        rng.integers(0, 11, size),         # 중간 EXTRA
+        rng.integers(0, 101, size),        # 기말고사
+        rng.integers(0, 11, (size, 5)),    # 연습과제 5개
+    ])
+    return dict(zip(student_ids, scores.tolist()))
+
+def _timed(func, *args, repeat=3, **kwargs):
+    """함수를 repeat번 실행하여 (최소 소요 시간(초), 마지막 결과) 반환"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _percentiles(samples_ns):
+    """나노초 표본의 p50/p99를 마이크로초로 반환"""
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000
+    return {
+        "p50_us": round(float(np.percentile(samples, 50)), 3),
+        "p99_us": round(float(np.percentile(samples, 99)), 3),
+    }
+
+def bench_scoring(section_data):
+    """점수 행렬 변환과 일괄 총점 계산 처리량 측정"""
+    build_s, (matrix, valid) = _timed(grades.build_score_matrix, section_data.values())
+    score_s, _ = _timed(grades.calc_scores, matrix, valid)
+    snapshot_s, _ = _timed(grades.build_section_snapshot, section_data, repeat=1)
+    rows = len(section_data)
+    return {
+        "build_matrix_s": round(build_s, 6),
+        "calc_scores_s": round(score_s, 6),
+        "calc_scores_rows_per_s": round(rows / score_s) if score_s else None,
+        "section_snapshot_s": round(snapshot_s, 6),
+    }
+
+def bench_rank_lookup(class_name, student_ids, seed=0):
+    """등수 조회 지연 시간(p50/p99) 측정"""
+    rng = random.Random(seed)
+    sample = [rng.choice(student_ids) for _ in range(RANK_SAMPLES)]
+    by_id = []
+    for student_id in sample:
+        start = time.perf_counter_ns()
+        grades.get_student_rank(student_id, class_name)
+        by_id.append(time.perf_counter_ns() - start)
+    scores = grades.get_all_scores(class_name)
+    by_score = []
+    for student_id in sample:
+        score = scores[student_id]
+        start = time.perf_counter_ns()
+        grades.get_rank_for_score(score, class_name)
+        by_score.append(time.perf_counter_ns() - start)
+    return {
+        "get_student_rank": _percentiles(by_id),
+        "get_rank_for_score": _percentiles(by_score),
+    }
+
+def bench_summary(section):
+    """요약 표와 CSV 생성 시간 측정"""
+    frame_s, (summary_df, _) = _timed(build_summary_frame, section)
+    csv_s, csv_size = _timed(lambda: len(encode_summary_csv(summary_df)))
+    return {
+        "summary_frame_s": round(frame_s, 6),
+        "summary_csv_s": round(csv_s, 6),
+        "summary_csv_bytes": csv_size,
+    }
+
+def bench_what_if(section, scenarios=WHAT_IF_SCENARIOS, seed=0):
+    """가중치·학점 기준 시나리오 일괄 시뮬레이션 시간 측정 (기말고사 가중치와 A 기준을 바꿈)"""
+    rng = np.random.default_rng(seed)
+    weights = np.tile(section["policy"]["weights"], (scenarios, 1))
+    weights[:, 2] = rng.integers(3000, 6001, scenarios) / 100
+    cutoffs = [{"A": a, "B": a - 10, "C": a - 20, "D": a - 30}
+               for a in rng.integers(80, 96, scenarios).tolist()]
+    simulate_s, _ = _timed(simulate_section, section, weights, cutoffs, repeat=1)
+    return {
+        "scenarios": scenarios,
+        "simulate_s": round(simulate_s, 6),
+        "scenario_rows_per_s": round(scenarios * section["stats"]["count"] / simulate_s) if simulate_s else None,
+    }
+
+def parse_importtime(stderr):
+    """
+    -X importtime 출력을 [(모듈, 자체 시간(µs), 누적 시간(µs), 깊이)] 리스트로 변환
+
+    Args:
+        stderr (str): python -X importtime의 표준 오류 출력
+
+    Returns:
+        list: import 순서대로의 측정값
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # 머리글 행
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def bench_startup():
+    """app.py를 새 인터프리터에서 import할 때의 시작 시간 측정 (-X importtime)"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        capture_output=True, text=True, cwd=root
+    )
+    wall_s = time.perf_counter() - start
+    entries = parse_importtime(completed.stderr)
+    top_level = [entry for entry in entries if entry[3] == 0]
+    # importtime은 자식 모듈을 부모보다 먼저 출력하므로 app 행 앞의 깊이 1 행이 app의 직접 import
+    direct = []
+    for position, entry in enumerate(entries):
+        if entry[0] == "app" and entry[3] == 0:
+            for child in reversed(entries[:position]):
+                if child[3] == 0:
+                    break
+                if child[3] == 1:
+                    direct.append(child)
+            break
+    modules = {}
+    for name, _, cumulative_us, _ in entries:
+        if name in STARTUP_MODULES and name not in modules:
+            modules[name] = round(cumulative_us / 1e6, 6)
+    return {
+        "wall_s": round(wall_s, 6),
+        "import_s": round(sum(entry[2] for entry in top_level) / 1e6, 6),
+        "modules_s": {name: modules.get(name) for name in STARTUP_MODULES},
+        "slowest_imports": [
+            {"module": name, "cumulative_s": round(cumulative_us / 1e6, 6)}
+            for name, _, cumulative_us, _ in sorted(direct, key=lambda entry: -entry[2])[:STARTUP_TOP_IMPORTS]
+        ],
+        "returncode": completed.returncode,
+    }
+
+def bench_app(class_name, student_id):
+    """Streamlit AppTest로 main() 첫 실행과 학번 조회 재실행 시간 측정"""
+    from streamlit.testing.v1 import AppTest
+
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    at = AppTest.from_file(app_path, default_timeout=600)
+    start = time.perf_counter()
+    at.run()
+    first_s = time.perf_counter() - start
+
+    at.selectbox[0].select(class_name)
+    [widget for widget in at.text_input if widget.label == "학번"][0].input(student_id)
+    lookup_button = [button for button in at.button if "성적 조회" in button.label][0]
+    start = time.perf_counter()
+    lookup_button.click().run()
+    lookup_s = time.perf_counter() - start
+    return {
+        "first_run_s": round(first_s, 6),
+        "lookup_rerun_s": round(lookup_s, 6),
+        "exceptions": [str(exception.message) for exception in at.exception],
+    }
+
+def run_size(size, app_max_size, seed=0):
+    """한 분반 크기에 대한 전체 벤치마크"""
+    class_name = f"bench_{size}"
+    section_data = generate_section(size, seed)
+    result = {"students": size}
+    result["scoring"] = bench_scoring(section_data)
+
+    # 합성 분반을 스냅샷에 올려 조회·화면 경로가 실제와 같은 코드를 타도록 함
+    grades.reload_grades({class_name: section_data, **{
+        name: data for name, data in grades.all_grades.items() if not name.startswith("bench_")
+    }})
+    section = grades.get_snapshot()["sections"][class_name]
+    student_ids = list(section_data.keys())
+    result["rank_lookup"] = bench_rank_lookup(class_name, student_ids, seed)
+    result["summary"] = bench_summary(section)
+    result["what_if"] = bench_what_if(section, seed=seed)
+    if size <= app_max_size:
+        result["app"] = bench_app(class_name, student_ids[0])
+    return result
+
+def _git_commit():
+    """현재 git 커밋 (없으면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="성적 조회 시스템 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="분반 학생 수 목록")
+    parser.add_argument("--app-max-size", type=int, default=DEFAULT_APP_MAX_SIZE,
+                        help="Streamlit 화면 렌더링을 측정할 최대 분반 크기 (0이면 생략)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 데이터 난수 시드")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "startup": bench_startup(),
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"분반 크기 {size:,}명 측정 중...", file=sys.stderr)
+        report["results"].append(run_size(size, args.app_max_size, args.seed))
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+전체 분반 통합 등수 인덱스 ((분반, 학번) 기준)
+
+분반마다 이미 내림차순으로 정렬된 총점 배열을 이어 붙인 뒤 안정 정렬 한 번으로 병합하므로
+(정렬된 구간을 병합하는 timsort), 총점을 다시 계산하거나 분반별로 다시 정렬하지 않습니다.
+
+동점 처리 방식:
+    - competition: 자신보다 높은 점수의 개수 + 1 (1, 2, 2, 4)
+    - dense: 자신보다 높은 서로 다른 점수의 개수 + 1 (1, 2, 2, 3)
+    - fractional: 동점자 순위의 평균 (1, 2.5, 2.5, 4)
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+# 지원하는 동점 처리 방식
+TIE_MODES = ("competition", "dense", "fractional")
+
+def build_global_rank_index(sections):
+    """
+    분반 스냅샷들의 등수 인덱스를 병합하여 통합 등수 인덱스 생성
+
+    Args:
+        sections (Mapping): {분반: 분반 스냅샷}
+
+    Returns:
+        Mapping: 통합 등수 인덱스
+            - keys (tuple): 총점 내림차순 (분반, 학번) (동점은 분반 순서, 분반 안의 순서 유지)
+            - totals (numpy.ndarray): 총점 내림차순 배열
+            - ascending (numpy.ndarray): 총점 오름차순 배열 (이진 탐색용)
+            - distinct (numpy.ndarray): 서로 다른 총점의 오름차순 배열 (dense 등수용)
+    """
+    names = list(sections.keys())
+    runs = [sections[name]["rank_index"]["totals"] for name in names]
+    totals = np.concatenate(runs) if runs else np.zeros(0, dtype=np.float64)
+    # 내림차순 구간들을 안정 정렬로 병합
+    order = np.argsort(-totals, kind="stable")
+    keys = [
+        (name, student_id)
+        for name in names
+        for student_id in sections[name]["rank_index"]["student_ids"]
+    ]
+    totals = totals[order]
+    ascending = totals[::-1].copy()
+    distinct = ascending[np.r_[True, ascending[1:] != ascending[:-1]]] if len(ascending) else ascending
+    for array in (totals, ascending, distinct):
+        array.flags.writeable = False
+    return MappingProxyType({
+        "keys": tuple(keys[i] for i in order.tolist()),
+        "totals": totals,
+        "ascending": ascending,
+        "distinct": distinct,
+    })
+
+def rank_for_score(index, score, mode="competition"):
+    """
+    통합 등수 인덱스에서 총점의 등수를 이진 탐색으로 계산
+
+    Args:
+        index (Mapping): build_global_rank_index 결과
+        score (float): 총점
+        mode (str): 동점 처리 방식 ("competition", "dense", "fractional")
+
+    Returns:
+        int | float: 등수 (fractional이면 float)
+
+    Raises:
+        ValueError: 지원하지 않는 동점 처리 방식
+    """
+    ascending = index["ascending"]
+    if mode == "competition":
+        return int(len(ascending) - np.searchsorted(ascending, score, side="right") + 1)
+    if mode == "dense":
+        distinct = index["distinct"]
+        return int(len(distinct) - np.searchsorted(distinct, score, side="right") + 1)
+    if mode == "fractional":
+        lower = int(np.searchsorted(ascending, score, side="left"))
+        upper = int(np.searchsorted(ascending, score, side="right"))
+        first = len(ascending) - upper + 1
+        return first + max(upper - lower - 1, 0) / 2
+    raise ValueError(f"지원하지 않는 동점 처리 방식: {mode} (가능: {', '.join(TIE_MODES)})")
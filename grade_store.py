@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+성적 데이터 외부 파일 저장소 (mmap 기반 열 단위 바이너리 파일)
+
+CSV/Parquet 파일을 읽어 분반마다 행 우선(row-major) int16 점수 행렬 하나를 담은 바이너리
+파일을 만들고, 이 파일을 mmap으로 열어 여러 Streamlit 워커 프로세스가 같은 페이지를 공유합니다.
+점수 행렬은 파일 페이지를 그대로 가리키는 배열로 총점 계산에 넘어가므로 프로세스별 복사본이
+생기지 않습니다.
+
+파일 구조:
+    MAGIC (8바이트) | 헤더 길이 (uint32) | 헤더 JSON | 데이터 블록 (8바이트 정렬)
+
+사용법:
+    python grade_store.py build data/1분반.csv data/2분반.csv -o grades.bin
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+import numpy as np
+
+MAGIC = b"RSGRADE1"
+FORMAT_VERSION = 2
+
+# 점수 행렬 자료형 (행 우선으로 저장하여 분반 행렬을 복사 없이 읽음)
+SCORE_DTYPE = np.dtype("<i2")
+
+# 기본 성적 열 이름 (grades.py의 8열 데이터 형식과 같은 순서)
+# 다른 성적 산출 정책을 쓰는 분반은 학번 외의 모든 열을 순서대로 사용
+SCORE_FIELDS = ("mid", "mid_extra", "final", "ex1", "ex2", "ex3", "ex4", "ex5")
+ID_FIELD = "student_id"
+
+_ALIGN = 8
+
+def _section_columns(grades):
+    """
+    {학번: 성적 리스트} 데이터를 학번 배열과 점수 행렬로 변환
+
+    Args:
+        grades (dict): 한 분반의 성적 데이터
+
+    Returns:
+        tuple: (학번 bytes 배열, 학생 수 × 열 수 int16 점수 행렬, [열 이름])
+
+    Raises:
+        ValueError: 정수가 아니거나 int16 범위를 벗어난 점수가 있는 경우
+    """
+    ids = [str(student_id).encode("utf-8") for student_id in grades.keys()]
+    id_array = np.array(ids, dtype=f"S{max((len(i) for i in ids), default=1)}")
+    values = list(grades.values())
+    width = len(values[0]) if values else len(SCORE_FIELDS)
+    rows = np.array(values, dtype=np.float64).reshape(-1, width)
+    if not np.all(rows == np.floor(rows)):
+        raise ValueError("점수는 정수여야 합니다")
+    info = np.iinfo(SCORE_DTYPE)
+    if len(rows) and (rows.min() < info.min or rows.max() > info.max):
+        raise ValueError(f"int16 범위를 벗어난 점수가 있습니다: {rows.min():g} ~ {rows.max():g}")
+    names = SCORE_FIELDS if width == len(SCORE_FIELDS) else tuple(f"score{j + 1}" for j in range(width))
+    return id_array, np.ascontiguousarray(rows, dtype=SCORE_DTYPE), names
+
+def write_store(grades_by_class, path):
+    """
+    분반별 성적 데이터를 열 단위 바이너리 파일로 저장
+
+    Args:
+        grades_by_class (dict): {분반: {학번: 성적 리스트}}
+        path (str): 저장할 파일 경로
+
+    Returns:
+        str: 저장된 데이터의 버전 (내용 해시)
+    """
+    blobs = []
+    sections = []
+    offset = 0
+
+    def add_blob(array):
+        nonlocal offset
+        data = np.ascontiguousarray(array).tobytes()
+        padding = (-len(data)) % _ALIGN
+        blobs.append(data + b"\0" * padding)
+        start = offset
+        offset += len(data) + padding
+        return start
+
+    digest = hashlib.sha1()
+    for class_name, grades in grades_by_class.items():
+        id_array, matrix, names = _section_columns(grades)
+        # 학번 조회용 정렬 순서 (이진 탐색)
+        order = np.argsort(id_array, kind="stable").astype(np.int32)
+        section = {
+            "name": class_name,
+            "count": len(id_array),
+            "ids": {"offset": add_blob(id_array), "dtype": id_array.dtype.str},
+            "sorted_ids": {"offset": add_blob(id_array[order]), "dtype": id_array.dtype.str},
+            "order": {"offset": add_blob(order), "dtype": order.dtype.str},
+            "columns": list(names),
+            "scores": {"offset": add_blob(matrix), "dtype": matrix.dtype.str},
+        }
+        sections.append(section)
+        digest.update(class_name.encode("utf-8"))
+        digest.update(id_array.tobytes())
+        digest.update(matrix.tobytes())
+
+    data_version = digest.hexdigest()[:16]
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "data_version": data_version,
+        "sections": sections,
+    }, ensure_ascii=False).encode("utf-8")
+    # 데이터 블록이 8바이트 경계에서 시작하도록 헤더 뒤를 채움
+    prefix_len = len(MAGIC) + 4 + len(header)
+    header += b" " * ((-prefix_len) % _ALIGN)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    # 읽고 있는 프로세스가 반쯤 쓰인 파일을 보지 않도록 교체
+    os.replace(tmp_path, path)
+    return data_version
+
+def read_source(path):
+    """
+    CSV 또는 Parquet 파일에서 한 분반의 성적을 읽음
+
+    Args:
+        path (str): student_id, mid, mid_extra, final, ex1~ex5 열을 가진 파일
+            (기본 열이 없으면 student_id 외의 모든 열을 순서대로 사용)
+
+    Returns:
+        dict: {학번: 성적 리스트}
+    """
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        df[ID_FIELD] = df[ID_FIELD].astype(str)
+    else:
+        df = pd.read_csv(path, dtype={ID_FIELD: str})
+    if ID_FIELD not in df.columns:
+        raise ValueError(f"{path}: 필요한 열이 없습니다: {ID_FIELD}")
+    if all(name in df.columns for name in SCORE_FIELDS):
+        fields = list(SCORE_FIELDS)
+    else:
+        fields = [name for name in df.columns if name != ID_FIELD]
+    scores = df[fields].to_numpy().tolist()
+    return dict(zip(df[ID_FIELD].tolist(), scores))
+
+def build_store(sources, path):
+    """
+    분반별 CSV/Parquet 파일로부터 저장소 파일을 생성
+
+    Args:
+        sources (dict): {분반: 원본 파일 경로}
+        path (str): 생성할 저장소 파일 경로
+
+    Returns:
+        str: 저장된 데이터의 버전
+    """
+    grades_by_class = {class_name: read_source(source) for class_name, source in sources.items()}
+    return write_store(grades_by_class, path)
+
+class SectionView(Mapping):
+    """
+    mmap된 한 분반의 성적을 {학번: 성적 리스트} 딕셔너리처럼 읽는 뷰
+
+    점수 행렬과 열은 파일 페이지를 그대로 가리키며 프로세스별 복사본을 만들지 않습니다.
+    """
+
+    def __init__(self, buffer, base, section):
+        self.name = section["name"]
+        count = section["count"]
+
+        def view(spec, count=count):
+            return np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]),
+                                 count=count, offset=base + spec["offset"])
+
+        self._ids = view(section["ids"])
+        self._sorted_ids = view(section["sorted_ids"])
+        self._order = view(section["order"])
+        width = len(section["columns"])
+        self._matrix = view(section["scores"], count * width).reshape(count, width)
+        self.columns = tuple(self._matrix[:, j] for j in range(width))
+
+    def _find(self, student_id):
+        """학번의 행 번호를 이진 탐색으로 찾음 (없으면 -1)"""
+        key = str(student_id).encode("utf-8")
+        pos = int(np.searchsorted(self._sorted_ids, key))
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == key:
+            return int(self._order[pos])
+        return -1
+
+    def __getitem__(self, student_id):
+        row = self._find(student_id)
+        if row < 0:
+            raise KeyError(student_id)
+        return self._matrix[row].tolist()
+
+    def __contains__(self, student_id):
+        return isinstance(student_id, str) and self._find(student_id) >= 0
+
+    def __iter__(self):
+        return (student_id.decode("utf-8") for student_id in self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def score_matrix(self):
+        """
+        분반 전체 점수를 2차원 배열로 반환 (복사 없음)
+
+        Returns:
+            numpy.ndarray: 파일의 행 우선 블록을 가리키는 학생 수 × 열 수 int16 읽기 전용 행렬
+        """
+        return self._matrix
+
+class GradeStore(Mapping):
+    """
+    mmap으로 연 저장소 파일 ({분반: SectionView} 딕셔너리처럼 동작)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: 성적 저장소 파일이 아닙니다")
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(bytes(self._mmap[header_start:header_start + header_len]))
+        if header["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"{path}: 지원하지 않는 형식 버전 {header['format_version']}")
+        self.data_version = header["data_version"]
+        base = header_start + header_len
+        self._sections = {
+            section["name"]: SectionView(self._mmap, base, section)
+            for section in header["sections"]
+        }
+
+    def __getitem__(self, class_name):
+        return self._sections[class_name]
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+def open_store(path):
+    """
+    저장소 파일을 mmap으로 염
+
+    Args:
+        path (str): 저장소 파일 경로
+
+    Returns:
+        GradeStore: {분반: SectionView} 형태의 읽기 전용 저장소
+    """
+    return GradeStore(path)
+
+def main():
+    """명령행 진입점: CSV/Parquet 파일로 저장소 파일 생성"""
+    parser = argparse.ArgumentParser(description="성적 저장소 파일 생성")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="CSV/Parquet 파일로 저장소 생성")
+    build.add_argument("sources", nargs="+",
+                       help="분반별 원본 파일 (파일 이름이 분반 이름, 예: data/1분반.csv)")
+    build.add_argument("-o", "--output", default="grades.bin", help="출력 파일 경로")
+    args = parser.parse_args()
+
+    sources = {
+        os.path.splitext(os.path.basename(source))[0]: source
+        for source in args.sources
+    }
+    data_version = build_store(sources, args.output)
+    print(f"{args.output} 생성 완료 (분반 {len(sources)}개, 데이터 버전 {data_version})")
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,29 @@
 자바 프로그래밍 성적 데이터 및 계산 함수
 """
 
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
+
+from grading_policy import DEFAULT_POLICY, get_policy
+from global_rank import build_global_rank_index, rank_for_score
+from id_index import StudentIdIndex
+from ingest import ingest_section, validate_rows
+import metrics
+from quantile_sketch import DEFAULT_ERROR, build_sketch
+from section_stats import combine_sections, summarize_section
+
+logger = logging.getLogger("grades")
+
 # 분반별 성적 데이터 딕셔너리
 # 데이터 형식: [중간고사, 중간EXTRA, 기말고사, 연습1, 연습2, 연습3, 연습4, 연습5]
 
@@ -92,6 +115,77 @@ all_grades = {
     "2분반": grades_class2
 }
 
+# 외부 성적 저장소 (있으면 위 내장 데이터 대신 사용)
+# 파일이면 grade_store.py로 만든 단일 저장소 파일, 디렉터리면 shard_store.py로 만든
+# 과목·학기·분반별 샤드 디렉터리 (분반은 처음 조회될 때 읽음)
+GRADES_STORE_PATH = os.environ.get(
+    "GRADES_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "grades.bin")
+)
+
+# 샤드 저장소에서 계산해 둔 분반 스냅샷이 쓸 수 있는 메모리 예산 (MB)
+# 넘으면 가장 오래 조회되지 않은 분반부터 제거하고, 다시 조회되면 다시 계산
+SHARD_MEMORY_BUDGET_MB = float(os.environ.get("GRADES_SHARD_MEMORY_MB", 256))
+
+def _store_file(path):
+    """변경을 감시할 파일 경로 (샤드 디렉터리면 manifest)"""
+    if os.path.isdir(path):
+        from shard_store import MANIFEST_NAME
+        return os.path.join(path, MANIFEST_NAME)
+    return path
+
+def _open_grade_store(path):
+    """저장소 경로를 엶 (디렉터리면 샤드 저장소, 파일이면 단일 저장소 파일)"""
+    if os.path.isdir(path):
+        from shard_store import open_shards
+        return open_shards(path)
+    from grade_store import open_store
+    return open_store(path)
+
+_store_mtime = None
+if os.path.exists(_store_file(GRADES_STORE_PATH)):
+    _store_mtime = os.stat(_store_file(GRADES_STORE_PATH)).st_mtime_ns
+    all_grades = _open_grade_store(GRADES_STORE_PATH)
+
+# 성적 데이터 형식: 기본 정책의 한 행 요소 수
+SCORE_COLUMNS = len(DEFAULT_POLICY["columns"])
+
+# 프로세스 전체에서 공유하는 성적 스냅샷 (데이터 버전별로 한 번만 생성)
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+# 데이터 다시 읽기 상태 (동시에 하나의 갱신만 수행)
+_reload_lock = threading.Lock()
+
+# 저장소 감시 스레드 (시작만 _watcher_lock으로 보호하여 갱신 중에도 재실행을 막지 않음)
+_store_watcher = None
+_watcher_lock = threading.Lock()
+
+# 스냅샷에서 필요할 때 한 번만 만드는 파생 인덱스 캐시 {(스냅샷 버전, 종류...): 값}
+# (분반별 근사 등수 스케치, 통합 등수 인덱스)
+_derived = {}
+_derived_lock = threading.Lock()
+
+# 샤드 저장소의 분반 스냅샷 LRU 캐시 {(분반, 분반 데이터 버전, 정책 지문): (분반 스냅샷, 추정 바이트)}
+# 스냅샷이 바뀌어도 데이터가 그대로인 분반은 다시 계산하지 않음
+_shard_sections = OrderedDict()
+_shard_bytes = 0
+_shard_lock = threading.Lock()
+
+# 샤드 분반 요약 캐시 {(분반, 분반 데이터 버전, 정책 지문): {"rejected", "sketch"}}
+# 요약은 분반당 수 KB이므로 분반 스냅샷이 LRU에서 제거되어도 남겨 두어, 제외 행 보고와
+# 근사 등수가 분반을 다시 계산하거나 캐시된 분반을 밀어내지 않게 함
+_shard_summaries = {}
+
+def _measure_dict_entry_bytes(sample=1 << 16):
+    """딕셔너리 항목 하나의 평균 메모리 (해시 테이블 포함, 바이트)"""
+    return sys.getsizeof(dict.fromkeys(range(sample))) / sample
+
+# 분반 스냅샷의 학생 한 명당 파이썬 객체 메모리 (학번 문자열 제외, 바이트)
+# 행 번호·총점·등수 딕셔너리 항목 3개와 값 객체 (int, float, int), 학번 튜플 2개의 포인터
+_STUDENT_OBJECT_BYTES = (3 * _measure_dict_entry_bytes()
+                         + 2 * sys.getsizeof(1 << 20) + sys.getsizeof(0.0) + 2 * 8)
+
 def get_grades_by_class(class_name):
     """
     분반별 성적 데이터를 반환
@@ -104,90 +198,1053 @@ def get_grades_by_class(class_name):
     """
     return all_grades.get(class_name, {})
 
-def calc_score(student_scores):
+def calc_score(student_scores, policy=None):
     """
     학생의 총점을 계산하는 함수
     
     Args:
         student_scores (list): [중간고사, 중간EXTRA, 기말고사, 연습과제1, 연습과제2, 연습과제3, 연습과제4, 연습과제5]
+        policy (Mapping, optional): 컴파일된 성적 산출 정책 (기본값: 기본 정책)
     
     Returns:
         float: 총점 (소수점 2자리)
     
-    가중치 (출석 10% 제외, 90%를 100%로 비례 확대):
+    기본 정책 가중치 (출석 10% 제외, 90%를 100%로 비례 확대):
     - 중간고사 + 중간EXTRA: 30% → 33.33% (30/90*100)
     - 기말고사: 40% → 44.44% (40/90*100)
     - 연습과제: 20% → 22.22% (20/90*100)
     
     계산 공식:
     total = (mid + mid_extra) * 33.33/100 + final * 44.44/100 + sum(exercises) * 22.22/100
+    
+    실제 계산은 배치 엔진(calc_scores)에 한 행짜리 행렬을 넘겨 수행합니다.
+    
+    잘못된 행은 적재 검증(ingest.validate_rows)과 같은 규칙으로 거부합니다. 이전에는 요소 수가
+    틀리거나 숫자가 아닌 행에 오류를 출력하고 0.0을 반환했고 범위 밖 점수도 그대로 계산했으므로,
+    잘못된 행을 넘기던 호출부는 ValueError를 처리해야 합니다.
+    
+    Raises:
+        ValueError: 행의 형식이 잘못되었거나 점수가 정책의 범위를 벗어난 경우 (메시지는 제외 사유)
     """
-    try:
-        if len(student_scores) != 8:
-            print(f"잘못된 데이터 형식: {len(student_scores)}개 요소 (8개 필요)")
-            return 0.0
-            
-        mid = student_scores[0]           # 중간고사
-        mid_extra = student_scores[1]     # 중간 EXTRA
-        final = student_scores[2]         # 기말고사
-        exercises = student_scores[3:8]   # 연습과제 5개
-        
-        # 총점 계산 (출석 10% 제외, 나머지 90%를 100%로 비례 확대)
-        # 중간고사+중간EXTRA: 30% → 33.33%
-        mid_total_weight = 33.33
-        # 기말고사: 40% → 44.44%
-        final_weight = 44.44
-        # 연습과제: 20% → 22.22%
-        exercise_weight = 22.22
-        
-        total = (
-            (mid + mid_extra) * mid_total_weight / 100 +     # 중간고사 + 중간EXTRA (33.33%)
-            final * final_weight / 100 +                     # 기말고사 (44.44%)
-            sum(exercises) * exercise_weight / 100           # 연습과제 합계 (22.22%)
-        )
-        
-        return round(total, 2)
-        
-    except (IndexError, TypeError) as e:
-        print(f"데이터 처리 중 오류 발생: {e}")
-        return 0.0
-    except Exception as e:
-        print(f"점수 계산 중 오류 발생: {e}")
-        return 0.0
+    policy = policy or get_policy()
+    matrix, _, reasons = validate_rows([student_scores], policy["columns"], policy["min_scores"],
+                                       policy["max_scores"], policy["labels"])
+    if reasons:
+        raise ValueError(reasons[0])
+    return float(calc_scores(matrix, None, policy)[0])
+
+def _reference_total(student_scores, policy):
+    """
+    정책 공식을 한 행에 그대로 적용한 총점 (반올림 경계값 처리용)
+    
+    Args:
+        student_scores (list): 한 학생의 성적 행
+        policy (Mapping): 컴파일된 성적 산출 정책
+    
+    Returns:
+        float: 총점 (정책의 반올림 자릿수)
+    """
+    total = 0
+    for component in policy["components"]:
+        # 구성 항목 합계 × 가중치 (%)
+        part = sum(student_scores[component["start"]:component["stop"]])
+        total = total + part * component["weight"] / 100
+    return round(total, policy["rounding"])
+
+def build_score_matrix(rows, columns=SCORE_COLUMNS):
+    """
+    성적 행 리스트를 연속된 2차원 배열(학생 수 × 열 수)로 변환
+    
+    Args:
+        rows (list): 학생별 성적 리스트의 리스트
+        columns (int): 한 행의 요소 수 (기본값: 8)
+    
+    Returns:
+        tuple: (matrix, valid)
+            - matrix (numpy.ndarray): C-연속 2차원 점수 배열 (잘못된 행은 0으로 채움)
+            - valid (numpy.ndarray): 행별 유효 여부 (bool)
+    
+    형식만 검사합니다. 분반 데이터는 점수 범위까지 검사하는 ingest_section으로 적재됩니다.
+    """
+    matrix, valid, _ = validate_rows(rows, columns)
+    return matrix, valid
+
+def calc_scores(matrix, valid=None, policy=None):
+    """
+    여러 학생의 총점을 한 번의 가중 행렬-벡터 곱으로 계산
+    
+    Args:
+        matrix (numpy.ndarray): 학생 수 × 열 수 점수 배열
+        valid (numpy.ndarray, optional): 행별 유효 여부, 무효 행은 0.0
+        policy (Mapping, optional): 컴파일된 성적 산출 정책 (기본값: 기본 정책)
+    
+    Returns:
+        numpy.ndarray: 총점 배열 (정책의 반올림 자릿수, calc_score와 동일한 반올림)
+    
+    정수 점수는 정책의 정수 가중치 벡터로 정확히 계산하고,
+    반올림 경계(예: x.xx5)나 소수 점수가 있는 행만 정책 공식으로 다시 계산합니다.
+    """
+    policy = policy or get_policy()
+    matrix = np.asarray(matrix)
+    n = matrix.shape[0]
+    if valid is None:
+        valid = np.ones(n, dtype=bool)
+    totals = np.zeros(n, dtype=np.float64)
+    if n == 0:
+        return totals
+    
+    digits = policy["rounding"]
+    int_weights = policy["int_weights"]
+    if int_weights is None:
+        # 가중치를 정수로 표현할 수 없는 정책: 부동소수점으로 일괄 계산
+        weighted = matrix.astype(np.float64, copy=False) @ policy["weights"] / 100
+        totals[valid] = np.round(weighted[valid], digits)
+        return totals
+    
+    if matrix.dtype.kind in "biu":
+        integral = valid
+        int_matrix = matrix
+    else:
+        integral = valid & np.all(matrix == np.floor(matrix), axis=1)
+        int_matrix = np.where(integral[:, None], matrix, 0)
+    
+    # 정수 가중치 벡터와의 곱 → 총점 × 10^(2 + weight_decimals) (오차 없음)
+    weighted = int_matrix.astype(np.int64, copy=False) @ int_weights
+    shift = 2 + policy["weight_decimals"] - digits
+    tie = np.zeros(n, dtype=bool)
+    if shift > 0:
+        unit = 10 ** shift
+        rounded, remainder = np.divmod(weighted, unit)
+        rounded += remainder > unit // 2
+        tie = remainder == unit // 2
+        totals[integral] = rounded[integral] / 10 ** digits
+    else:
+        # 반올림 자릿수가 충분하면 정확한 값 그대로
+        totals[integral] = weighted[integral] / 10 ** (2 + policy["weight_decimals"])
+    
+    # 정확히 반올림 경계인 경우와 소수 점수 행은 정책 공식의 부동소수점 반올림을 따름
+    fallback = np.flatnonzero((integral & tie) | (valid & ~integral))
+    for i in fallback:
+        totals[i] = _reference_total(matrix[i].tolist(), policy)
+    return totals
+
+class StudentRecord:
+    """
+    학생 한 명의 성적 레코드 (점수 행렬의 한 행을 복사 없이 가리킴)
+    
+    mid, mid_extra, final, exercises 속성으로 읽으며, 기존 딕셔너리 형태와 같이
+    record["mid"]처럼 읽을 수도 있습니다.
+    """
+    
+    __slots__ = ("student_id", "_row")
+    
+    FIELDS = ("mid", "mid_extra", "final", "exercises")
+    
+    def __init__(self, student_id, row):
+        self.student_id = student_id
+        self._row = row
+    
+    @property
+    def mid(self):
+        """중간고사"""
+        return _to_python(self._row[0])
+    
+    @property
+    def mid_extra(self):
+        """중간 EXTRA"""
+        return _to_python(self._row[1])
+    
+    @property
+    def final(self):
+        """기말고사"""
+        return _to_python(self._row[2])
+    
+    @property
+    def exercises(self):
+        """연습과제 5개 (행렬 행이면 복사 없는 뷰)"""
+        return self._row[3:8]
+    
+    @property
+    def scores(self):
+        """8열 성적 행 전체"""
+        return self._row
+    
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def keys(self):
+        return self.FIELDS
+    
+    def __repr__(self):
+        return f"StudentRecord({self.student_id!r}, {list(self._row)!r})"
+
+def _to_python(value):
+    """numpy 스칼라를 파이썬 숫자로 변환"""
+    return value.item() if isinstance(value, np.generic) else value
 
 def get_student_data_dict(student_scores):
     """
-    리스트 형태의 성적을 딕셔너리로 변환 (UI 표시용)
+    리스트 형태의 성적을 레코드로 감쌈 (UI 표시용)
     
     Args:
         student_scores (list): [중간고사, 중간EXTRA, 기말고사, 연습과제1, 연습과제2, 연습과제3, 연습과제4, 연습과제5]
     
     Returns:
-        dict: 딕셔너리 형태의 성적 데이터
+        StudentRecord: record["mid"]처럼 딕셔너리와 같은 방식으로 읽을 수 있는 레코드
+    """
+    return StudentRecord(None, student_scores)
+
+def get_student_record(student_id, class_name, snapshot=None):
+    """
+    스냅샷의 점수 행렬에서 학생 레코드를 꺼냄 (복사 없음)
+    
+    Args:
+        student_id (str): 학번
+        class_name (str): "1분반" 또는 "2분반"
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+    
+    Returns:
+        StudentRecord | None: 학생 레코드, 없는 학번이면 None
     """
+    snapshot = snapshot or get_snapshot()
+    section = snapshot["sections"].get(class_name, _EMPTY_SECTION)
+    row = section["rows"].get(student_id)
+    if row is None:
+        return None
+    return StudentRecord(student_id, section["matrix"][row])
+
+def get_section_matrix(class_name):
+    """
+    분반의 성적을 연속된 2차원 배열로 반환 (스냅샷에서 읽음)
+    
+    Args:
+        class_name (str): "1분반" 또는 "2분반"
+    
+    Returns:
+        tuple: (학번 리스트, 학생 수 × 8 점수 행렬) (검증에서 제외된 행은 포함하지 않음)
+    """
+    section = _get_section(class_name)
+    return section["student_ids"], section["matrix"]
+
+def get_rejected_rows(class_name=None, snapshot=None):
+    """
+    적재 시 검증에서 제외된 행의 보고서
+    
+    Args:
+        class_name (str, optional): 분반 이름 (없으면 모든 분반, 샤드 저장소는 요약이 이미
+            계산된 분반만 보고하여 조회되지 않은 분반 파일을 읽지 않음)
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+    
+    Returns:
+        list: [{"class_name", "student_id", "row", "reason"}] 리스트
+    """
+    snapshot = snapshot or get_snapshot()
+    sections = snapshot["sections"]
+    sharded = isinstance(sections, ShardedSections)
+    if class_name is not None:
+        names = [class_name]
+    else:
+        names = sections.summarized() if sharded else list(sections.keys())
+    report = []
+    for name in names:
+        if sharded and name in sections:
+            rejected = sections.summary(name)["rejected"]
+        else:
+            rejected = sections.get(name, _EMPTY_SECTION)["rejected"]
+        for student_id, entry in rejected.items():
+            report.append({"class_name": name, "student_id": student_id,
+                           "row": entry["row"], "reason": entry["reason"]})
+    return report
+
+@metrics.timed("grades.get_all_scores")
+def get_all_scores(class_name):
+    """
+    특정 분반의 모든 학생 총점을 반환 (스냅샷에서 읽음)
+    
+    Args:
+        class_name (str): "1분반" 또는 "2분반"
+    
+    Returns:
+        Mapping: {학번: 총점} 형태의 읽기 전용 딕셔너리
+    """
+    return _get_section(class_name)["scores"]
+
+def build_rank_index(student_ids, totals):
+    """
+    총점 배열로부터 등수 인덱스를 생성
+    
+    Args:
+        student_ids (list): 학번 리스트
+        totals (numpy.ndarray): 학번 순서와 같은 총점 배열
+    
+    Returns:
+        dict: 등수 인덱스
+            - student_ids (list): 총점 내림차순 학번 (동점은 원래 순서 유지)
+            - totals (numpy.ndarray): 총점 내림차순 배열
+            - ascending (numpy.ndarray): 총점 오름차순 배열 (이진 탐색용)
+    
+    {학번: 등수} 맵은 스냅샷을 묶을 때 ascending 배열로부터 만들어집니다.
+    """
+    totals = np.asarray(totals, dtype=np.float64)
+    order = np.argsort(-totals, kind="stable")
     return {
-        "mid": student_scores[0],
-        "mid_extra": student_scores[1],
-        "final": student_scores[2],
-        "exercises": student_scores[3:8]
+        "student_ids": [student_ids[i] for i in order],
+        "totals": totals[order],
+        "ascending": np.sort(totals),
     }
 
-def get_all_scores(class_name):
+def _freeze(array):
+    """배열을 읽기 전용으로 표시하여 반환"""
+    array.flags.writeable = False
+    return array
+
+def _assemble_section(grades, policy, student_ids, matrix, rejected, totals, rank_index):
+    """계산된 배열과 등수 인덱스를 읽기 전용 분반 스냅샷으로 묶음"""
+    ascending = rank_index["ascending"]
+    # 자신보다 높은 점수의 개수 + 1이 등수
+    ranks = len(totals) - np.searchsorted(ascending, totals, side="right") + 1
+    return MappingProxyType({
+        "grades": grades,
+        "policy": policy,
+        "student_ids": student_ids,
+        "rows": MappingProxyType({sid: i for i, sid in enumerate(student_ids)}),
+        "id_index": StudentIdIndex(student_ids),
+        "matrix": _freeze(matrix),
+        "rejected": rejected,
+        "totals": _freeze(totals),
+        "scores": MappingProxyType(dict(zip(student_ids, totals.tolist()))),
+        "rank_index": MappingProxyType({
+            "student_ids": tuple(rank_index["student_ids"]),
+            "totals": _freeze(rank_index["totals"]),
+            "ascending": _freeze(ascending),
+            "ranks": MappingProxyType(dict(zip(student_ids, ranks.tolist()))),
+        }),
+        "stats": summarize_section(totals, ascending),
+    })
+
+def build_section_snapshot(grades, policy=None):
+    """
+    한 분반의 총점, 등수, 통계를 한 번에 계산하여 읽기 전용으로 묶음
+    
+    Args:
+        grades (dict): {학번: 성적 리스트} 형태의 분반 데이터
+        policy (Mapping, optional): 컴파일된 성적 산출 정책 (기본값: 기본 정책)
+    
+    Returns:
+        Mapping: 분반 스냅샷
+            - grades (dict): 스냅샷을 만든 원본 분반 데이터
+            - policy (Mapping): 총점 계산에 사용한 정책
+            - student_ids (tuple), matrix, totals (numpy.ndarray): 검증을 통과한 행만 포함
+            - rejected (Mapping): {학번: {"row", "reason"}} 검증에서 제외된 행
+            - rows (Mapping): {학번: 행렬의 행 번호}
+            - id_index (StudentIdIndex): 학번 검색 인덱스 (첫 검색 시 생성, 큰 분반은 백그라운드에서)
+            - scores (Mapping): {학번: 총점}
+            - rank_index (Mapping): 등수 인덱스
+            - stats (Mapping): count, avg, std, min, max, quantiles, histogram
+    """
+    policy = policy or get_policy()
+    with metrics.timer("grades.ingest"):
+        student_ids, matrix, rejected = ingest_section(grades, policy)
+    with metrics.timer("grades.calc_scores"):
+        totals = calc_scores(matrix, None, policy)
+    rank_index = build_rank_index(student_ids, totals)
+    return _assemble_section(grades, policy, student_ids, matrix, rejected, totals, rank_index)
+
+def _remove_sorted(array, values, descending=False):
+    """정렬된 배열에서 값들을 하나씩 제거 (전체 재정렬 없이)"""
+    if len(values) == 0:
+        return array, np.zeros(0, dtype=np.intp)
+    keys = -array if descending else array
+    values = np.sort(-values if descending else values)
+    # 같은 값이 여러 번 제거될 때는 동점 구간 안에서 다음 위치를 사용
+    first = np.r_[True, values[1:] != values[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(values)), 0))
+    positions = np.searchsorted(keys, values, side="left") + (np.arange(len(values)) - group_start)
+    return np.delete(array, positions), positions
+
+def _insert_sorted(array, values):
+    """오름차순 배열에 값들을 정렬 위치에 삽입 (전체 재정렬 없이)"""
+    values = np.sort(values)
+    return np.insert(array, np.searchsorted(array, values, side="right"), values)
+
+def _merge_rank_order(totals, rows, new_totals, new_rows):
+    """
+    총점 내림차순 등수 배열에 새 학생들이 들어갈 위치 계산
+    
+    동점은 새 데이터의 행 번호 순서로 두어 build_rank_index(안정 정렬)와 같은 순서를 만듭니다.
+    
+    Args:
+        totals (numpy.ndarray): 남은 학생의 총점 (내림차순)
+        rows (numpy.ndarray): 남은 학생의 새 데이터 행 번호 (totals와 같은 순서)
+        new_totals (numpy.ndarray): 삽입할 학생의 총점
+        new_rows (numpy.ndarray): 삽입할 학생의 새 데이터 행 번호
+    
+    Returns:
+        tuple | None: (삽입 위치, 삽입 순서) — np.insert(totals, 위치, new_totals[순서]),
+            남은 학생의 동점 순서가 행 번호 순서와 다르면 None
+    """
+    same_total = totals[1:] == totals[:-1]
+    if np.any(same_total & (rows[1:] < rows[:-1])):
+        return None
+    # 동점 구간 시작 위치 × span + 행 번호 + 1 을 정렬 키로 사용 (남은 학생 배열에서 증가함)
+    span = len(totals) + len(new_totals) + 2
+    keys = -totals
+    run_start = np.searchsorted(keys, keys, side="left")
+    kept_keys = run_start.astype(np.int64) * span + rows + 1
+    order = np.lexsort((new_rows, -new_totals))
+    new_totals = new_totals[order]
+    start = np.searchsorted(keys, -new_totals, side="left")
+    stop = np.searchsorted(keys, -new_totals, side="right")
+    # 같은 총점이 없으면 구간 맨 앞 (행 번호 자리를 0으로)
+    new_keys = start.astype(np.int64) * span + np.where(stop > start, new_rows[order] + 1, 0)
+    return np.searchsorted(kept_keys, new_keys, side="left"), order
+
+def update_section_snapshot(section, grades, section_name=None):
+    """
+    기존 분반 스냅샷과 새 데이터를 비교하여 바뀐 학생만 다시 계산
+    
+    Args:
+        section (Mapping): 현재 분반 스냅샷
+        grades (dict): 새 분반 데이터
+        section_name (str, optional): 분반 이름 (현재 정책을 다시 확인할 때 사용)
+    
+    Returns:
+        tuple: (새 분반 스냅샷, 다시 계산한 학생 수)
+    
+    바뀐 학생의 총점만 calc_scores로 다시 계산하고, 등수 배열은 정렬 위치에
+    삭제/삽입하여 갱신합니다 (전체 재정렬 없음). 분반의 정책이 바뀌었으면
+    전체를 다시 계산합니다.
+    """
+    policy = get_policy(section_name) if section_name is not None else section["policy"]
+    if policy is not section["policy"]:
+        return build_section_snapshot(grades, policy), len(grades)
+    with metrics.timer("grades.ingest"):
+        student_ids, matrix, rejected = ingest_section(grades, policy)
+    
+    # 새 학번별 이전 행 번호 (-1: 새로 추가된 학생)
+    old_rows = section["rows"]
+    previous = np.array([old_rows.get(sid, -1) for sid in student_ids], dtype=np.intp)
+    existing = previous >= 0
+    changed = ~existing
+    if existing.any():
+        old_matrix = section["matrix"][previous[existing]]
+        changed[existing] = np.any(old_matrix != matrix[existing], axis=1)
+    
+    totals = np.zeros(len(student_ids), dtype=np.float64)
+    totals[existing] = section["totals"][previous[existing]]
+    totals[changed] = calc_scores(matrix[changed], None, policy)
+    
+    # 등수 인덱스에서 바뀐 학생과 삭제된 학생을 빼고, 바뀐 학생을 새 총점으로 삽입
+    kept = set(student_ids)
+    changed_ids = {student_ids[i] for i in np.flatnonzero(changed)}
+    outgoing = [sid for sid in section["student_ids"] if sid not in kept or sid in changed_ids]
+    outgoing_totals = np.array([section["scores"][sid] for sid in outgoing], dtype=np.float64)
+    incoming = np.flatnonzero(changed)
+    incoming_totals = totals[incoming]
+    
+    ascending, _ = _remove_sorted(section["rank_index"]["ascending"], outgoing_totals)
+    ascending = _insert_sorted(ascending, incoming_totals)
+    
+    removed = set(outgoing)
+    keep_mask = np.array([sid not in removed for sid in section["rank_index"]["student_ids"]],
+                         dtype=bool)
+    ordered_ids = np.array(section["rank_index"]["student_ids"], dtype=object)[keep_mask]
+    ordered_totals = section["rank_index"]["totals"][keep_mask]
+    new_rows = {sid: i for i, sid in enumerate(student_ids)}
+    ordered_rows = np.array([new_rows[sid] for sid in ordered_ids.tolist()], dtype=np.intp)
+    merged = _merge_rank_order(ordered_totals, ordered_rows, incoming_totals, incoming)
+    if merged is None:
+        # 남은 학생의 순서가 새 데이터에서 바뀐 경우: 전체 재정렬
+        rank_index = build_rank_index(student_ids, totals)
+        rank_index["ascending"] = ascending
+    else:
+        positions, order = merged
+        ordered_totals = np.insert(ordered_totals, positions, incoming_totals[order])
+        ordered_ids = np.insert(ordered_ids, positions,
+                                np.array([student_ids[i] for i in incoming[order]], dtype=object))
+        rank_index = {"student_ids": ordered_ids.tolist(), "totals": ordered_totals,
+                      "ascending": ascending}
+    
+    new_section = _assemble_section(grades, policy, student_ids, matrix, rejected, totals, rank_index)
+    return new_section, int(changed.sum())
+
+def _section_nbytes(section):
+    """
+    분반 스냅샷의 메모리 사용량 추정 (바이트)
+    
+    배열 크기, 학번 문자열 크기, 학생별 딕셔너리·값 객체 크기 (_STUDENT_OBJECT_BYTES),
+    학번 검색 인덱스 크기 (아직 만들지 않았으면 만들어질 크기의 추정)를 더합니다.
+    """
+    rank_index = section["rank_index"]
+    student_ids = section["student_ids"]
+    arrays = (section["matrix"], section["totals"], rank_index["totals"], rank_index["ascending"])
+    return int(sum(array.nbytes for array in arrays)
+               + sum(map(sys.getsizeof, student_ids))
+               + len(student_ids) * _STUDENT_OBJECT_BYTES
+               + section["id_index"].estimated_nbytes())
+
+def _summary_key(entry, policy):
+    """샤드 분반 캐시 키 (분반, 분반 데이터 버전, 정책 지문)"""
+    return (entry["name"], entry["data_version"], policy["fingerprint"])
+
+def _store_summary(key, rejected, totals):
+    """샤드 분반 요약을 만들어 저장 (같은 분반의 이전 버전 요약은 버림)"""
+    summary = MappingProxyType({"rejected": rejected, "sketch": build_sketch(totals, DEFAULT_ERROR)})
+    with _shard_lock:
+        for old_key in [k for k in _shard_summaries if k[0] == key[0] and k != key]:
+            del _shard_summaries[old_key]
+        return _shard_summaries.setdefault(key, summary)
+
+def _load_shard_summary(store, entry, policy):
     """
-    특정 분반의 모든 학생 총점을 계산하여 반환
+    샤드 저장소의 분반 요약을 캐시에서 찾거나 계산
+    
+    캐시된 분반 스냅샷이 없으면 검증과 총점 계산만 하고 결과를 LRU 캐시에 넣지 않으므로
+    조회 중인 분반 스냅샷을 밀어내지 않습니다.
+    
+    Args:
+        store (ShardedGradeStore): 샤드 저장소
+        entry (Mapping): 분반 메타데이터 (manifest 항목)
+        policy (Mapping): 분반의 컴파일된 정책
+    
+    Returns:
+        Mapping: 분반 요약
+            - rejected (Mapping): {학번: {"row", "reason"}} 검증에서 제외된 행
+            - sketch (KLLSketch): 기본 오차(DEFAULT_ERROR)의 총점 스케치
+    """
+    key = _summary_key(entry, policy)
+    with _shard_lock:
+        summary = _shard_summaries.get(key)
+        cached = _shard_sections.get(key)
+    if summary is not None:
+        metrics.count("grades.shard.summary.hit")
+        return summary
+    metrics.count("grades.shard.summary.miss")
+    if cached is not None:
+        return _store_summary(key, cached[0]["rejected"], cached[0]["totals"])
+    with metrics.timer("grades.summarize_shard"):
+        _, matrix, rejected = ingest_section(store[entry["name"]], policy)
+        totals = calc_scores(matrix, None, policy)
+    return _store_summary(key, rejected, totals)
+
+def _load_shard_section(store, entry, policy):
+    """
+    샤드 저장소의 분반 스냅샷을 LRU 캐시에서 찾거나 계산
     
     Args:
+        store (ShardedGradeStore): 샤드 저장소
+        entry (Mapping): 분반 메타데이터 (manifest 항목)
+        policy (Mapping): 분반의 컴파일된 정책
+    
+    Returns:
+        Mapping: 분반 스냅샷
+    """
+    global _shard_bytes
+    key = _summary_key(entry, policy)
+    with _shard_lock:
+        cached = _shard_sections.get(key)
+        if cached is not None:
+            _shard_sections.move_to_end(key)
+    if cached is not None:
+        metrics.count("grades.shard.hit")
+        return cached[0]
+    
+    metrics.count("grades.shard.miss")
+    with metrics.timer("grades.load_shard"):
+        section = build_section_snapshot(store[entry["name"]], policy)
+    nbytes = _section_nbytes(section)
+    with _shard_lock:
+        summarized = key in _shard_summaries
+    if not summarized:
+        _store_summary(key, section["rejected"], section["totals"])
+    budget = SHARD_MEMORY_BUDGET_MB * 1024 * 1024
+    with _shard_lock:
+        cached = _shard_sections.get(key)
+        if cached is not None:
+            # 다른 스레드가 먼저 계산함
+            return cached[0]
+        _shard_sections[key] = (section, nbytes)
+        _shard_bytes += nbytes
+        # 예산을 넘으면 가장 오래 조회되지 않은 분반부터 제거 (방금 계산한 분반은 유지)
+        while _shard_bytes > budget and len(_shard_sections) > 1:
+            _, (_, evicted_bytes) = _shard_sections.popitem(last=False)
+            _shard_bytes -= evicted_bytes
+            metrics.count("grades.shard.evict")
+    return section
+
+class ShardedSections(Mapping):
+    """
+    샤드 저장소의 {분반: 분반 스냅샷} (분반 스냅샷은 처음 조회할 때 계산)
+    
+    분반 목록, 포함 여부, 개수는 manifest만으로 답합니다. 계산한 분반 스냅샷은 모든 스냅샷이
+    공유하는 LRU 캐시에 SHARD_MEMORY_BUDGET_MB 안에서 보관되며, 제거된 분반을 다시 조회하면
+    다시 계산합니다. 제외 행 보고서와 총점 스케치는 분반 요약(summary)으로 따로 보관하여
+    분반 스냅샷이 제거되어도 남습니다.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+    
+    def __getitem__(self, class_name):
+        entry = self.store.shards[class_name]
+        return _load_shard_section(self.store, entry, get_policy(class_name))
+    
+    def __contains__(self, class_name):
+        return class_name in self.store.shards
+    
+    def summary(self, class_name):
+        """분반 요약 (_load_shard_summary 결과, 분반 스냅샷을 LRU 캐시에 넣지 않음)"""
+        entry = self.store.shards[class_name]
+        return _load_shard_summary(self.store, entry, get_policy(class_name))
+    
+    def summarized(self):
+        """요약이 이미 계산된 분반 이름 목록 (분반 파일을 읽지 않음)"""
+        with _shard_lock:
+            keys = set(_shard_summaries)
+        return [name for name, entry in self.store.shards.items()
+                if _summary_key(entry, get_policy(name)) in keys]
+    
+    def peers(self, class_name):
+        """같은 과목·학기의 분반 이름 목록 (manifest만 읽음)"""
+        entry = self.store.shards.get(class_name)
+        if entry is None:
+            return []
+        return [name for name, other in self.store.shards.items()
+                if (other["course"], other["term"]) == (entry["course"], entry["term"])]
+    
+    def __iter__(self):
+        return iter(self.store.shards)
+    
+    def __len__(self):
+        return len(self.store.shards)
+
+def get_shard_cache_info():
+    """
+    샤드 저장소 분반 캐시 상태
+    
+    Returns:
+        dict: budget_bytes, used_bytes, sections (캐시된 분반 이름, 오래 조회되지 않은 순),
+            summaries (요약이 계산된 분반 이름)
+    """
+    with _shard_lock:
+        return {
+            "budget_bytes": int(SHARD_MEMORY_BUDGET_MB * 1024 * 1024),
+            "used_bytes": _shard_bytes,
+            "sections": [key[0] for key in _shard_sections],
+            "summaries": [key[0] for key in _shard_summaries],
+        }
+
+def compute_data_version(grades_by_class):
+    """
+    성적 데이터의 해시값(데이터 버전)을 계산
+    
+    Args:
+        grades_by_class (dict): {분반: {학번: 성적 리스트}}
+    
+    Returns:
+        str: 데이터 내용으로부터 계산한 16자리 해시 문자열
+    """
+    if hasattr(grades_by_class, "data_version"):
+        # 저장소 파일은 생성 시 계산한 버전을 헤더에 가지고 있음
+        return grades_by_class.data_version
+    payload = json.dumps(grades_by_class, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def build_snapshot(grades_by_class):
+    """
+    모든 분반의 스냅샷을 생성
+    
+    Args:
+        grades_by_class (dict): {분반: {학번: 성적 리스트}}
+    
+    Returns:
+        Mapping: 스냅샷
+            - version (str): 스냅샷 버전 (성적 데이터와 분반별 정책으로 계산)
+            - data_version (str): 성적 데이터 버전
+            - sections (Mapping): {분반: 분반 스냅샷}
+              (샤드 저장소는 분반을 처음 조회할 때 계산하는 ShardedSections)
+    """
+    with metrics.timer("grades.build_snapshot"):
+        if hasattr(grades_by_class, "shards"):
+            sections = ShardedSections(grades_by_class)
+        else:
+            sections = {
+                class_name: build_section_snapshot(grades, get_policy(class_name))
+                for class_name, grades in grades_by_class.items()
+            }
+        return _make_snapshot(grades_by_class, sections)
+
+def _make_snapshot(grades_by_class, sections):
+    """분반 스냅샷들을 버전과 함께 읽기 전용 스냅샷으로 묶음"""
+    data_version = compute_data_version(grades_by_class)
+    # 정책이 바뀌면 총점도 바뀌므로 스냅샷 버전에 정책 지문을 포함
+    # (분반 스냅샷은 get_policy(분반)으로 계산되므로 분반을 읽지 않고 지문만 확인)
+    digest = hashlib.sha1(data_version.encode("utf-8"))
+    for class_name in sections:
+        digest.update(f"{class_name}:{get_policy(class_name)['fingerprint']}".encode("utf-8"))
+    return MappingProxyType({
+        "version": digest.hexdigest()[:16],
+        "data_version": data_version,
+        # ShardedSections는 이미 읽기 전용이며, 요약 조회를 위해 감싸지 않음
+        "sections": sections if isinstance(sections, ShardedSections) else MappingProxyType(sections),
+    })
+
+def get_snapshot():
+    """
+    프로세스 전체에서 공유하는 성적 스냅샷을 반환 (없으면 한 번만 생성)
+    
+    Returns:
+        Mapping: build_snapshot 결과 (모든 세션이 같은 객체를 읽음)
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                metrics.count("grades.snapshot.miss")
+                _snapshot = build_snapshot(all_grades)
+            snapshot = _snapshot
+    return snapshot
+
+def invalidate_snapshot():
+    """
+    성적 데이터가 바뀌었을 때 호출하여 스냅샷을 폐기
+    
+    다음 get_snapshot 호출 시 새 데이터로 다시 생성됩니다.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+def reload_grades(grades_by_class):
+    """
+    새 성적 데이터로 스냅샷을 갱신 (바뀐 학생만 다시 계산)
+    
+    Args:
+        grades_by_class (dict): {분반: {학번: 성적 리스트}} 새 데이터
+    
+    Returns:
+        dict: {분반: 다시 계산한 학생 수}
+            (샤드 저장소는 데이터 버전이 바뀐 분반의 학생 수, 다음 조회 때 다시 계산)
+    
+    새 스냅샷을 모두 만든 뒤 한 번에 교체하므로, 조회 중인 세션은
+    항상 이전 스냅샷 또는 새 스냅샷 전체만 보게 됩니다.
+    """
+    global _snapshot, all_grades
+    with _reload_lock, metrics.timer("grades.reload_grades"):
+        if hasattr(grades_by_class, "shards"):
+            # 분반 스냅샷 캐시는 분반 데이터 버전으로 찾으므로 바뀐 분반만 다시 계산됨
+            previous = getattr(all_grades, "shards", {})
+            rescored = {
+                name: entry["count"] for name, entry in grades_by_class.shards.items()
+                if name not in previous or previous[name]["data_version"] != entry["data_version"]
+            }
+            snapshot = build_snapshot(grades_by_class)
+        else:
+            current = get_snapshot()
+            sections = {}
+            rescored = {}
+            for class_name, grades in grades_by_class.items():
+                section = current["sections"].get(class_name)
+                if section is None:
+                    sections[class_name] = build_section_snapshot(grades, get_policy(class_name))
+                    rescored[class_name] = len(grades)
+                else:
+                    sections[class_name], rescored[class_name] = update_section_snapshot(
+                        section, grades, class_name)
+            snapshot = _make_snapshot(grades_by_class, sections)
+        with _snapshot_lock:
+            all_grades = grades_by_class
+            _snapshot = snapshot
+    metrics.count("grades.rescored_rows", sum(rescored.values()))
+    return rescored
+
+def check_store_update(path=None):
+    """
+    저장소 파일이 바뀌었으면 다시 읽어 스냅샷을 갱신
+    
+    Args:
+        path (str, optional): 저장소 파일 또는 샤드 디렉터리 경로 (기본값: GRADES_STORE_PATH)
+    
+    Returns:
+        dict | None: {분반: 다시 계산한 학생 수}, 바뀌지 않았으면 None
+    """
+    global _store_mtime
+    path = path or GRADES_STORE_PATH
+    try:
+        mtime = os.stat(_store_file(path)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if mtime == _store_mtime:
+        return None
+    # 읽기나 갱신이 실패하면 변경 시각을 기록하지 않아 다음 확인 때 다시 시도함
+    store = _open_grade_store(path)
+    if store.data_version == get_snapshot()["data_version"]:
+        rescored = None
+    else:
+        rescored = reload_grades(store)
+    _store_mtime = mtime
+    return rescored
+
+def start_store_watcher(path=None, interval=2.0):
+    """
+    저장소 파일 변경을 주기적으로 확인하는 백그라운드 스레드 시작 (프로세스당 하나)
+    
+    Args:
+        path (str, optional): 저장소 파일 또는 샤드 디렉터리 경로 (기본값: GRADES_STORE_PATH)
+        interval (float): 확인 주기 (초)
+    
+    Returns:
+        threading.Thread | None: 감시 스레드, 저장소 파일이 없으면 None
+    """
+    global _store_watcher
+    path = path or GRADES_STORE_PATH
+    watcher = _store_watcher
+    if watcher is not None and watcher.is_alive():
+        # 매 재실행마다 호출되므로 이미 실행 중이면 잠금 없이 반환
+        return watcher
+    if not os.path.exists(path):
+        return None
+    with _watcher_lock:
+        if _store_watcher is not None and _store_watcher.is_alive():
+            return _store_watcher
+        
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    rescored = check_store_update(path)
+                except Exception:
+                    logger.exception("성적 저장소 다시 읽기 실패: %s", path)
+                    continue
+                if rescored:
+                    logger.info("성적 데이터 갱신: %s", rescored)
+        
+        _store_watcher = threading.Thread(target=watch, name="grade-store-watcher", daemon=True)
+        _store_watcher.start()
+        return _store_watcher
+
+def get_data_version():
+    """
+    현재 스냅샷의 버전을 반환 (캐시 키로 사용)
+    
+    Returns:
+        str: 성적 데이터와 정책으로 계산한 해시 문자열
+    """
+    return get_snapshot()["version"]
+
+def _get_section(class_name):
+    """스냅샷에서 분반 데이터를 찾아 반환 (없는 분반이면 빈 분반)"""
+    section = get_snapshot()["sections"].get(class_name)
+    if section is None:
+        section = _EMPTY_SECTION
+    return section
+
+def get_rank_index(class_name):
+    """
+    분반의 등수 인덱스를 반환 (스냅샷에서 읽음)
+    
+    Args:
+        class_name (str): "1분반" 또는 "2분반"
+    
+    Returns:
+        Mapping: build_rank_index가 만든 등수 인덱스
+    """
+    return _get_section(class_name)["rank_index"]
+
+@metrics.timed("grades.search_student_ids")
+def search_student_ids(class_name, term, offset=0, limit=None, snapshot=None):
+    """
+    검색어를 포함하는 학번을 한 페이지만큼 검색
+    
+    Args:
+        class_name (str): "1분반" 또는 "2분반"
+        term (str): 검색어 (빈 문자열이면 전체 학번)
+        offset (int): 건너뛸 결과 수
+        limit (int, optional): 최대 결과 수
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+    
+    Returns:
+        tuple: (전체 일치 수, 학번 리스트)
+    """
+    snapshot = snapshot or get_snapshot()
+    section = snapshot["sections"].get(class_name, _EMPTY_SECTION)
+    return section["id_index"].search(term, offset, limit)
+
+def get_section_stats(snapshot=None, class_names=None):
+    """
+    분반별 총점 통계와 전체 통계를 반환
+    
+    Args:
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+        class_names (list, optional): 통계를 낼 분반 (기본값: 모든 분반)
+    
+    Returns:
+        tuple: ({분반: 통계}, 대상 분반을 병합한 통계)
+    
+    병합한 통계는 스냅샷 버전·분반 구성별로 한 번만 계산합니다.
+    """
+    snapshot = snapshot or get_snapshot()
+    sections = snapshot["sections"]
+    names = tuple(sections.keys()) if class_names is None else tuple(class_names)
+    selected = [sections[class_name] for class_name in names]
+    by_section = {class_name: section["stats"] for class_name, section in zip(names, selected)}
+    combined = _get_derived(snapshot, ("section_stats", names), lambda: combine_sections(selected))
+    return by_section, combined
+
+@metrics.timed("grades.get_rank_for_score")
+def get_rank_for_score(score, class_name):
+    """
+    특정 분반에서 주어진 총점이 차지하는 등수를 이진 탐색으로 계산
+    
+    Args:
+        score (float): 총점
         class_name (str): "1분반" 또는 "2분반"
     
     Returns:
-        dict: {학번: 총점} 형태의 딕셔너리
+        int: 등수 (자신보다 높은 점수의 개수 + 1)
+    """
+    ascending = get_rank_index(class_name)["ascending"]
+    return int(len(ascending) - np.searchsorted(ascending, score, side="right") + 1)
+
+def _get_derived(snapshot, key, build):
+    """
+    스냅샷 버전별 파생 인덱스를 캐시에서 찾고, 없으면 만들어 저장
+    
+    Args:
+        snapshot (Mapping): 기준 스냅샷
+        key (tuple): 파생 인덱스 종류와 인자
+        build (callable): 인덱스를 만드는 함수
+    
+    Returns:
+        object: 파생 인덱스
+    """
+    full_key = (snapshot["version"],) + key
+    value = _derived.get(full_key)
+    if value is not None:
+        metrics.count(f"grades.derived.{key[0]}.hit")
+    else:
+        metrics.count(f"grades.derived.{key[0]}.miss")
+        with metrics.timer(f"grades.build_{key[0]}"):
+            value = build()
+        with _derived_lock:
+            # 이전 버전의 인덱스는 버림
+            for old_key in [k for k in _derived if k[0] != snapshot["version"]]:
+                del _derived[old_key]
+            _derived[full_key] = value
+    return value
+
+def get_section_sketch(class_name, error=DEFAULT_ERROR, snapshot=None):
+    """
+    분반 총점의 분위수 스케치를 반환 (스냅샷 버전별로 한 번만 생성)
+    
+    Args:
+        class_name (str): 분반 이름
+        error (float): 허용 순위 오차 비율
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+    
+    Returns:
+        KLLSketch: 분반 총점 스케치
+    """
+    snapshot = snapshot or get_snapshot()
+    sections = snapshot["sections"]
+    if error == DEFAULT_ERROR and isinstance(sections, ShardedSections) and class_name in sections:
+        # 샤드 분반은 분반 스냅샷이 제거되어도 남는 요약의 스케치를 사용
+        return sections.summary(class_name)["sketch"]
+    section = sections.get(class_name, _EMPTY_SECTION)
+    return _get_derived(snapshot, ("sketch", class_name, error),
+                        lambda: build_sketch(section["totals"], error))
+
+def get_approximate_rank(score, class_names=None, error=DEFAULT_ERROR, snapshot=None):
+    """
+    주어진 총점의 근사 등수와 백분위를 분반 스케치로 계산
+    
+    여러 분반을 지정하면 분반 스케치를 병합하여 통합 등수를 구하므로
+    전체 총점 배열을 합치거나 정렬하지 않습니다. 샤드 저장소는 기본 오차의 스케치를
+    분반 요약에서 읽으므로 분반 스냅샷을 LRU 캐시에 올리지 않습니다.
+    
+    Args:
+        score (float): 총점
+        class_names (list, optional): 분반 이름 목록 (기본값: 모든 분반)
+        error (float): 허용 순위 오차 비율
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+    
+    Returns:
+        dict: 근사 등수 정보
+            - rank (int): 근사 등수 (자신보다 높은 점수의 개수 + 1)
+            - count (int): 전체 인원
+            - percentile (float): 상위 백분위 (%)
+            - max_error (int): 등수의 대략적인 오차 범위 (명)
+    """
+    snapshot = snapshot or get_snapshot()
+    if class_names is None:
+        class_names = list(snapshot["sections"].keys())
+    sketch = None
+    for class_name in class_names:
+        section_sketch = get_section_sketch(class_name, error, snapshot)
+        sketch = section_sketch if sketch is None else sketch.merge(section_sketch)
+    count = sketch.count if sketch is not None else 0
+    if count == 0:
+        return {"rank": 1, "count": 0, "percentile": 0.0, "max_error": 0}
+    rank = count - sketch.rank(score, inclusive=True) + 1
+    return {
+        "rank": rank,
+        "count": count,
+        "percentile": round(rank / count * 100, 2),
+        "max_error": int(np.ceil(count * error)),
+    }
+
+def _snapshot_peers(snapshot, class_name):
+    """스냅샷에서 같은 과목·학기의 분반 이름 목록 (샤드 저장소가 아니면 모든 분반)"""
+    sections = snapshot["sections"]
+    if isinstance(sections, ShardedSections):
+        return sections.peers(class_name)
+    return list(sections.keys())
+
+def get_global_rank_index(snapshot=None, class_names=None):
+    """
+    여러 분반의 통합 등수 인덱스를 반환 (스냅샷 버전·분반 구성별로 한 번만 생성)
+    
+    Args:
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+        class_names (list, optional): 통합할 분반 (기본값: 모든 분반)
+    
+    Returns:
+        Mapping: build_global_rank_index 결과 (keys는 (분반, 학번) 튜플)
+    """
+    snapshot = snapshot or get_snapshot()
+    sections = snapshot["sections"]
+    names = tuple(sections.keys()) if class_names is None else tuple(class_names)
+    return _get_derived(snapshot, ("global_rank", names),
+                        lambda: build_global_rank_index({name: sections[name] for name in names}))
+
+def get_global_rank(student_id, class_name, mode="competition", snapshot=None):
+    """
+    같은 과목·학기 분반의 통합 등수 계산 (같은 학번이 여러 분반에 있어도 (분반, 학번)으로 구분)
+    
+    샤드 저장소는 과목·학기가 같은 분반만 통합하므로 다른 과목의 분반 파일을 읽지 않습니다.
+    과목·학기 정보가 없는 저장소는 모든 분반을 통합합니다.
+    
+    Args:
+        student_id (str): 학번
+        class_name (str): 분반 이름
+        mode (str): 동점 처리 방식 ("competition", "dense", "fractional")
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+    
+    Returns:
+        int | float: 통합 등수 (fractional이면 float), 없는 학번이면 -1
     """
-    scores = {}
-    grades = get_grades_by_class(class_name)
-    for student_id, scores_list in grades.items():
-        scores[student_id] = calc_score(scores_list)
-    return scores
+    snapshot = snapshot or get_snapshot()
+    section = snapshot["sections"].get(class_name, _EMPTY_SECTION)
+    score = section["scores"].get(student_id)
+    if score is None:
+        return -1
+    index = get_global_rank_index(snapshot, _snapshot_peers(snapshot, class_name))
+    return rank_for_score(index, score, mode)
 
+@metrics.timed("grades.get_student_rank")
 def get_student_rank(student_id, class_name):
     """
     특정 분반에서 학생의 등수를 계산
@@ -197,22 +1254,51 @@ def get_student_rank(student_id, class_name):
         class_name (str): "1분반" 또는 "2분반"
     
     Returns:
-        int: 등수 (1부터 시작)
+        int: 등수 (1부터 시작), 없는 학번이면 -1
     """
-    all_scores = get_all_scores(class_name)
-    if student_id not in all_scores:
-        return -1
-    
-    student_score = all_scores[student_id]
-    # 자신보다 높은 점수의 개수 + 1이 등수
-    rank = sum(1 for score in all_scores.values() if score > student_score) + 1
-    return rank
+    return get_rank_index(class_name)["ranks"].get(student_id, -1)
 
 def get_available_classes():
     """
-    사용 가능한 분반 목록 반환
+    사용 가능한 분반 목록 반환 (샤드 저장소는 manifest만 읽음)
     
     Returns:
         list: 분반 이름 리스트
     """
-    return list(all_grades.keys()) 
\ No newline at end of file
+    return list(all_grades.keys())
+
+def get_class_catalog():
+    """
+    분반 메타데이터 목록 반환 (점수 데이터를 읽지 않음)
+    
+    Returns:
+        list: [{"name", "course", "term", "section", "count"}] 리스트
+            (내장 데이터와 단일 저장소 파일은 course, term이 None, count는 등록된 행 수)
+    """
+    store = all_grades
+    if hasattr(store, "shards"):
+        return [
+            {key: entry[key] for key in ("name", "course", "term", "section", "count")}
+            for entry in store.shards.values()
+        ]
+    return [
+        {"name": name, "course": None, "term": None, "section": name, "count": len(grades)}
+        for name, grades in store.items()
+    ]
+
+def get_peer_classes(class_name):
+    """
+    같은 과목·학기의 분반 목록 반환 (통계·통합 등수를 비교할 범위)
+    
+    Args:
+        class_name (str): 분반 이름
+    
+    Returns:
+        list: 분반 이름 리스트 (과목·학기 정보가 없는 저장소는 모든 분반)
+    """
+    catalog = get_class_catalog()
+    groups = {(entry["course"], entry["term"]) for entry in catalog if entry["name"] == class_name}
+    return [entry["name"] for entry in catalog if (entry["course"], entry["term"]) in groups]
+
+# 존재하지 않는 분반 조회 시 사용하는 빈 분반 스냅샷
+_EMPTY_SECTION = build_section_snapshot({})
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+성적 산출 정책 (구성 항목, 열 범위, 가중치, 반올림 자릿수)
+
+정책은 딕셔너리(JSON) 형태로 선언하고 분반별로 지정합니다.
+grades.py는 정책을 한 번 컴파일한 가중치 벡터로 분반 전체를 일괄 계산합니다.
+
+정책 파일 예시 (policies.json, {분반: 정책}):
+    {
+        "3분반": {
+            "name": "파이썬 프로그래밍",
+            "columns": ["중간고사", "기말고사", "과제"],
+            "components": [
+                {"name": "중간고사", "label": "중간고사", "columns": [0, 1], "weight": 40},
+                {"name": "기말고사", "label": "기말고사", "columns": [1, 2], "weight": 40},
+                {"name": "과제", "label": "과제", "columns": [2, 3], "weight": 20}
+            ],
+            "max_scores": [100, 100, 100],
+            "rounding": 2
+        }
+    }
+"""
+
+import hashlib
+import json
+import os
+from types import MappingProxyType
+
+import numpy as np
+
+# 기본 정책: 자바 프로그래밍 (출석 10% 제외, 나머지 90%를 100%로 비례 확대)
+DEFAULT_POLICY = {
+    "name": "자바 프로그래밍",
+    # 열 이름 (데이터 형식: [중간고사, 중간EXTRA, 기말고사, 연습1, 연습2, 연습3, 연습4, 연습5])
+    "columns": [
+        "중간고사", "중간 EXTRA", "기말고사",
+        "연습과제 1", "연습과제 2", "연습과제 3", "연습과제 4", "연습과제 5",
+    ],
+    # 구성 항목: columns는 [시작, 끝) 열 범위, weight는 % 단위
+    "components": [
+        # 중간고사+중간EXTRA: 30% → 33.33%
+        {"name": "중간고사 합계 (중간+EXTRA)", "label": "중간 전체", "columns": [0, 2], "weight": 33.33},
+        # 기말고사: 40% → 44.44%
+        {"name": "기말고사", "label": "기말고사", "columns": [2, 3], "weight": 44.44},
+        # 연습과제: 20% → 22.22%
+        {"name": "연습과제 합계", "label": "연습과제 전체", "columns": [3, 8], "weight": 22.22},
+    ],
+    # 열별 점수 범위 (적재 시 검사, 벗어난 행은 총점·등수에서 제외)
+    "min_scores": [0, 0, 0, 0, 0, 0, 0, 0],
+    "max_scores": [100, 10, 100, 10, 10, 10, 10, 10],
+    "rounding": 2,
+    "total_name": "총점",
+    "total_note": "100% (출석 10% 제외)",
+}
+
+# 분반별 정책 파일 (있으면 import 시 읽음)
+GRADING_POLICIES_PATH = os.environ.get(
+    "GRADING_POLICIES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "policies.json")
+)
+
+# 분반별 정책 {분반: 정책 딕셔너리} (지정되지 않은 분반은 DEFAULT_POLICY)
+SECTION_POLICIES = {}
+
+# 정책 딕셔너리 id별 컴파일 결과 캐시
+_compiled = {}
+
+# 정수 가중치로 바꿀 때 허용하는 최대 소수 자릿수
+_MAX_WEIGHT_DECIMALS = 6
+
+def weight_decimals(weights):
+    """
+    가중치를 정수로 만들기 위해 필요한 소수 자릿수를 찾음
+
+    compile_policy가 정책 가중치에, what_if가 시나리오 가중치에 사용합니다.
+
+    Args:
+        weights (numpy.ndarray): 열별 가중치 (%)
+
+    Returns:
+        int | None: 소수 자릿수, 정수로 표현할 수 없으면 None
+    """
+    for decimals in range(_MAX_WEIGHT_DECIMALS + 1):
+        scaled = weights * 10 ** decimals
+        if np.all(np.abs(scaled - np.rint(scaled)) < 1e-9):
+            return decimals
+    return None
+
+def compile_policy(policy):
+    """
+    정책을 일괄 계산용 가중치 벡터로 컴파일
+
+    Args:
+        policy (dict): 정책 딕셔너리 (DEFAULT_POLICY 형식)
+
+    Returns:
+        Mapping: 컴파일된 정책
+            - name, labels, components, rounding, total_name, total_note
+            - columns (int): 한 행의 요소 수
+            - weights (numpy.ndarray): 열별 가중치 (%)
+            - int_weights (numpy.ndarray | None): 가중치 × 10^weight_decimals 정수 벡터
+            - weight_decimals (int | None): 정수 가중치의 소수 자릿수
+            - min_scores, max_scores (numpy.ndarray | None): 열별 점수 범위 (없으면 검사하지 않음)
+            - fingerprint (str): 정책 내용의 해시 (스냅샷 버전 계산용)
+            - spec (dict): 컴파일 전 정책 (컴파일된 정책은 pickle되지 않으므로 작업 프로세스에 전달할 때 사용)
+
+    Raises:
+        ValueError: 열 범위가 잘못되었거나 겹치는 경우, 점수 범위의 길이가 열 수와 다른 경우
+    """
+    labels = tuple(policy["columns"])
+    width = len(labels)
+    weights = np.zeros(width, dtype=np.float64)
+    covered = np.zeros(width, dtype=bool)
+    components = []
+    for component in policy["components"]:
+        start, stop = component["columns"]
+        if not 0 <= start < stop <= width:
+            raise ValueError(f"정책 '{policy['name']}': 잘못된 열 범위 {component['columns']}")
+        if covered[start:stop].any():
+            raise ValueError(f"정책 '{policy['name']}': 열 범위가 겹칩니다 {component['columns']}")
+        covered[start:stop] = True
+        weights[start:stop] = component["weight"]
+        components.append(MappingProxyType({
+            "name": component["name"],
+            "label": component.get("label", component["name"]),
+            "start": start,
+            "stop": stop,
+            "weight": component["weight"],
+        }))
+
+    bounds = {}
+    for key in ("min_scores", "max_scores"):
+        values = policy.get(key)
+        if values is not None:
+            if len(values) != width:
+                raise ValueError(f"정책 '{policy['name']}': {key}는 {width}개여야 합니다")
+            values = np.asarray(values, dtype=np.float64)
+            values.flags.writeable = False
+        bounds[key] = values
+    
+    decimals = weight_decimals(weights)
+    int_weights = None
+    if decimals is not None:
+        int_weights = np.rint(weights * 10 ** decimals).astype(np.int64)
+        int_weights.flags.writeable = False
+    weights.flags.writeable = False
+    return MappingProxyType({
+        "spec": policy,
+        "name": policy["name"],
+        "labels": labels,
+        "columns": width,
+        "components": tuple(components),
+        "rounding": policy.get("rounding", 2),
+        "total_name": policy.get("total_name", "총점"),
+        "total_note": policy.get("total_note", "100%"),
+        "weights": weights,
+        "int_weights": int_weights,
+        "weight_decimals": decimals,
+        "min_scores": bounds["min_scores"],
+        "max_scores": bounds["max_scores"],
+        "fingerprint": hashlib.sha1(
+            json.dumps(policy, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16],
+    })
+
+def get_policy(class_name=None):
+    """
+    분반의 컴파일된 정책을 반환 (정책별로 한 번만 컴파일)
+
+    Args:
+        class_name (str, optional): 분반 이름 (없으면 기본 정책)
+
+    Returns:
+        Mapping: compile_policy 결과
+    """
+    policy = SECTION_POLICIES.get(class_name, DEFAULT_POLICY)
+    compiled = _compiled.get(id(policy))
+    if compiled is None or compiled[0] is not policy:
+        compiled = (policy, compile_policy(policy))
+        _compiled[id(policy)] = compiled
+    return compiled[1]
+
+def load_policies(path):
+    """
+    정책 파일을 읽어 분반별 정책으로 등록
+
+    Args:
+        path (str): {분반: 정책} 형태의 JSON 파일
+
+    Returns:
+        dict: 읽은 {분반: 정책}
+
+    정책을 바꾼 뒤에는 grades.invalidate_snapshot()으로 스냅샷을 다시 만들어야 합니다.
+    """
+    with open(path, encoding="utf-8") as f:
+        policies = json.load(f)
+    for policy in policies.values():
+        compile_policy(policy)  # 잘못된 정책은 등록 전에 오류
+    SECTION_POLICIES.update(policies)
+    return policies
+
+def build_detail_rows(policy, scores, total):
+    """
+    상세 성적표 행을 정책으로부터 생성
+
+    Args:
+        policy (Mapping): 컴파일된 정책
+        scores (list): 한 학생의 성적 행
+        total (float): 총점
+
+    Returns:
+        list: [(항목, 점수, 가중치 설명)] 리스트
+
+    여러 열로 이루어진 구성 항목은 열별 행 뒤에 합계 행을 두고,
+    한 열짜리 구성 항목은 그 열의 행에 가중치를 표시합니다.
+    """
+    values = scores.tolist() if hasattr(scores, "tolist") else list(scores)
+    rows = []
+    for component in policy["components"]:
+        start, stop = component["start"], component["stop"]
+        weight_text = f"{component['weight']:g}% ({component['label']})"
+        if stop - start == 1:
+            rows.append((policy["labels"][start], values[start], weight_text))
+            continue
+        for j in range(start, stop):
+            rows.append((policy["labels"][j], values[j], "-"))
+        rows.append((component["name"], sum(values[start:stop]), weight_text))
+    rows.append((policy["total_name"], total, policy["total_note"]))
+    return rows
+
+if os.path.exists(GRADING_POLICIES_PATH):
+    load_policies(GRADING_POLICIES_PATH)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+학번 검색 인덱스 (n-gram 부분 문자열 검색)
+
+학번의 길이 1~MAX_GRAM 부분 문자열(n-gram)을 정수 코드로 바꾸어 정렬한 배열과, 코드별로
+학번 행 번호를 모은 목록(CSR 형식)을 numpy로 한 번에 만듭니다. 검색은 코드 배열에서 이진
+탐색하므로 시간이 분반 학생 수가 아니라 일치하는 학번 수(또는 가장 짧은 n-gram 목록)에
+비례합니다.
+
+큰 분반의 인덱스는 첫 검색 때 백그라운드 스레드에서 만들고, 완성될 때까지는 전체 학번을
+한 번 훑는 선형 검색으로 답하므로 다시 읽기 직후의 첫 검색이 멈추지 않습니다.
+"""
+
+import threading
+
+import numpy as np
+
+# n-gram 최대 길이 (이보다 긴 검색어는 n-gram 목록의 교집합 후 확인)
+MAX_GRAM = 3
+
+# 이보다 작은 분반은 첫 검색 때 바로 인덱스를 만듦 (수 ms 이내)
+SYNC_BUILD_SIZE = 50_000
+
+# 문자 하나의 코드 비트 수 (유니코드 코드 포인트 < 2^21, 3글자 코드가 int64에 들어감)
+_CHAR_BITS = 21
+
+_NO_ROWS = np.zeros(0, dtype=np.int32)
+
+def _gram_code(gram):
+    """n-gram 문자열의 정수 코드 (길이가 다르면 코드 범위도 겹치지 않음)"""
+    code = 0
+    for char in gram:
+        code = (code << _CHAR_BITS) | ord(char)
+    return code
+
+def build_postings(student_ids):
+    """
+    학번들의 n-gram 목록을 정렬된 코드 배열과 행 번호 목록으로 생성
+
+    Args:
+        student_ids (tuple): 학번
+
+    Returns:
+        tuple: (codes, offsets, rows)
+            - codes (numpy.ndarray): 서로 다른 n-gram 코드의 오름차순 배열 (int64)
+            - offsets (numpy.ndarray): codes[i]의 행 번호는 rows[offsets[i]:offsets[i + 1]]
+            - rows (numpy.ndarray): n-gram별 행 번호 (각 목록은 원래 데이터 순서, int32)
+    """
+    n = len(student_ids)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(1, dtype=np.int64), _NO_ROWS
+    ids = np.array(student_ids, dtype=str)
+    width = ids.dtype.itemsize // 4
+    chars = ids.view(np.uint32).reshape(n, width).astype(np.int64)
+    lengths = np.char.str_len(ids)
+    all_codes = []
+    all_rows = []
+    for size in range(1, min(MAX_GRAM, width) + 1):
+        positions = width - size + 1
+        codes = np.zeros((n, positions), dtype=np.int64)
+        for k in range(size):
+            codes = (codes << _CHAR_BITS) | chars[:, k:k + positions]
+        # 행 우선으로 펼치므로 행 번호가 증가하는 순서 → 안정 정렬 후에도 코드별로 데이터 순서
+        valid = (np.arange(positions) + size <= lengths[:, None]).ravel()
+        codes = codes.ravel()[valid]
+        rows = np.repeat(np.arange(n, dtype=np.int32), positions)[valid]
+        order = np.argsort(codes, kind="stable")
+        codes, rows = codes[order], rows[order]
+        # 같은 학번 안에서 반복되는 n-gram은 한 번만 기록
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        all_codes.append(codes[keep])
+        all_rows.append(rows[keep])
+    # 길이가 짧은 n-gram의 코드가 항상 더 작으므로 이어 붙여도 정렬 상태
+    codes = np.concatenate(all_codes)
+    rows = np.concatenate(all_rows)
+    first = np.ones(len(codes), dtype=bool)
+    first[1:] = codes[1:] != codes[:-1]
+    starts = np.flatnonzero(first)
+    offsets = np.append(starts, len(codes)).astype(np.int64)
+    return codes[starts], offsets, rows
+
+class StudentIdIndex:
+    """
+    한 분반의 학번 검색 인덱스
+
+    인덱스는 첫 검색 시 한 번만 만들어집니다 (큰 분반은 백그라운드 스레드에서).
+    검색 결과는 항상 원래 데이터 순서를 따릅니다.
+    """
+
+    __slots__ = ("_student_ids", "_postings", "_lock", "_builder")
+
+    def __init__(self, student_ids):
+        self._student_ids = tuple(student_ids)
+        self._postings = None
+        self._lock = threading.Lock()
+        self._builder = None
+
+    @property
+    def ready(self):
+        """n-gram 인덱스가 만들어졌는지 여부"""
+        return self._postings is not None
+
+    @property
+    def nbytes(self):
+        """만들어진 n-gram 인덱스의 배열 크기 (바이트, 만들기 전이면 0)"""
+        postings = self._postings
+        return sum(array.nbytes for array in postings) if postings is not None else 0
+
+    def estimated_nbytes(self):
+        """
+        n-gram 인덱스 크기 (만들어졌으면 실제 크기, 아니면 만들어질 크기의 상한 추정)
+
+        행 번호 목록(int32)은 학번마다 길이 1~MAX_GRAM 부분 문자열 수만큼이고, 코드·위치
+        배열(int64 2개)은 서로 다른 n-gram 수만큼이므로 학번에 쓰인 문자 종류로 상한을 잡습니다
+        (숫자 학번이면 많아야 10 + 100 + 1,000개).
+        """
+        if self._postings is not None:
+            return self.nbytes
+        lengths = np.fromiter(map(len, self._student_ids), dtype=np.int64, count=len(self._student_ids))
+        alphabet = len(set("".join(self._student_ids)))
+        entries = 0
+        distinct = 0
+        for size in range(1, MAX_GRAM + 1):
+            count = int(np.maximum(lengths - size + 1, 0).sum())
+            entries += count
+            distinct += min(count, alphabet ** size)
+        return entries * 4 + distinct * 16
+
+    def build(self):
+        """n-gram 인덱스를 지금 스레드에서 만듦 (이미 있으면 그대로)"""
+        with self._lock:
+            if self._postings is None:
+                self._postings = build_postings(self._student_ids)
+
+    def _start_build(self):
+        """백그라운드 스레드에서 인덱스 생성 시작 (한 번만)"""
+        if self._builder is not None:
+            # 생성 중에는 생성 스레드가 잠금을 잡고 있으므로 기다리지 않고 반환
+            return
+        with self._lock:
+            if self._builder is not None or self._postings is not None:
+                return
+            self._builder = threading.Thread(target=self.build, name="student-id-index", daemon=True)
+            self._builder.start()
+
+    def _gram_rows(self, gram):
+        """n-gram을 포함하는 행 번호 (이진 탐색)"""
+        codes, offsets, rows = self._postings
+        code = _gram_code(gram)
+        i = int(np.searchsorted(codes, code))
+        if i == len(codes) or codes[i] != code:
+            return _NO_ROWS
+        return rows[offsets[i]:offsets[i + 1]]
+
+    def search(self, term, offset=0, limit=None):
+        """
+        검색어를 포함하는 학번 검색 (n-gram 인덱스)
+
+        Args:
+            term (str): 검색어 (빈 문자열이면 전체)
+            offset (int): 건너뛸 결과 수
+            limit (int, optional): 최대 결과 수
+
+        Returns:
+            tuple: (전체 일치 수, 학번 리스트)
+        """
+        if not term:
+            return len(self._student_ids), self._page(None, offset, limit)
+        if self._postings is None:
+            if len(self._student_ids) < SYNC_BUILD_SIZE:
+                self.build()
+            else:
+                # 인덱스가 완성될 때까지는 선형 검색
+                rows = np.array([row for row, student_id in enumerate(self._student_ids)
+                                 if term in student_id], dtype=np.int32)
+                self._start_build()
+                return len(rows), self._page(rows, offset, limit)
+        if len(term) <= MAX_GRAM:
+            rows = self._gram_rows(term)
+        else:
+            # 검색어의 모든 n-gram을 포함하는 후보를 구한 뒤 실제 포함 여부 확인
+            grams = {term[i:i + MAX_GRAM] for i in range(len(term) - MAX_GRAM + 1)}
+            lists = sorted((self._gram_rows(gram) for gram in grams), key=len)
+            rows = lists[0]
+            for other in lists[1:]:
+                if len(rows) == 0:
+                    break
+                rows = rows[np.isin(rows, other, assume_unique=True)]
+            rows = np.array([row for row in rows.tolist() if term in self._student_ids[row]], dtype=np.int32)
+        return len(rows), self._page(rows, offset, limit)
+
+    def _page(self, rows, offset, limit):
+        """행 번호 목록에서 한 페이지의 학번만 꺼냄"""
+        stop = None if limit is None else offset + limit
+        if rows is None:
+            return list(self._student_ids[offset:stop])
+        return [self._student_ids[row] for row in rows[offset:stop].tolist()]
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+성적 데이터 검증·적재 (스냅샷을 만들 때 분반마다 한 번만 실행)
+
+행의 요소 수, 숫자 여부, 유한값 여부, 정책에 선언된 열별 점수 범위를 검사하여
+정상 행만 담은 점수 행렬과 제외된 행의 보고서를 만듭니다.
+총점 계산(grades.calc_scores)은 검증된 행렬만 받으므로 행 단위 검사를 하지 않습니다.
+"""
+
+import numbers
+from types import MappingProxyType
+
+import numpy as np
+
+def _check_row(student_scores, columns):
+    """
+    한 행의 형식 검사 (느린 경로에서만 사용)
+
+    Args:
+        student_scores (list): 한 학생의 성적 행
+        columns (int): 한 행의 요소 수
+
+    Returns:
+        str | None: 제외 사유, 정상이면 None
+    """
+    if not isinstance(student_scores, (list, tuple, np.ndarray)):
+        return f"성적 행이 리스트가 아닙니다: {type(student_scores).__name__}"
+    if len(student_scores) != columns:
+        return f"잘못된 데이터 형식: {len(student_scores)}개 요소 ({columns}개 필요)"
+    for value in student_scores:
+        # bool은 빠른 경로(numpy 변환)와 같이 0/1 점수로 취급
+        if not isinstance(value, (numbers.Real, np.bool_)):
+            return f"숫자가 아닌 값이 포함되어 있습니다: {value!r}"
+    return None
+
+def validate_rows(rows, columns, min_scores=None, max_scores=None, labels=None):
+    """
+    성적 행들을 검증하여 점수 행렬로 변환
+
+    Args:
+        rows (list): 학생별 성적 리스트의 리스트
+        columns (int): 한 행의 요소 수
+        min_scores (numpy.ndarray, optional): 열별 최소 점수
+        max_scores (numpy.ndarray, optional): 열별 최대 점수
+        labels (tuple, optional): 열 이름 (제외 사유 표시용)
+
+    Returns:
+        tuple: (matrix, valid, reasons)
+            - matrix (numpy.ndarray): 학생 수 × 열 수 점수 배열 (제외된 행은 0,
+              소수 점수가 없으면 int64, 있으면 float64)
+            - valid (numpy.ndarray): 행별 정상 여부 (bool)
+            - reasons (dict): {행 번호: 제외 사유}
+    """
+    reasons = {}
+    if isinstance(rows, np.ndarray):
+        matrix = rows
+    else:
+        rows = list(rows)
+        # 빠른 경로: 모든 행이 길이가 맞는 숫자 리스트이면 numpy가 한 번에 변환
+        try:
+            matrix = np.array(rows)
+        except (TypeError, ValueError):
+            matrix = None
+    if not (matrix is not None and matrix.ndim == 2 and matrix.shape[1] == columns
+            and matrix.dtype.kind in "iuf"):
+        # 느린 경로: 행 단위로 형식을 검사하여 잘못된 행은 0으로 채움
+        matrix = np.zeros((len(rows), columns), dtype=np.float64)
+        for i, student_scores in enumerate(rows):
+            reason = _check_row(student_scores, columns)
+            if reason is None:
+                matrix[i] = student_scores
+            else:
+                reasons[i] = reason
+    matrix = matrix.reshape(len(rows), columns)
+
+    # 값 검사는 열 단위로 한 번에 수행
+    bad_values = ~np.isfinite(matrix) if matrix.dtype.kind == "f" else np.zeros(matrix.shape, dtype=bool)
+    if min_scores is not None:
+        bad_values |= matrix < min_scores
+    if max_scores is not None:
+        bad_values |= matrix > max_scores
+    for i in np.flatnonzero(bad_values.any(axis=1)).tolist():
+        if i in reasons:
+            continue
+        j = int(np.flatnonzero(bad_values[i])[0])
+        label = labels[j] if labels else f"{j + 1}번째 열"
+        if not np.isfinite(matrix[i, j]):
+            reasons[i] = f"유한하지 않은 점수: {label}={matrix[i, j]}"
+            continue
+        low = min_scores[j] if min_scores is not None else -np.inf
+        high = max_scores[j] if max_scores is not None else np.inf
+        reasons[i] = f"범위를 벗어난 점수: {label}={matrix[i, j]:g} ({low:g}~{high:g})"
+
+    valid = np.ones(len(rows), dtype=bool)
+    if reasons:
+        valid[list(reasons)] = False
+        matrix = np.where(valid[:, None], matrix, 0)
+    if matrix.dtype.kind == "f" and np.all(matrix == np.floor(matrix)):
+        # 소수 점수가 없으면 정수 행렬로 유지 (표시 형식이 원본과 같도록)
+        matrix = matrix.astype(np.int64)
+    return np.ascontiguousarray(matrix), valid, reasons
+
+def ingest_section(grades, policy):
+    """
+    한 분반의 데이터를 검증하여 정상 행만 담은 점수 행렬 생성
+
+    Args:
+        grades (Mapping): {학번: 성적 리스트} 형태의 분반 데이터
+            (score_matrix()가 있는 저장소 분반은 형식 검사 없이 범위만 검사)
+        policy (Mapping): 컴파일된 성적 산출 정책
+
+    Returns:
+        tuple: (student_ids, matrix, rejected)
+            - student_ids (tuple): 정상 행의 학번 (원래 순서)
+            - matrix (numpy.ndarray): 정상 행의 점수 행렬
+            - rejected (Mapping): {학번: {"row": 원래 행, "reason": 제외 사유}}
+    """
+    student_ids = tuple(grades.keys())
+    if hasattr(grades, "score_matrix"):
+        rows = grades.score_matrix()
+        if rows.shape[1] != policy["columns"]:
+            rows = grades.values()
+    else:
+        rows = grades.values()
+    matrix, valid, reasons = validate_rows(
+        rows, policy["columns"], policy["min_scores"], policy["max_scores"], policy["labels"])
+    if not reasons:
+        return student_ids, matrix, MappingProxyType({})
+
+    rejected = {
+        student_ids[i]: MappingProxyType({"row": grades[student_ids[i]], "reason": reason})
+        for i, reason in sorted(reasons.items())
+    }
+    kept = tuple(student_ids[i] for i in np.flatnonzero(valid).tolist())
+    return kept, np.ascontiguousarray(matrix[valid]), MappingProxyType(rejected)
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+동시 접속 부하 시험 (app.py 한 프로세스가 몇 명까지 버티는지 측정)
+
+합성 분반을 스냅샷에 올린 뒤 Streamlit AppTest로 학생 세션 여러 개를 만들어 main()을
+실제로 실행합니다. 세션마다 다음 순서로 화면을 조작합니다.
+
+    open      첫 접속 (main() 전체 실행)
+    select    분반 선택
+    search    학번 목록을 열고 학번 앞부분으로 검색
+    lookup    학번 입력 후 "성적 조회"
+    download  "전체 성적 CSV 다운로드" 클릭 (클릭이 일으키는 재실행)
+
+한계 (LIMITATIONS, 결과 JSON의 "limitations"에도 기록):
+AppTest는 실행 중 Streamlit 런타임을 프로세스 전역으로 바꿔 끼우므로 한 번에 한 세션만
+실행합니다 (_app_lock). 세션 스레드들은 차례를 기다리며 대기 시간도 지연 시간에 포함되지만,
+스크립트 실행이 실제로 겹치지 않으므로 조회 서비스, 세션별 토큰 버킷, 전역 렌더링 자리
+(request_governor)의 경합은 측정되지 않습니다. 다운로드 단계는 클릭이 일으키는 재실행만
+측정하며, 서버가 CSV 파일을 전송하는 시간은 포함하지 않습니다. 실제 동시성은
+`streamlit run`으로 띄운 서버에 HTTP·웹소켓 부하 도구를 붙여 측정해야 합니다.
+
+분반 크기 × 세션 수 조합마다 처리량(단계/초, 세션/초), 단계별 지연 시간(p50/p95/p99),
+프로세스 메모리(RSS) 증가량을 JSON으로 출력합니다.
+
+사용법:
+    python loadtest.py                                     # 1천·1만 명 × 세션 10·50개
+    python loadtest.py --sizes 1000 100000 --sessions 20 100 --concurrency 16 -o load.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import grades
+from bench import generate_section
+
+# 기본 분반 크기 (학생 수)
+DEFAULT_SIZES = (1_000, 10_000)
+
+# 기본 세션 수
+DEFAULT_SESSIONS = (10, 50)
+
+# 동시에 진행하는 세션 수 (세션 스레드 수)
+DEFAULT_CONCURRENCY = 8
+
+# 합성 분반 수
+DEFAULT_SECTIONS = 4
+
+# 세션 한 단계의 최대 실행 시간 (초)
+STEP_TIMEOUT = 600
+
+STEPS = ("open", "select", "search", "lookup", "download")
+
+# 합성 분반 이름 접두어
+CLASS_PREFIX = "load_"
+
+# AppTest 실행은 한 번에 하나씩 (런타임 전역 상태를 공유함)
+_app_lock = threading.Lock()
+
+# 결과 JSON에 함께 기록하는 측정 한계
+LIMITATIONS = (
+    "AppTest 실행은 _app_lock으로 한 번에 하나씩만 진행되므로 동시 세션은 차례를 기다릴 뿐 "
+    "스크립트 실행이 겹치지 않음 (동시에 실행되는 앱은 항상 1개)",
+    "따라서 조회 서비스, 세션별 토큰 버킷, 전역 렌더링 자리(request_governor)의 경합은 측정되지 않음",
+    "download 단계는 클릭이 일으키는 재실행만 측정하며 CSV 파일 전송 시간은 포함하지 않음",
+)
+
+def _rss_bytes():
+    """현재 프로세스의 RSS (바이트, /proc이 없으면 최대 RSS)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return _peak_rss_bytes()
+
+def _peak_rss_bytes():
+    """현재 프로세스의 최대 RSS (바이트)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _percentiles(samples_s):
+    """초 단위 표본의 p50/p95/p99와 최대값을 밀리초로 반환"""
+    if not samples_s:
+        return None
+    samples = np.asarray(samples_s, dtype=np.float64) * 1000
+    result = {f"p{q}_ms": round(float(np.percentile(samples, q)), 3) for q in (50, 95, 99)}
+    result["max_ms"] = round(float(samples.max()), 3)
+    return result
+
+def _find(widgets, label, exact=False):
+    """라벨이 label과 같거나 (exact) label을 포함하는 첫 위젯"""
+    for widget in widgets:
+        if widget.label == label if exact else label in widget.label:
+            return widget
+    raise LookupError(f"위젯을 찾을 수 없습니다: {label}")
+
+def _click_download(at):
+    """
+    다운로드 버튼 클릭
+
+    AppTest에는 다운로드 버튼 조작이 없습니다. app.py의 다운로드 버튼은 콜백이 없어 클릭하면
+    같은 위젯 상태로 다시 실행될 뿐이므로 (조회 버튼은 눌리지 않은 상태), 버튼이 다운로드
+    주소를 가지고 있는지 확인한 뒤 공개 API인 run()으로 그 재실행을 재현합니다.
+
+    Returns:
+        AppTest: 다시 실행된 AppTest
+    """
+    buttons = at.get("download_button")
+    if not buttons or not buttons[0].proto.url:
+        raise LookupError("다운로드 버튼이 없습니다")
+    return at.run()
+
+class _Session:
+    """
+    학생 한 명의 화면 조작 시나리오
+
+    Args:
+        app_path (str): app.py 경로
+        class_name (str): 조회할 분반
+        student_id (str): 조회할 학번
+    """
+
+    def __init__(self, app_path, class_name, student_id):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(app_path, default_timeout=STEP_TIMEOUT)
+        self.class_name = class_name
+        self.student_id = student_id
+
+    def _step(self, name):
+        at = self.at
+        if name == "open":
+            at.run()
+        elif name == "select":
+            at.selectbox[0].select(self.class_name).run()
+        elif name == "search":
+            _find(at.button, "등록된 학번 목록").click().run()
+            _find(at.text_input, "학번 검색").input(self.student_id[:2]).run()
+        elif name == "lookup":
+            _find(at.text_input, "학번", exact=True).input(self.student_id)
+            _find(at.button, "성적 조회").click().run()
+        elif name == "download":
+            _click_download(at)
+
+    def run(self, latencies):
+        """
+        모든 단계를 실행하고 단계별 지연 시간을 latencies에 추가
+
+        Returns:
+            dict: {"errors": [오류], "degraded": 간단한 결과만 받았는지 여부}
+        """
+        errors = []
+        degraded = False
+        for name in STEPS:
+            start = time.perf_counter()
+            try:
+                with _app_lock:
+                    self._step(name)
+                    errors.extend(str(exception.message) for exception in self.at.exception)
+                    if name == "lookup":
+                        degraded = any("⏳" in str(info.value) for info in self.at.info)
+            except Exception as exc:  # 시나리오 하나의 실패가 전체 측정을 멈추지 않도록
+                errors.append(f"{name}: {type(exc).__name__}: {exc}")
+                break
+            finally:
+                latencies[name].append(time.perf_counter() - start)
+        return {"errors": errors, "degraded": degraded}
+
+def load_cohort(size, sections=DEFAULT_SECTIONS, seed=0):
+    """
+    합성 분반을 스냅샷에 올림 (기존 분반은 유지, 이전 합성 분반은 교체)
+
+    Returns:
+        dict: {분반 이름: 학번 리스트}
+    """
+    cohort = {f"{CLASS_PREFIX}{i + 1}": generate_section(size, seed + i) for i in range(sections)}
+    grades.reload_grades({**cohort, **{
+        name: data for name, data in grades.all_grades.items()
+        if not name.startswith((CLASS_PREFIX, "bench_"))
+    }})
+    return {name: list(data.keys()) for name, data in cohort.items()}
+
+def run_load(student_ids, sessions, concurrency=DEFAULT_CONCURRENCY, seed=0):
+    """
+    세션 여러 개를 동시에 실행하여 처리량·지연 시간·메모리 측정
+
+    Args:
+        student_ids (dict): {분반 이름: 학번 리스트}
+        sessions (int): 세션 수
+        concurrency (int): 동시에 진행하는 세션 수
+        seed (int): 세션별 분반·학번 선택 난수 시드
+
+    Returns:
+        dict: 측정 결과
+            - sessions, concurrency (int)
+            - seconds (float): 전체 소요 시간
+            - steps_per_s, sessions_per_s (float): 처리량
+            - latency (dict): {단계: {p50_ms, p95_ms, p99_ms, max_ms}}
+            - rss_start_mb, rss_end_mb, rss_growth_mb, rss_peak_mb (float): 프로세스 메모리
+            - rss_per_session_kb (float): 세션 하나당 메모리 증가량
+            - degraded (int): 총점·등수만 받은 세션 수
+            - errors (list): 실패한 단계 (최대 10개)
+    """
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    rng = random.Random(seed)
+    class_names = sorted(student_ids)
+    plan = []
+    for _ in range(sessions):
+        class_name = rng.choice(class_names)
+        plan.append((class_name, rng.choice(student_ids[class_name])))
+
+    latencies = {name: [] for name in STEPS}
+    gc.collect()
+    rss_start = _rss_bytes()
+    start = time.perf_counter()
+    # 세션(AppTest와 세션 상태)은 측정이 끝날 때까지 유지하여 접속 중인 세션의 메모리를 포함
+    alive = [_Session(app_path, class_name, student_id) for class_name, student_id in plan]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="loadtest") as executor:
+        outcomes = list(executor.map(lambda session: session.run(latencies), alive))
+    seconds = time.perf_counter() - start
+    rss_end = _rss_bytes()
+    del alive
+
+    errors = [error for outcome in outcomes for error in outcome["errors"]]
+    steps = sum(len(samples) for samples in latencies.values())
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        "steps_per_s": round(steps / seconds, 2) if seconds else None,
+        "sessions_per_s": round(sessions / seconds, 2) if seconds else None,
+        "latency": {name: _percentiles(samples) for name, samples in latencies.items()},
+        "rss_start_mb": round(rss_start / 2**20, 1),
+        "rss_end_mb": round(rss_end / 2**20, 1),
+        "rss_growth_mb": round((rss_end - rss_start) / 2**20, 1),
+        "rss_peak_mb": round(_peak_rss_bytes() / 2**20, 1),
+        "rss_per_session_kb": round((rss_end - rss_start) / 1024 / sessions, 1) if sessions else None,
+        "degraded": sum(outcome["degraded"] for outcome in outcomes),
+        "errors": errors[:10],
+    }
+
+def main():
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="동시 접속 부하 시험 (Streamlit AppTest)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="합성 분반 학생 수 목록")
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(DEFAULT_SESSIONS),
+                        help="세션 수 목록")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="동시에 진행하는 세션 수")
+    parser.add_argument("--sections", type=int, default=DEFAULT_SECTIONS, help="합성 분반 수")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("-o", "--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    args = parser.parse_args()
+
+    print("주의: AppTest 실행은 한 번에 하나씩이므로 동시성은 흉내일 뿐입니다 (결과의 limitations 참고)",
+          file=sys.stderr)
+    results = []
+    for size in args.sizes:
+        print(f"분반 {args.sections}개 × {size:,}명 적재 중...", file=sys.stderr)
+        student_ids = load_cohort(size, args.sections, args.seed)
+        for sessions in args.sessions:
+            result = run_load(student_ids, sessions, args.concurrency, args.seed)
+            result["students"] = size
+            results.append(result)
+            print(f"  세션 {sessions}개: {result['sessions_per_s']}세션/s, "
+                  f"조회 p95 {(result['latency']['lookup'] or {}).get('p95_ms')}ms, "
+                  f"메모리 +{result['rss_growth_mb']}MB, 오류 {len(result['errors'])}건",
+                  file=sys.stderr)
+
+    output = json.dumps({"sections": args.sections, "limitations": list(LIMITATIONS), "results": results},
+                        ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
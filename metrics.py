@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+단계별 시간·횟수 측정 (성적 계산, 캐시, 화면 렌더링)
+
+환경 변수 GRADES_METRICS로 내보내기 방식을 지정하면 측정이 켜집니다. 지정하지 않으면
+timer()는 아무 일도 하지 않는 공용 객체를, count()는 바로 반환하므로 부담이 거의 없습니다.
+호출 한 번이 수 µs 이하인 조회 함수는 timed() 데코레이터를 쓰며, 모듈 import 시점에 측정이
+꺼져 있으면 원래 함수를 그대로 두므로 부담이 전혀 없습니다.
+
+    GRADES_METRICS="log"                               # 로그 한 줄씩
+    GRADES_METRICS="ring,prometheus:/tmp/grades.prom"  # 메모리 링 버퍼 + Prometheus 텍스트 파일
+
+사용 예:
+    with metrics.timer("grades.build_snapshot"):
+        ...
+    metrics.count("app.summary_frame.miss")
+"""
+
+import functools
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("grades.metrics")
+
+# 링 버퍼 기본 크기 (최근 측정 이벤트 수)
+RING_BUFFER_SIZE = 1_000
+
+# Prometheus 파일을 다시 쓰는 간격 (초)
+PROMETHEUS_INTERVAL = 10.0
+
+# 측정 여부 (configure()로 변경)
+_enabled = False
+
+# 측정값 {이름: [횟수, 합계, 최대]} (타이머는 초 단위, 카운터는 합계만 사용)
+_timers = {}
+_counters = {}
+_lock = threading.Lock()
+
+# 등록된 내보내기 객체
+_exporters = []
+
+class _NullTimer:
+    """측정이 꺼져 있을 때 사용하는 아무 일도 하지 않는 타이머"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    """with 블록의 소요 시간을 측정하여 기록"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.start)
+        return False
+
+def timer(name):
+    """
+    with 블록의 소요 시간을 측정하는 컨텍스트 매니저
+
+    Args:
+        name (str): 단계 이름 (예: "grades.build_snapshot")
+
+    Returns:
+        컨텍스트 매니저 (측정이 꺼져 있으면 공용 빈 객체)
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+def timed(name):
+    """
+    함수 호출 시간을 측정하는 데코레이터 (자주 호출되는 조회 함수용)
+
+    데코레이터가 적용되는 시점(모듈 import 시)에 측정이 꺼져 있으면 원래 함수를 그대로 반환합니다.
+
+    Args:
+        name (str): 단계 이름
+
+    Returns:
+        callable: 데코레이터
+    """
+    def decorate(func):
+        if not _enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def observe(name, seconds):
+    """
+    소요 시간 한 건을 기록
+
+    Args:
+        name (str): 단계 이름
+        seconds (float): 소요 시간 (초)
+    """
+    if not _enabled:
+        return
+    with _lock:
+        entry = _timers.get(name)
+        if entry is None:
+            entry = _timers[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+    _emit("timer", name, seconds)
+
+def count(name, value=1):
+    """
+    카운터 증가 (캐시 적중/실패, 재실행 횟수 등)
+
+    Args:
+        name (str): 카운터 이름
+        value (int): 증가량
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+    _emit("counter", name, value)
+
+def is_enabled():
+    """측정이 켜져 있는지 여부"""
+    return _enabled
+
+def snapshot():
+    """
+    현재까지의 측정값
+
+    Returns:
+        dict: {"timers": {이름: {count, total_s, avg_s, max_s}}, "counters": {이름: 값}}
+    """
+    with _lock:
+        timers = {
+            name: {
+                "count": entry[0],
+                "total_s": entry[1],
+                "avg_s": entry[1] / entry[0] if entry[0] else 0.0,
+                "max_s": entry[2],
+            }
+            for name, entry in _timers.items()
+        }
+        counters = dict(_counters)
+    return {"timers": timers, "counters": counters}
+
+def reset():
+    """측정값 초기화"""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+
+def _emit(kind, name, value):
+    """측정 이벤트를 내보내기 객체들에 전달"""
+    for exporter in _exporters:
+        exporter.record(kind, name, value)
+
+def flush():
+    """모든 내보내기 객체에 현재 측정값을 즉시 기록하도록 요청"""
+    for exporter in _exporters:
+        exporter.flush()
+
+class LogExporter:
+    """측정 이벤트를 로그 한 줄씩 기록"""
+
+    def __init__(self, log=logger, level=logging.INFO):
+        self.log = log
+        self.level = level
+
+    def record(self, kind, name, value):
+        if kind == "timer":
+            self.log.log(self.level, "metric timer %s %.6fs", name, value)
+        else:
+            self.log.log(self.level, "metric counter %s +%s", name, value)
+
+    def flush(self):
+        pass
+
+class RingBufferExporter:
+    """최근 측정 이벤트를 메모리에 고정 개수만큼 보관 (디버그 화면용)"""
+
+    def __init__(self, size=RING_BUFFER_SIZE):
+        self.events = deque(maxlen=size)
+
+    def record(self, kind, name, value):
+        self.events.append((time.time(), kind, name, value))
+
+    def flush(self):
+        pass
+
+    def recent(self, limit=None):
+        """
+        최근 이벤트 목록 (최신순)
+
+        Args:
+            limit (int, optional): 최대 개수
+
+        Returns:
+            list: [(시각, 종류, 이름, 값)]
+        """
+        events = list(self.events)[::-1]
+        return events if limit is None else events[:limit]
+
+class PrometheusFileExporter:
+    """
+    측정값을 Prometheus 텍스트 형식 파일로 기록 (node_exporter textfile collector 등에서 수집)
+
+    파일은 첫 측정 이벤트 이후 백그라운드 스레드가 interval초마다, 그리고 flush() 호출 시
+    임시 파일에 쓴 뒤 교체합니다. 조회 경로(record)에서는 디스크에 쓰지 않으며, 쓰기 오류는
+    로그로만 남깁니다.
+    """
+
+    def __init__(self, path, interval=PROMETHEUS_INTERVAL, prefix="grades"):
+        self.path = path
+        self.interval = interval
+        self.prefix = prefix
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._closed = threading.Event()
+
+    def record(self, kind, name, value):
+        if self._writer is None:
+            self._start_writer()
+
+    def _start_writer(self):
+        """파일을 주기적으로 쓰는 백그라운드 스레드 시작 (한 번만)"""
+        with self._writer_lock:
+            if self._writer is None and not self._closed.is_set():
+                self._writer = threading.Thread(target=self._run, name="metrics-prometheus", daemon=True)
+                self._writer.start()
+
+    def _run(self):
+        while not self._closed.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        """백그라운드 기록 중지 (마지막 값을 한 번 기록)"""
+        self._closed.set()
+        if self._writer is not None:
+            self._writer.join()
+            self.flush()
+
+    def _metric_name(self, name):
+        return re.sub(r"[^a-zA-Z0-9_]", "_", f"{self.prefix}_{name}")
+
+    def render(self):
+        """
+        현재 측정값을 Prometheus 텍스트 형식으로 변환
+
+        Returns:
+            str: Prometheus 텍스트 형식
+        """
+        values = snapshot()
+        lines = []
+        for name, value in sorted(values["counters"].items()):
+            metric = self._metric_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, entry in sorted(values["timers"].items()):
+            metric = self._metric_name(name) + "_seconds"
+            lines += [
+                f"# TYPE {metric} summary",
+                f"{metric}_count {entry['count']}",
+                f"{metric}_sum {entry['total_s']:.9f}",
+                f"# TYPE {metric}_max gauge",
+                f"{metric}_max {entry['max_s']:.9f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".prom")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            logger.exception("Prometheus 측정 파일 기록 실패: %s", self.path)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+def get_exporter(kind):
+    """
+    등록된 내보내기 객체 중 해당 종류의 첫 번째 객체
+
+    Args:
+        kind (type): 내보내기 클래스 (예: RingBufferExporter)
+
+    Returns:
+        object | None: 내보내기 객체
+    """
+    for exporter in _exporters:
+        if isinstance(exporter, kind):
+            return exporter
+    return None
+
+def configure(spec):
+    """
+    내보내기 방식을 설정하고 측정을 켜거나 끔
+
+    Args:
+        spec (str): 쉼표로 구분한 내보내기 목록 ("log", "ring", "ring:크기", "prometheus:경로")
+                    빈 문자열이면 측정을 끔
+
+    Raises:
+        ValueError: 알 수 없는 내보내기 방식
+    """
+    global _enabled
+    exporters = []
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        kind, _, argument = item.partition(":")
+        if kind == "log":
+            exporters.append(LogExporter())
+        elif kind == "ring":
+            exporters.append(RingBufferExporter(int(argument) if argument else RING_BUFFER_SIZE))
+        elif kind == "prometheus":
+            exporters.append(PrometheusFileExporter(
+                argument or os.path.join(tempfile.gettempdir(), "grades_metrics.prom")))
+        else:
+            raise ValueError(f"알 수 없는 측정 내보내기 방식: {kind} (가능: log, ring, prometheus)")
+    # 교체되는 내보내기의 백그라운드 기록 중지
+    for exporter in _exporters:
+        if hasattr(exporter, "close"):
+            exporter.close()
+    _exporters[:] = exporters
+    _enabled = bool(exporters)
+
+configure(os.environ.get("GRADES_METRICS", ""))
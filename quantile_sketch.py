@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+KLL 분위수 스케치 (근사 등수·백분위용)
+
+전체 점수 목록 없이 고정된 메모리로 "이 점수 이하가 몇 명인가"를 근사합니다.
+스케치끼리 병합할 수 있으므로 분반별 스케치를 합쳐 여러 분반 통합 순위를 구할 수 있습니다.
+
+오차: 순위 오차는 대략 전체 인원 × error 이내입니다 (k ≈ 3.3 / error).
+"""
+
+import math
+import random
+
+import numpy as np
+
+# 기본 허용 순위 오차 (전체 인원 대비 비율)
+DEFAULT_ERROR = 0.01
+
+# 층별 용량 감소 비율
+_CAPACITY_RATIO = 2 / 3
+
+def k_for_error(error):
+    """
+    허용 오차에 맞는 스케치 크기 k 계산
+
+    Args:
+        error (float): 허용 순위 오차 비율 (예: 0.01)
+
+    Returns:
+        int: 스케치 크기 k
+    """
+    return max(8, math.ceil(3.3 / error))
+
+class KLLSketch:
+    """
+    병합 가능한 KLL 분위수 스케치
+
+    층(level) i의 값 하나는 원래 값 2^i개를 대표합니다.
+    """
+
+    __slots__ = ("k", "count", "_levels", "_random", "_view")
+
+    def __init__(self, error=DEFAULT_ERROR, seed=0):
+        self.k = k_for_error(error)
+        self.count = 0
+        self._levels = [np.zeros(0, dtype=np.float64)]
+        self._random = random.Random(seed)
+        self._view = None
+
+    def _capacity(self, level):
+        """층별 최대 보관 개수"""
+        depth = len(self._levels) - level - 1
+        return max(int(math.ceil(self.k * _CAPACITY_RATIO ** depth)), 2)
+
+    def _compress(self):
+        """용량을 넘은 층을 절반으로 줄여 위 층으로 올림"""
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.zeros(0, dtype=np.float64))
+                items = np.sort(items)
+                # 홀수 개면 하나는 현재 층에 남김
+                keep = items[:len(items) % 2]
+                items = items[len(keep):]
+                promoted = items[self._random.randint(0, 1)::2]
+                self._levels[level] = keep
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                # 층이 늘어나면 아래 층 용량이 줄어드므로 처음부터 다시 확인
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values):
+        """
+        값들을 스케치에 추가
+
+        Args:
+            values (numpy.ndarray): 추가할 값 배열
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self._view = None
+        # 큰 배열은 층 0 용량 단위로 나누어 넣어 메모리를 일정하게 유지
+        step = max(self._capacity(0), 1)
+        for start in range(0, len(values), step):
+            self._levels[0] = np.concatenate([self._levels[0], values[start:start + step]])
+            self._compress()
+
+    def merge(self, other):
+        """
+        다른 스케치를 병합한 새 스케치 반환
+
+        Args:
+            other (KLLSketch): 병합할 스케치
+
+        Returns:
+            KLLSketch: 두 스케치를 합친 스케치
+        """
+        merged = KLLSketch.__new__(KLLSketch)
+        merged.k = min(self.k, other.k)
+        merged.count = self.count + other.count
+        merged._random = random.Random(self.count ^ other.count)
+        merged._view = None
+        depth = max(len(self._levels), len(other._levels))
+        merged._levels = [
+            np.concatenate([
+                self._levels[i] if i < len(self._levels) else np.zeros(0),
+                other._levels[i] if i < len(other._levels) else np.zeros(0),
+            ])
+            for i in range(depth)
+        ]
+        merged._compress()
+        return merged
+
+    def _sorted_view(self):
+        """
+        보관 값 전체를 정렬한 배열과 누적 가중치 (다음 추가 전까지 재사용)
+
+        Returns:
+            tuple: (오름차순 값 배열, 누적 가중치 배열)
+        """
+        if self._view is None:
+            values = np.concatenate(self._levels)
+            weights = np.concatenate([
+                np.full(len(items), 1 << level, dtype=np.int64)
+                for level, items in enumerate(self._levels)
+            ])
+            order = np.argsort(values, kind="stable")
+            self._view = (values[order], np.cumsum(weights[order]))
+        return self._view
+
+    def rank(self, value, inclusive=True):
+        """
+        값 이하(inclusive=False면 미만)인 원래 값 개수의 근사치
+
+        Args:
+            value (float): 기준 값
+            inclusive (bool): 같은 값을 포함할지 여부
+
+        Returns:
+            int: 근사 개수
+        """
+        values, cumulative = self._sorted_view()
+        position = int(np.searchsorted(values, value, side="right" if inclusive else "left"))
+        return int(cumulative[position - 1]) if position else 0
+
+    def quantile(self, q):
+        """
+        분위수 근사값
+
+        Args:
+            q (float): 0~1 사이 분위
+
+        Returns:
+            float | None: 근사 분위수 (빈 스케치면 None)
+        """
+        if self.count == 0:
+            return None
+        values, cumulative = self._sorted_view()
+        position = int(np.searchsorted(cumulative, q * cumulative[-1], side="left"))
+        return float(values[min(position, len(values) - 1)])
+
+    @property
+    def retained(self):
+        """스케치가 보관 중인 값 개수 (메모리 사용량 지표)"""
+        return sum(len(items) for items in self._levels)
+
+def build_sketch(values, error=DEFAULT_ERROR, seed=0):
+    """
+    값 배열로 스케치 생성
+
+    Args:
+        values (numpy.ndarray): 값 배열
+        error (float): 허용 순위 오차 비율
+        seed (int): 압축 시 난수 시드
+
+    Returns:
+        KLLSketch: 생성된 스케치
+    """
+    sketch = KLLSketch(error, seed)
+    sketch.update(values)
+    return sketch
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+성적 조회 서비스 (스레드 풀 + asyncio 인터페이스)
+
+Streamlit 앱과 HTTP 엔드포인트가 같은 조회 엔진을 공유하도록 grades의 계산을
+작업 스레드에서 실행합니다. 같은 요청이 동시에 여러 번 들어오면 한 번만 계산하고
+결과를 함께 나눠 받습니다 (single-flight).
+
+사용 예:
+    result = await lookup("1분반", "0066")       # asyncio
+    result = submit_lookup("1분반", "0066").result()  # 일반 스레드 (Streamlit)
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import grades
+from grading_policy import build_detail_rows
+
+# 작업 스레드 수 (numpy 계산은 GIL을 놓으므로 스레드로 충분)
+QUERY_WORKERS = int(os.environ.get("GRADES_QUERY_WORKERS", min(8, (os.cpu_count() or 1) + 2)))
+
+_executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="grade-query")
+
+# 진행 중인 요청 {요청 키: Future}
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(key, func, *args):
+    """
+    같은 키의 요청이 진행 중이면 그 Future를, 아니면 새로 실행한 Future를 반환
+
+    Args:
+        key (tuple): 요청 키
+        func (callable): 실행할 함수
+        *args: 함수 인자
+
+    Returns:
+        concurrent.futures.Future: 결과 Future
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+        future = _executor.submit(func, *args)
+        _inflight[key] = future
+    future.add_done_callback(lambda done: _forget(key, done))
+    return future
+
+def _forget(key, future):
+    """완료된 요청을 진행 중 목록에서 제거"""
+    with _inflight_lock:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+def _lookup(class_name, student_id, snapshot):
+    """한 학생의 총점, 등수, 상세 성적을 계산 (작업 스레드에서 실행)"""
+    snapshot = snapshot or grades.get_snapshot()
+    section = snapshot["sections"].get(class_name)
+    if section is None or student_id not in section["rows"]:
+        return None
+    record = grades.get_student_record(student_id, class_name, snapshot)
+    total = section["scores"][student_id]
+    return {
+        "class_name": class_name,
+        "student_id": student_id,
+        "version": snapshot["version"],
+        "total": total,
+        "rank": section["rank_index"]["ranks"][student_id],
+        "total_students": section["stats"]["count"],
+        "scores": record.scores.tolist(),
+        "detail": build_detail_rows(section["policy"], record.scores, total),
+    }
+
+def lookup_totals(queries, snapshot=None):
+    """
+    여러 학생의 총점과 등수를 한 스냅샷에서 조회 (상세 성적 제외, 호출한 스레드에서 실행)
+
+    Args:
+        queries (list): [(분반, 학번)] 리스트
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+
+    Returns:
+        list: 요청 순서대로 {class_name, student_id, found, total, rank, total_students}
+    """
+    snapshot = snapshot or grades.get_snapshot()
+    sections = snapshot["sections"]
+    results = []
+    for class_name, student_id in queries:
+        section = sections.get(class_name)
+        total = section["scores"].get(student_id) if section is not None else None
+        if total is None:
+            results.append({"class_name": class_name, "student_id": student_id, "found": False})
+            continue
+        results.append({
+            "class_name": class_name,
+            "student_id": student_id,
+            "found": True,
+            "total": total,
+            "rank": section["rank_index"]["ranks"][student_id],
+            "total_students": section["stats"]["count"],
+        })
+    return results
+
+def submit_snapshot():
+    """
+    현재 스냅샷을 작업 스레드에서 준비 (재계산이 필요하면 한 번만 계산)
+
+    Returns:
+        concurrent.futures.Future: grades.get_snapshot() 결과 Future
+    """
+    return _single_flight(("snapshot",), grades.get_snapshot)
+
+def submit_lookup(class_name, student_id, snapshot=None):
+    """
+    학생 조회를 작업 스레드에 제출
+
+    Args:
+        class_name (str): 분반 이름
+        student_id (str): 학번
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 작업 시점의 현재 스냅샷)
+
+    Returns:
+        concurrent.futures.Future: 조회 결과 Future (결과는 lookup 참고)
+    """
+    version = snapshot["version"] if snapshot is not None else None
+    return _single_flight(("lookup", version, class_name, student_id),
+                          _lookup, class_name, student_id, snapshot)
+
+async def load_snapshot():
+    """
+    현재 스냅샷을 반환 (이벤트 루프를 막지 않음)
+
+    Returns:
+        Mapping: grades.get_snapshot() 결과
+    """
+    return await asyncio.wrap_future(submit_snapshot())
+
+async def lookup(class_name, student_id, snapshot=None):
+    """
+    학생 한 명의 성적 조회
+
+    Args:
+        class_name (str): 분반 이름
+        student_id (str): 학번
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+
+    Returns:
+        dict | None: 조회 결과, 없는 분반·학번이면 None
+            - class_name, student_id, version (str)
+            - total (float): 총점
+            - rank (int): 분반 내 등수
+            - total_students (int): 분반 인원
+            - scores (list): 성적 행
+            - detail (list): [(항목, 점수, 가중치 설명)]
+    """
+    return await asyncio.wrap_future(submit_lookup(class_name, student_id, snapshot))
+
+async def lookup_many(queries, snapshot=None):
+    """
+    여러 학생을 동시에 조회 (모두 같은 스냅샷에서 읽음)
+
+    Args:
+        queries (list): [(분반, 학번)] 리스트
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+
+    Returns:
+        list: 요청 순서대로 lookup 결과
+    """
+    snapshot = snapshot or await load_snapshot()
+    return await asyncio.gather(*(
+        lookup(class_name, student_id, snapshot) for class_name, student_id in queries
+    ))
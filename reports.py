@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+학생별 상세 성적표 일괄 생성 (학기 말 배포용)
+
+화면의 "📋 상세 성적표"와 같은 내용(grading_policy.build_detail_rows)을 모든 분반의 모든 학생에
+대해 만듭니다. 분반을 학생 묶음으로 나누어 프로세스 풀에서 렌더링하고, 완성된 묶음을 순서대로
+분반별 파일에 이어 씁니다. 진행률과 처리량은 표준 오류로 출력합니다.
+
+출력:
+    CSV  - 분반별 파일 하나, 학생 × 항목 행 (분반, 학번, 총점, 등수, 인원, 항목, 점수, 가중치)
+    HTML - 분반별 파일 하나, 학생마다 한 쪽 (인쇄 시 쪽 나눔)
+
+사용법:
+    python reports.py -o reports --format html
+    python reports.py -o reports --format csv --classes 1분반 --workers 4
+"""
+
+import argparse
+import csv
+import html
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import grades
+from grading_policy import build_detail_rows, compile_policy
+
+# 작업 하나에 담는 학생 수
+REPORT_CHUNK_SIZE = 2_000
+
+# 진행률 출력 최소 간격 (초)
+PROGRESS_INTERVAL = 1.0
+
+CSV_HEADER = ("분반", "학번", "총점", "등수", "인원", "항목", "점수", "가중치")
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; color: #2C3E50; }}
+.report {{ page-break-after: always; margin: 2em auto; max-width: 40em; }}
+.summary {{ font-weight: bold; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ border: 1px solid #BDC3C7; padding: 4px 8px; text-align: left; }}
+th {{ background: #ECF0F1; }}
+tr.total td {{ font-weight: bold; }}
+</style>
+</head>
+<body>
+"""
+
+HTML_TAIL = "</body>\n</html>\n"
+
+def _render_csv(class_name, rows):
+    """학생 묶음을 CSV 텍스트로 렌더링"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for student_id, total, rank, count, detail in rows:
+        for item, value, weight in detail:
+            writer.writerow((class_name, student_id, total, rank, count, item, value, weight))
+    return buffer.getvalue()
+
+def _render_html(class_name, rows):
+    """학생 묶음을 HTML 조각으로 렌더링 (학생마다 한 쪽)"""
+    name = html.escape(class_name)
+    parts = []
+    for student_id, total, rank, count, detail in rows:
+        parts.append(
+            f'<section class="report">\n<h2>{name} | {html.escape(student_id)}</h2>\n'
+            f'<p class="summary">총점: {total}점 | 등수: {rank}/{count}등</p>\n'
+            "<table>\n<tr><th>항목</th><th>점수</th><th>가중치</th></tr>\n"
+        )
+        last = len(detail) - 1
+        for i, (item, value, weight) in enumerate(detail):
+            row_class = ' class="total"' if i == last else ""
+            parts.append(f"<tr{row_class}><td>{html.escape(str(item))}</td>"
+                         f"<td>{html.escape(str(value))}점</td><td>{html.escape(str(weight))}</td></tr>\n")
+        parts.append("</table>\n</section>\n")
+    return "".join(parts)
+
+_RENDERERS = {"csv": _render_csv, "html": _render_html}
+
+def render_chunk(fmt, class_name, policy_spec, student_ids, matrix, totals, ranks, count):
+    """
+    학생 묶음의 상세 성적표를 렌더링 (작업 프로세스에서 실행)
+
+    Args:
+        fmt (str): "csv" 또는 "html"
+        class_name (str): 분반 이름
+        policy_spec (dict): 분반 스냅샷을 계산한 정책 (컴파일 전, 작업 프로세스에서 컴파일)
+        student_ids (tuple): 학번
+        matrix (numpy.ndarray): 학생 수 × 열 수 점수 행렬
+        totals (numpy.ndarray): 총점
+        ranks (numpy.ndarray): 등수
+        count (int): 분반 인원
+
+    Returns:
+        str: 렌더링된 텍스트
+    """
+    # 작업 프로세스의 정책 설정이 아니라 스냅샷을 계산한 정책으로 렌더링
+    policy = compile_policy(policy_spec)
+    rows = [
+        (student_id, total, rank, count, build_detail_rows(policy, scores, total))
+        for student_id, scores, total, rank in zip(student_ids, matrix.tolist(), totals.tolist(),
+                                                   ranks.tolist())
+    ]
+    return _RENDERERS[fmt](class_name, rows)
+
+def _section_chunks(fmt, class_name, section, chunk_size):
+    """분반을 render_chunk 인자 묶음으로 나눔"""
+    student_ids = section["student_ids"]
+    totals = section["totals"]
+    ascending = section["rank_index"]["ascending"]
+    # 자신보다 높은 점수의 개수 + 1이 등수 (스냅샷의 등수 딕셔너리와 같음)
+    ranks = len(totals) - np.searchsorted(ascending, totals, side="right") + 1
+    count = section["stats"]["count"]
+    for start in range(0, len(student_ids), chunk_size):
+        stop = start + chunk_size
+        yield (fmt, class_name, section["policy"]["spec"], student_ids[start:stop],
+               section["matrix"][start:stop], totals[start:stop], ranks[start:stop], count)
+
+def _file_name(class_name, fmt):
+    """분반 이름으로 출력 파일 이름 생성 (경로 구분자는 밑줄로)"""
+    return class_name.replace("/", "_").replace(os.sep, "_") + "." + fmt
+
+class _Progress:
+    """진행률과 처리량을 표준 오류로 출력"""
+
+    def __init__(self, total, stream=sys.stderr):
+        self.total = total
+        self.done = 0
+        self.stream = stream
+        self.start = time.perf_counter()
+        self._printed = 0.0
+
+    def advance(self, students, label, force=False):
+        self.done += students
+        now = time.perf_counter()
+        if not force and now - self._printed < PROGRESS_INTERVAL:
+            return
+        self._printed = now
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        percent = self.done / self.total * 100 if self.total else 100.0
+        print(f"[{label}] {self.done:,}/{self.total:,}명 ({percent:.1f}%) {rate:,.0f}명/s",
+              file=self.stream, flush=True)
+
+def generate_reports(output_dir, fmt="csv", class_names=None, workers=None,
+                     chunk_size=REPORT_CHUNK_SIZE, snapshot=None, progress=True):
+    """
+    분반별 상세 성적표 파일 생성
+
+    Args:
+        output_dir (str): 출력 디렉터리
+        fmt (str): "csv" 또는 "html"
+        class_names (list, optional): 대상 분반 (기본값: 모든 분반)
+        workers (int, optional): 작업 프로세스 수 (기본값: CPU 수, 0이면 현재 프로세스에서 실행)
+        chunk_size (int): 작업 하나에 담는 학생 수
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+        progress (bool): 진행률 출력 여부
+
+    Returns:
+        dict: 처리 결과
+            - files (dict): {분반: 출력 파일 경로}
+            - students (int): 성적표를 만든 학생 수
+            - rejected (int): 검증에서 제외되어 성적표를 만들지 않은 행 수
+            - bytes (int): 기록한 바이트 수
+            - seconds (float): 소요 시간
+            - students_per_s (float): 처리량
+
+    Raises:
+        ValueError: 지원하지 않는 형식
+        KeyError: 없는 분반
+    """
+    if fmt not in _RENDERERS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(_RENDERERS)})")
+    snapshot = snapshot or grades.get_snapshot()
+    class_names = list(snapshot["sections"].keys()) if class_names is None else list(class_names)
+    for class_name in class_names:
+        if class_name not in snapshot["sections"]:
+            raise KeyError(class_name)
+    os.makedirs(output_dir, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    # 진행률의 전체 인원은 분반 메타데이터의 등록 행 수로 시작하고 (샤드 저장소의 분반을 미리
+    # 읽지 않음), 분반을 읽을 때마다 검증을 통과한 인원으로 고침
+    counts = {entry["name"]: entry["count"] for entry in grades.get_class_catalog()}
+    tracker = _Progress(sum(counts.get(name, 0) for name in class_names)) if progress else None
+    start = time.perf_counter()
+    files = {}
+    students = 0
+    written = 0
+    rejected = 0
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    try:
+        for class_name in class_names:
+            section = snapshot["sections"][class_name]
+            if tracker:
+                tracker.total += len(section["student_ids"]) - counts.get(class_name, 0)
+            path = os.path.join(output_dir, _file_name(class_name, fmt))
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8-sig" if fmt == "csv" else "utf-8", newline="") as f:
+                if fmt == "csv":
+                    f.write(",".join(CSV_HEADER) + "\n")
+                else:
+                    f.write(HTML_HEAD.format(title=html.escape(f"{class_name} 상세 성적표")))
+                chunks = _section_chunks(fmt, class_name, section, chunk_size)
+                if executor is None:
+                    results = ((render_chunk(*args), len(args[3])) for args in chunks)
+                else:
+                    results = _ordered_results(executor, chunks, workers * 2)
+                for text, chunk_students in results:
+                    f.write(text)
+                    students += chunk_students
+                    if tracker:
+                        tracker.advance(chunk_students, class_name)
+                if fmt == "html":
+                    f.write(HTML_TAIL)
+            os.replace(tmp_path, path)
+            written += os.path.getsize(path)
+            files[class_name] = path
+            rejected += len(section["rejected"])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    seconds = time.perf_counter() - start
+    if tracker:
+        tracker.advance(0, "완료", force=True)
+    return {
+        "files": files,
+        "students": students,
+        "rejected": rejected,
+        "bytes": written,
+        "seconds": round(seconds, 3),
+        "students_per_s": round(students / seconds, 1) if seconds else None,
+    }
+
+def _ordered_results(executor, chunks, window):
+    """
+    작업을 최대 window개까지만 미리 제출하고 결과를 제출 순서대로 반환
+
+    Yields:
+        tuple: (렌더링된 텍스트, 학생 수)
+    """
+    pending = deque()
+    for args in chunks:
+        pending.append((executor.submit(render_chunk, *args), len(args[3])))
+        if len(pending) >= window:
+            future, students = pending.popleft()
+            yield future.result(), students
+    while pending:
+        future, students = pending.popleft()
+        yield future.result(), students
+
+def main():
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="학생별 상세 성적표 일괄 생성")
+    parser.add_argument("-o", "--output", default="reports", help="출력 디렉터리")
+    parser.add_argument("--format", choices=sorted(_RENDERERS), default="csv", help="출력 형식")
+    parser.add_argument("--classes", nargs="+", help="대상 분반 (기본값: 모든 분반)")
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (0이면 프로세스 풀 없이 실행)")
+    parser.add_argument("--chunk-size", type=int, default=REPORT_CHUNK_SIZE, help="작업 하나의 학생 수")
+    args = parser.parse_args()
+
+    result = generate_reports(args.output, args.format, args.classes, args.workers, args.chunk_size)
+    rate = result["students_per_s"]
+    print(f"성적표 {result['students']:,}명 ({len(result['files'])}개 분반) 생성: "
+          f"{result['seconds']}초, {f'{rate:,}' if rate is not None else '-'}명/s, "
+          f"{result['bytes']:,}바이트")
+    if result["rejected"]:
+        print(f"검증에서 제외된 행 {result['rejected']}건은 성적표를 만들지 않았습니다 "
+              f"(grades.get_rejected_rows() 참고)")
+    for class_name, path in result["files"].items():
+        print(f"  {class_name}: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+성적 조회 요청 제어 (성적 공개 직후 접속 폭주 대비)
+
+    - 세션별 토큰 버킷: 한 세션이 짧은 시간에 보낼 수 있는 조회 수 제한
+    - 같은 조회 묶기(debounce): 같은 (데이터 버전, 분반, 학번)을 연달아 누르면 이전 결과를 재사용
+    - 전역 동시 렌더링 제한: 상세 성적표·요약 표처럼 무거운 화면은 동시에 몇 개만 그림
+
+제한에 걸리면 조회를 거절하지 않고, 스냅샷에 미리 계산된 총점·등수만 보여주는 간단한 결과로
+대신합니다 (minimal_result).
+
+환경 변수:
+    GRADES_LOOKUP_RATE        세션별 초당 조회 수 (기본 0.5)
+    GRADES_LOOKUP_BURST       세션별 연속 허용 조회 수 (기본 5)
+    GRADES_LOOKUP_DEBOUNCE    같은 조회를 묶는 시간 (초, 기본 2)
+    GRADES_MAX_RENDERS        프로세스 전체 동시 렌더링 수 (기본 CPU 수 × 2)
+    GRADES_RENDER_WAIT        렌더링 자리를 기다리는 최대 시간 (초, 기본 0.5)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from query_service import lookup_totals
+
+LOOKUP_RATE = float(os.environ.get("GRADES_LOOKUP_RATE", 0.5))
+LOOKUP_BURST = float(os.environ.get("GRADES_LOOKUP_BURST", 5))
+DEBOUNCE_SECONDS = float(os.environ.get("GRADES_LOOKUP_DEBOUNCE", 2.0))
+MAX_CONCURRENT_RENDERS = int(os.environ.get("GRADES_MAX_RENDERS", (os.cpu_count() or 1) * 2))
+RENDER_WAIT_SECONDS = float(os.environ.get("GRADES_RENDER_WAIT", 0.5))
+
+# SessionGovernor.check 결과
+ADMITTED = "admitted"
+DEBOUNCED = "debounced"
+LIMITED = "limited"
+
+# 프로세스 전체에서 공유하는 렌더링 자리
+_render_slots = threading.BoundedSemaphore(MAX_CONCURRENT_RENDERS)
+
+class TokenBucket:
+    """
+    토큰 버킷 (초당 rate개씩 채워지고 최대 capacity개까지 모임)
+
+    Args:
+        rate (float): 초당 채워지는 토큰 수
+        capacity (float): 최대 토큰 수 (연속으로 허용하는 요청 수)
+        clock (callable): 현재 시각 함수 (기본값: time.monotonic, 테스트에서 바꿔 넣음)
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "_clock", "_lock")
+
+    def __init__(self, rate=LOOKUP_RATE, capacity=LOOKUP_BURST, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, cost=1.0, now=None):
+        """
+        토큰을 사용
+
+        Args:
+            cost (float): 사용할 토큰 수
+            now (float, optional): 현재 시각 (기본값: clock())
+
+        Returns:
+            bool: 토큰이 충분하여 사용했으면 True
+        """
+        with self._lock:
+            self._refill(self._clock() if now is None else now)
+            if self.tokens < cost:
+                return False
+            self.tokens -= cost
+            return True
+
+    def retry_after(self, cost=1.0, now=None):
+        """
+        토큰이 cost개 모일 때까지 남은 시간 (초)
+        """
+        with self._lock:
+            self._refill(self._clock() if now is None else now)
+            if self.tokens >= cost:
+                return 0.0
+            return (cost - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+class SessionGovernor:
+    """
+    한 세션의 조회 요청 제어 (st.session_state에 하나씩 보관)
+
+    Args:
+        rate (float): 초당 조회 수
+        burst (float): 연속 허용 조회 수
+        debounce (float): 같은 조회를 묶는 시간 (초)
+        clock (callable): 현재 시각 함수 (기본값: time.monotonic, 테스트에서 바꿔 넣음)
+    """
+
+    def __init__(self, rate=LOOKUP_RATE, burst=LOOKUP_BURST, debounce=DEBOUNCE_SECONDS,
+                 clock=time.monotonic):
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.clock = clock
+        self.debounce = debounce
+        self.last_key = None
+        self.last_time = float("-inf")
+        self.last_result = None
+
+    def check(self, key, now=None):
+        """
+        조회 요청을 허용할지 결정
+
+        Args:
+            key (tuple): 조회 키 (데이터 버전, 분반, 학번)
+            now (float, optional): 현재 시각 (기본값: clock())
+
+        Returns:
+            tuple: (결정, 다시 시도할 수 있을 때까지 남은 시간(초))
+                - ADMITTED: 새로 조회 (토큰 사용)
+                - DEBOUNCED: 직전과 같은 조회, last_result 재사용 (토큰 사용 안 함)
+                - LIMITED: 토큰 부족, 간단한 결과만 표시
+        """
+        now = self.clock() if now is None else now
+        if key == self.last_key and now - self.last_time < self.debounce:
+            return DEBOUNCED, 0.0
+        if self.bucket.take(now=now):
+            return ADMITTED, 0.0
+        return LIMITED, self.bucket.retry_after(now=now)
+
+    def remember(self, key, result, now=None):
+        """새로 조회한 결과를 묶기 대상으로 기록"""
+        self.last_key = key
+        self.last_time = self.clock() if now is None else now
+        self.last_result = result
+
+@contextmanager
+def render_slot(timeout=RENDER_WAIT_SECONDS):
+    """
+    무거운 화면을 그릴 자리를 얻음 (프로세스 전체 동시 렌더링 수 제한)
+
+    Args:
+        timeout (float): 자리를 기다리는 최대 시간 (초)
+
+    Yields:
+        bool: 자리를 얻었으면 True (False이면 간단한 결과를 표시)
+    """
+    acquired = _render_slots.acquire(timeout=timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            _render_slots.release()
+
+def minimal_result(snapshot, class_name, student_id):
+    """
+    스냅샷에 미리 계산된 총점·등수만 읽은 간단한 결과 (상세 성적 없음)
+
+    Args:
+        snapshot (Mapping): 성적 스냅샷
+        class_name (str): 분반 이름
+        student_id (str): 학번
+
+    Returns:
+        dict | None: {class_name, student_id, total, rank, total_students}, 없는 학번이면 None
+    """
+    result = lookup_totals([(class_name, student_id)], snapshot)[0]
+    return result if result["found"] else None
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+분반별 총점 통계 (개수, 평균, 표준편차, 최소/최대, 분위수, 히스토그램)
+
+평균과 분산은 Welford 누적값을 묶음 단위로 갱신하고 Chan 방식으로 병합하므로,
+분반 수와 관계없이 총점 배열을 한 번만 훑고 여러 분반의 통계를 합칠 수 있습니다.
+분위수와 히스토그램은 등수 인덱스의 오름차순 배열에서 이진 탐색으로 구합니다.
+"""
+
+from types import MappingProxyType
+
+import numpy as np
+
+# 기본 분위수
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# 히스토그램 구간 (총점 0~100점, 10점 간격)
+HISTOGRAM_EDGES = tuple(range(0, 101, 10))
+
+# 누적 시 한 번에 처리하는 묶음 크기
+CHUNK_SIZE = 65_536
+
+def empty_accumulator():
+    """
+    빈 Welford 누적값
+
+    Returns:
+        tuple: (개수, 평균, 편차 제곱합, 최소, 최대)
+    """
+    return (0, 0.0, 0.0, float("inf"), float("-inf"))
+
+def merge_accumulators(a, b):
+    """
+    두 Welford 누적값을 병합 (Chan 방식)
+
+    Args:
+        a (tuple): 누적값
+        b (tuple): 누적값
+
+    Returns:
+        tuple: 병합된 누적값
+    """
+    count_a, mean_a, m2_a, min_a, max_a = a
+    count_b, mean_b, m2_b, min_b, max_b = b
+    count = count_a + count_b
+    if count == 0:
+        return empty_accumulator()
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta * delta * count_a * count_b / count
+    return (count, mean, m2, min(min_a, min_b), max(max_a, max_b))
+
+def accumulate(values, accumulator=None, chunk_size=CHUNK_SIZE):
+    """
+    값 배열을 묶음 단위로 누적값에 더함
+
+    Args:
+        values (numpy.ndarray): 값 배열
+        accumulator (tuple, optional): 기존 누적값
+        chunk_size (int): 묶음 크기
+
+    Returns:
+        tuple: 갱신된 누적값
+    """
+    accumulator = accumulator or empty_accumulator()
+    values = np.asarray(values, dtype=np.float64)
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        mean = float(chunk.mean())
+        m2 = float(np.square(chunk - mean).sum())
+        accumulator = merge_accumulators(
+            accumulator, (len(chunk), mean, m2, float(chunk.min()), float(chunk.max())))
+    return accumulator
+
+def quantiles_from_sorted(ascending, quantiles=QUANTILES):
+    """
+    정렬된 배열에서 분위수를 선형 보간으로 계산 (numpy.percentile과 같은 방식)
+
+    Args:
+        ascending (numpy.ndarray): 오름차순 배열
+        quantiles (tuple): 0~1 사이 분위 목록
+
+    Returns:
+        dict: {분위: 값}
+    """
+    n = len(ascending)
+    if n == 0:
+        return {}
+    result = {}
+    for q in quantiles:
+        position = q * (n - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        fraction = position - lower
+        result[q] = float(ascending[lower] + (ascending[upper] - ascending[lower]) * fraction)
+    return result
+
+def histogram_from_sorted(ascending, edges=HISTOGRAM_EDGES):
+    """
+    정렬된 배열에서 구간별 개수를 이진 탐색으로 계산
+
+    Args:
+        ascending (numpy.ndarray): 오름차순 배열
+        edges (tuple): 구간 경계 (마지막 구간은 끝값 포함)
+
+    Returns:
+        list: 구간별 개수 (len(edges) - 1개)
+    """
+    edges = np.asarray(edges, dtype=np.float64)
+    positions = np.searchsorted(ascending, edges, side="left")
+    positions[-1] = np.searchsorted(ascending, edges[-1], side="right")
+    return np.diff(positions).tolist()
+
+def finalize(accumulator, ascending=None):
+    """
+    누적값(과 정렬 배열)으로 통계 딕셔너리 생성
+
+    Args:
+        accumulator (tuple): Welford 누적값
+        ascending (numpy.ndarray, optional): 오름차순 값 배열 (분위수·히스토그램용)
+
+    Returns:
+        Mapping: count, avg, std, min, max, quantiles, histogram
+    """
+    count, mean, m2, minimum, maximum = accumulator
+    stats = {"count": count}
+    if count:
+        stats.update(
+            avg=mean,
+            std=float(np.sqrt(m2 / count)),
+            min=minimum,
+            max=maximum,
+        )
+    if ascending is not None:
+        stats["quantiles"] = MappingProxyType(quantiles_from_sorted(ascending))
+        stats["histogram"] = MappingProxyType({
+            "edges": HISTOGRAM_EDGES,
+            "counts": tuple(histogram_from_sorted(ascending)),
+        })
+    return MappingProxyType(stats)
+
+def summarize_section(totals, ascending):
+    """
+    한 분반의 총점 통계
+
+    Args:
+        totals (numpy.ndarray): 총점 배열
+        ascending (numpy.ndarray): 오름차순 총점 배열
+
+    Returns:
+        Mapping: finalize 결과 (원래 데이터를 누적한 Welford 값은 "accumulator"에 보관)
+    """
+    accumulator = accumulate(totals)
+    stats = dict(finalize(accumulator, ascending))
+    stats["accumulator"] = accumulator
+    return MappingProxyType(stats)
+
+def combine_sections(sections):
+    """
+    여러 분반의 통계를 하나로 병합
+
+    평균·표준편차·히스토그램은 분반별 누적값으로 계산하고, 분위수만 분반별 오름차순 배열을
+    병합하여 구합니다 (O(N log 분반 수)). 스냅샷 버전별로 한 번만 호출되도록
+    grades.get_section_stats에서 캐시합니다.
+
+    Args:
+        sections (list): 분반 스냅샷 리스트
+
+    Returns:
+        Mapping: 병합된 count, avg, std, min, max, quantiles, histogram
+    """
+    accumulator = empty_accumulator()
+    counts = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int64)
+    arrays = []
+    for section in sections:
+        accumulator = merge_accumulators(accumulator, section["stats"]["accumulator"])
+        counts += np.asarray(section["stats"]["histogram"]["counts"], dtype=np.int64)
+        arrays.append(section["rank_index"]["ascending"])
+    stats = dict(finalize(accumulator))
+    # 분위수는 정렬된 배열들을 병합하여 계산 (안정 정렬은 이미 정렬된 구간을 그대로 병합함)
+    if len(arrays) == 1:
+        merged = arrays[0]
+    else:
+        merged = np.sort(np.concatenate(arrays), kind="stable") if arrays else np.zeros(0)
+    stats["quantiles"] = MappingProxyType(quantiles_from_sorted(merged))
+    stats["histogram"] = MappingProxyType({"edges": HISTOGRAM_EDGES, "counts": tuple(counts.tolist())})
+    return MappingProxyType(stats)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+과목·학기·분반별로 나눈 성적 저장소 (샤드 디렉터리)
+
+(과목, 학기, 분반)마다 grade_store 형식의 파일을 하나씩 만들고, 디렉터리의 manifest.json에
+분반 이름·인원·데이터 버전 같은 메타데이터만 모아 둡니다. 저장소를 열 때는 manifest만 읽고,
+분반 파일은 처음 조회될 때 mmap으로 엽니다.
+
+디렉터리 구조:
+    shards/
+    ├── manifest.json
+    └── 자바프로그래밍/2025-1/1분반.bin
+
+사용법:
+    python shard_store.py build --course 자바프로그래밍 --term 2025-1 data/1분반.csv data/2분반.csv -o shards
+    python shard_store.py list shards
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import weakref
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from grade_store import open_store, read_source, write_store
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 분반 이름의 구분자 (과목/학기/분반)
+NAME_SEPARATOR = "/"
+
+def shard_name(course, term, section):
+    """
+    (과목, 학기, 분반)으로 분반 이름 생성
+
+    Args:
+        course (str): 과목
+        term (str): 학기 (예: "2025-1")
+        section (str): 분반 (예: "1분반")
+
+    Returns:
+        str: "과목/학기/분반" 형태의 이름 (성적 조회 화면과 API에서 분반 이름으로 사용)
+    """
+    return NAME_SEPARATOR.join((course, term, section))
+
+def _safe_part(part):
+    """경로에 쓸 수 없는 문자를 밑줄로 바꿈"""
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", part).strip(". ") or "_"
+
+def _manifest_path(directory):
+    return os.path.join(directory, MANIFEST_NAME)
+
+def read_manifest(directory):
+    """
+    샤드 디렉터리의 manifest를 읽음
+
+    Args:
+        directory (str): 샤드 디렉터리
+
+    Returns:
+        list: 분반 메타데이터 리스트 (없으면 빈 리스트)
+            - name, course, term, section (str)
+            - path (str): 디렉터리 기준 상대 경로
+            - count (int): 학생 수
+            - bytes (int): 파일 크기
+            - data_version (str): 분반 데이터 버전
+    """
+    try:
+        with open(_manifest_path(directory), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return []
+    if manifest.get("format_version") != MANIFEST_VERSION:
+        raise ValueError(f"{directory}: 지원하지 않는 manifest 형식 버전 {manifest.get('format_version')}")
+    return manifest["shards"]
+
+def write_shards(grades_by_key, directory):
+    """
+    (과목, 학기, 분반)별 성적 데이터를 샤드 파일로 저장하고 manifest에 등록
+
+    이미 등록된 다른 분반은 그대로 두므로 과목·학기를 하나씩 추가할 수 있습니다.
+
+    Args:
+        grades_by_key (dict): {(과목, 학기, 분반): {학번: 성적 리스트}}
+        directory (str): 샤드 디렉터리
+
+    Returns:
+        str: 저장소 전체의 데이터 버전
+    """
+    shards = {entry["name"]: entry for entry in read_manifest(directory)}
+    for (course, term, section), grades in grades_by_key.items():
+        relative = os.path.join(_safe_part(course), _safe_part(term), _safe_part(section) + ".bin")
+        path = os.path.join(directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data_version = write_store({section: grades}, path)
+        name = shard_name(course, term, section)
+        shards[name] = {
+            "name": name,
+            "course": course,
+            "term": term,
+            "section": section,
+            "path": relative,
+            "count": len(grades),
+            "bytes": os.path.getsize(path),
+            "data_version": data_version,
+        }
+
+    entries = sorted(shards.values(), key=lambda entry: (entry["course"], entry["term"], entry["section"]))
+    manifest = json.dumps({"format_version": MANIFEST_VERSION, "shards": entries},
+                          ensure_ascii=False, indent=1)
+    # 샤드 파일을 모두 쓴 뒤 manifest를 교체하므로 읽는 쪽은 항상 완성된 목록만 봄
+    tmp_path = _manifest_path(directory) + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(manifest)
+    os.replace(tmp_path, _manifest_path(directory))
+    return _store_version(entries)
+
+def _store_version(entries):
+    """분반 이름과 분반 데이터 버전으로 저장소 전체 버전 계산"""
+    digest = hashlib.sha1()
+    for entry in entries:
+        digest.update(f"{entry['name']}\x00{entry['data_version']}\x00".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+class ShardedGradeStore(Mapping):
+    """
+    샤드 디렉터리 ({분반 이름: SectionView} 딕셔너리처럼 동작)
+
+    분반 목록과 메타데이터는 manifest에서 읽고, 분반 파일은 처음 조회할 때 엽니다.
+    열린 분반은 사용하는 곳이 남아 있는 동안만 유지되며 (약한 참조), 메모리 예산에 따른
+    제거는 분반 스냅샷을 보관하는 grades에서 합니다.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        entries = read_manifest(directory)
+        self.shards = MappingProxyType({entry["name"]: MappingProxyType(entry) for entry in entries})
+        self.data_version = _store_version(entries)
+        self._views = weakref.WeakValueDictionary()
+
+    def __getitem__(self, class_name):
+        entry = self.shards[class_name]
+        view = self._views.get(class_name)
+        if view is None:
+            store = open_store(os.path.join(self.directory, entry["path"]))
+            view = self._views.setdefault(class_name, store[entry["section"]])
+        return view
+
+    def __contains__(self, class_name):
+        return class_name in self.shards
+
+    def __iter__(self):
+        return iter(self.shards)
+
+    def __len__(self):
+        return len(self.shards)
+
+def open_shards(directory):
+    """
+    샤드 디렉터리를 엶 (manifest만 읽음)
+
+    Args:
+        directory (str): 샤드 디렉터리
+
+    Returns:
+        ShardedGradeStore: {분반 이름: SectionView} 형태의 읽기 전용 저장소
+    """
+    return ShardedGradeStore(directory)
+
+def main():
+    """명령행 진입점: 샤드 추가, 목록 출력"""
+    parser = argparse.ArgumentParser(description="과목·학기·분반별 성적 저장소")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="CSV/Parquet 파일로 분반 샤드 추가")
+    build.add_argument("sources", nargs="+",
+                       help="분반별 원본 파일 (파일 이름이 분반 이름, 예: data/1분반.csv)")
+    build.add_argument("--course", required=True, help="과목 이름")
+    build.add_argument("--term", required=True, help="학기 (예: 2025-1)")
+    build.add_argument("-o", "--output", default="shards", help="샤드 디렉터리")
+    listing = subparsers.add_parser("list", help="등록된 분반 목록 출력")
+    listing.add_argument("directory", nargs="?", default="shards", help="샤드 디렉터리")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        grades_by_key = {
+            (args.course, args.term, os.path.splitext(os.path.basename(source))[0]): read_source(source)
+            for source in args.sources
+        }
+        data_version = write_shards(grades_by_key, args.output)
+        print(f"{args.output}에 분반 {len(grades_by_key)}개 추가 (데이터 버전 {data_version})")
+    else:
+        for entry in read_manifest(args.directory):
+            print(f"{entry['name']}\t{entry['count']}명\t{entry['bytes']:,}바이트\t{entry['data_version']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+분반 전체 성적 요약 표와 CSV 내보내기
+
+요약 표는 스냅샷의 등수 인덱스 순서를 그대로 사용하고, CSV는 데이터 버전·분반별로
+한 번만 인코딩합니다.
+"""
+
+import pandas as pd
+
+def build_summary_frame(section):
+    """
+    분반 전체 성적 요약 표 생성 (총점 내림차순)
+
+    Args:
+        section (Mapping): 분반 스냅샷
+
+    Returns:
+        tuple: (요약 DataFrame, {학번: 표의 행 번호})
+    """
+    rank_index = section["rank_index"]
+    student_ids = rank_index["student_ids"]
+    summary_df = pd.DataFrame({
+        "등수": range(1, len(student_ids) + 1),
+        "학번": student_ids,
+        "총점": [f"{total}점" for total in rank_index["totals"].tolist()]
+    })
+    positions = {student_id: i for i, student_id in enumerate(student_ids)}
+    return summary_df, positions
+
+def encode_summary_csv(summary_df):
+    """
+    요약 표 전체를 다운로드용 CSV 바이트로 인코딩
+
+    Streamlit 1.37의 download_button은 data로 받은 파일 객체도 끝까지 읽어 bytes 하나로 만들고
+    미디어 파일 관리자가 그 bytes를 메모리에 보관하므로, 묶음 단위로 스트리밍할 수 없습니다.
+    대신 데이터 버전·분반별로 한 번만 인코딩하여 (app.load_summary_csv) 모든 세션과 재실행이
+    같은 bytes 객체를 넘기고, 미디어 파일 관리자도 내용이 같은 파일을 한 번만 보관합니다.
+
+    Args:
+        summary_df (pandas.DataFrame): build_summary_frame의 요약 표
+
+    Returns:
+        bytes: UTF-8(BOM 포함) CSV
+    """
+    return summary_df.to_csv(index=False).encode("utf-8-sig")
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""JSON HTTP API 요청 검증과 ETag 검사"""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from api_server import create_server
+
+@pytest.fixture(scope="module")
+def server():
+    server = create_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _request(server, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    return response, data
+
+def _raw(server, request):
+    """헤더를 그대로 보낸 뒤 응답 상태 줄을 반환"""
+    with socket.create_connection(("127.0.0.1", server.server_port), timeout=5) as sock:
+        sock.sendall(request)
+        return sock.recv(4096).split(b"\r\n", 1)[0]
+
+def test_classes_not_modified(server):
+    response, data = _request(server, "GET", "/classes")
+    assert response.status == 200
+    assert "1분반" in json.loads(data)["classes"]
+    etag = response.getheader("ETag")
+    response, data = _request(server, "GET", "/classes", headers={"If-None-Match": etag})
+    assert response.status == 304 and data == b""
+
+def test_lookup_not_modified(server):
+    response, _ = _request(server, "GET", "/lookup?class=1%EB%B6%84%EB%B0%98&sid=0066")
+    assert response.status == 200
+    response, _ = _request(server, "GET", "/lookup?class=1%EB%B6%84%EB%B0%98&sid=0066",
+                           headers={"If-None-Match": response.getheader("ETag")})
+    assert response.status == 304
+
+@pytest.mark.parametrize("length, status", [
+    (None, b"411"),
+    (b"abc", b"400"),
+    (b"-1", b"400"),
+])
+def test_invalid_content_length(server, length, status):
+    request = b"POST /lookup/batch HTTP/1.1\r\nHost: x\r\n"
+    if length is not None:
+        request += b"Content-Length: " + length + b"\r\n"
+    line = _raw(server, request + b"\r\n")
+    assert line.split()[1] == status
+
+@pytest.mark.parametrize("queries", [
+    [["1분반", None]],
+    [["1분반", 66]],
+    [{"class_name": "1분반"}],
+    [[1, "0066"]],
+])
+def test_batch_rejects_non_string_fields(server, queries):
+    response, _ = _request(server, "POST", "/lookup/batch",
+                           body=json.dumps({"queries": queries}).encode("utf-8"))
+    assert response.status == 400
+
+def test_batch_lookup(server):
+    body = json.dumps({"queries": [["1분반", "0066"], {"class_name": "1분반", "student_id": "x"}]})
+    response, data = _request(server, "POST", "/lookup/batch", body=body.encode("utf-8"))
+    assert response.status == 200
+    results = json.loads(data)["results"]
+    assert results[0]["found"] and results[0]["total"] == 58.88
+    assert not results[1]["found"]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Streamlit 화면 검사 (AppTest)"""
+
+import os
+
+import pytest
+
+streamlit_testing = pytest.importorskip("streamlit.testing.v1")
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+def _run(admin=None):
+    at = streamlit_testing.AppTest.from_file(APP_PATH, default_timeout=60)
+    if admin is not None:
+        at.query_params["admin"] = admin
+    return at.run()
+
+def _has_debug_panel(at):
+    return any("디버그" in expander.label for expander in at.expander)
+
+@pytest.mark.parametrize("admin, expected", [
+    ("비밀-토큰", True), ("다른-토큰", False), ("é", False), ("", False), (None, False),
+])
+def test_admin_token(monkeypatch, admin, expected):
+    monkeypatch.setenv("GRADES_ADMIN_TOKEN", "비밀-토큰")
+    at = _run(admin)
+    assert not at.exception
+    assert _has_debug_panel(at) == expected
+
+def test_no_admin_token_configured(monkeypatch):
+    monkeypatch.delenv("GRADES_ADMIN_TOKEN", raising=False)
+    at = _run("")
+    assert not at.exception
+    assert not _has_debug_panel(at)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""전체 분반 통합 등수의 동점 처리 방식 검사 (분반 사이에 같은 총점이 있는 경우)"""
+
+import random
+
+import pytest
+
+import grades
+
+def _snapshot(seed=0):
+    rng = random.Random(seed)
+    # 적은 종류의 행만 써서 분반 안과 분반 사이에 동점을 많이 만듦
+    bucket = [[rng.randint(0, 100), 10, rng.randint(0, 100), 10, 10, 10, 10, 10] for _ in range(6)]
+    sections = {
+        f"{k}분반": {f"{i:04d}": list(rng.choice(bucket)) for i in range(40 + k * 7)}
+        for k in range(1, 4)
+    }
+    # 같은 학번이 여러 분반에 있어도 (분반, 학번)으로 구분
+    sections["1분반"]["0000"] = sections["2분반"]["0000"] = [50, 10, 50, 10, 10, 10, 10, 10]
+    return grades.build_snapshot(sections)
+
+def _expected(all_totals, score, mode):
+    higher = sum(total > score for total in all_totals)
+    ties = sum(total == score for total in all_totals)
+    if mode == "competition":
+        return higher + 1
+    if mode == "dense":
+        return len({total for total in all_totals if total > score}) + 1
+    return higher + (ties + 1) / 2
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("mode", ["competition", "dense", "fractional"])
+def test_tie_modes_match_brute_force(seed, mode):
+    snapshot = _snapshot(seed)
+    sections = snapshot["sections"]
+    all_totals = [total for section in sections.values() for total in section["scores"].values()]
+    assert len(set(all_totals)) < len(all_totals)
+    for class_name, section in sections.items():
+        for student_id, total in section["scores"].items():
+            rank = grades.get_global_rank(student_id, class_name, mode, snapshot)
+            assert rank == _expected(all_totals, total, mode), (class_name, student_id)
+            assert isinstance(rank, float if mode == "fractional" else int)
+
+def test_example_ranks():
+    rows = {"a": [90, 10, 90, 10, 10, 10, 10, 10], "b": [50, 10, 50, 10, 10, 10, 10, 10]}
+    snapshot = grades.build_snapshot({
+        "1분반": {"0001": rows["a"], "0002": rows["b"]},
+        "2분반": {"0001": rows["b"], "0003": [0, 0, 0, 0, 0, 0, 0, 0]},
+    })
+    ranks = {(name, sid): tuple(grades.get_global_rank(sid, name, mode, snapshot)
+                                for mode in ("competition", "dense", "fractional"))
+             for name, sid in [("1분반", "0001"), ("1분반", "0002"), ("2분반", "0001"), ("2분반", "0003")]}
+    assert ranks == {("1분반", "0001"): (1, 1, 1.0), ("1분반", "0002"): (2, 2, 2.5),
+                     ("2분반", "0001"): (2, 2, 2.5), ("2분반", "0003"): (4, 3, 4.0)}
+    assert grades.get_global_rank("9999", "1분반", snapshot=snapshot) == -1
+    assert grades.get_global_rank("0001", "없는분반", snapshot=snapshot) == -1
+    index = grades.get_global_rank_index(snapshot)
+    assert index["keys"] == (("1분반", "0001"), ("1분반", "0002"), ("2분반", "0001"), ("2분반", "0003"))
+    with pytest.raises(ValueError):
+        grades.get_global_rank("0001", "1분반", "average", snapshot)
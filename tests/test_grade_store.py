@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""저장소 파일 쓰기/읽기 왕복과 점수 행렬의 무복사 읽기 검사"""
+
+import numpy as np
+
+import grades
+from grade_store import open_store, write_store
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "grades.bin")
+    source = {"1분반": grades.grades_class1, "2분반": grades.grades_class2,
+              "3분반": {"a": [1, 2, 3], "bb": [300, -5, 0]}, "빈분반": {}}
+    version = write_store(source, path)
+    store = open_store(path)
+    assert store.data_version == version
+    assert list(store) == list(source)
+    for class_name, section in source.items():
+        view = store[class_name]
+        assert list(view) == list(section)
+        assert {sid: view[sid] for sid in view} == section
+        assert "없음" not in view
+    # 같은 내용이면 같은 버전
+    assert write_store(source, str(tmp_path / "copy.bin")) == version
+
+def test_score_matrix_is_file_view(tmp_path):
+    path = str(tmp_path / "grades.bin")
+    write_store({"1분반": grades.grades_class1}, path)
+    view = open_store(path)["1분반"]
+    matrix = view.score_matrix()
+    assert matrix.dtype == np.int16 and matrix.flags.c_contiguous
+    assert not matrix.flags.owndata and not matrix.flags.writeable
+    assert matrix.tolist() == list(grades.grades_class1.values())
+    assert view.score_matrix() is matrix
+    # 스냅샷의 점수 행렬도 파일 페이지를 그대로 가리킴
+    section = grades.build_section_snapshot(view)
+    assert np.shares_memory(section["matrix"], matrix)
+    expected = grades.build_section_snapshot(grades.grades_class1)
+    assert np.array_equal(section["totals"], expected["totals"])
+    assert dict(section["rank_index"]["ranks"]) == dict(expected["rank_index"]["ranks"])
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""학번 검색 인덱스가 선형 검색과 같은 결과(데이터 순서)를 내는지 검사"""
+
+import random
+
+import id_index
+from id_index import StudentIdIndex
+
+def _ids(seed=0, n=3_000):
+    rng = random.Random(seed)
+    ids = [f"{rng.randrange(10 ** 4):04d}" for _ in range(n)]
+    ids += ["1111", "11111111", "0", "A-12", "가나다12", "12가나다라", "3202268812"]
+    return tuple(dict.fromkeys(ids))
+
+def _expected(ids, term):
+    return [sid for sid in ids if term in sid]
+
+TERMS = ["1", "12", "123", "1234", "11", "111", "1111", "11111", "0000", "가나", "나다12",
+         "가나다라", "A-", "999999", "x", "2268812"]
+
+def test_search_matches_scan():
+    ids = _ids()
+    index = StudentIdIndex(ids)
+    for term in TERMS:
+        expected = _expected(ids, term)
+        count, found = index.search(term)
+        assert (count, found) == (len(expected), expected), term
+    assert index.search("") == (len(ids), list(ids))
+
+def test_long_terms_use_gram_intersection():
+    ids = ("123456", "234561", "345612", "561234", "12345", "612345")
+    index = StudentIdIndex(ids)
+    for term in ("1234", "12345", "3456", "4561", "56123", "1235", "123456"):
+        assert index.search(term) == (len(_expected(ids, term)), _expected(ids, term)), term
+
+def test_paging():
+    ids = _ids(seed=1)
+    index = StudentIdIndex(ids)
+    expected = _expected(ids, "1")
+    pages = []
+    for offset in range(0, len(expected) + 40, 40):
+        count, page = index.search("1", offset, 40)
+        assert count == len(expected)
+        assert len(page) <= 40
+        pages += page
+    assert pages == expected
+    assert index.search("1", len(expected) + 5, 40) == (len(expected), [])
+    assert index.search("", 10, 5) == (len(ids), list(ids[10:15]))
+
+def test_empty_section_and_ids():
+    assert StudentIdIndex(()).search("1") == (0, [])
+    assert StudentIdIndex(()).search("") == (0, [])
+    assert StudentIdIndex(("", "12")).search("2") == (1, ["12"])
+
+def test_linear_scan_until_background_index_ready(monkeypatch):
+    monkeypatch.setattr(id_index, "SYNC_BUILD_SIZE", 0)
+    ids = _ids(seed=2)
+    index = StudentIdIndex(ids)
+    # 인덱스가 없을 때는 선형 검색으로 바로 답하고 백그라운드에서 인덱스를 만듦
+    assert index.search("12", 0, 10) == (len(_expected(ids, "12")), _expected(ids, "12")[:10])
+    index._builder.join(timeout=30)
+    assert index.ready and index.nbytes > 0
+    for term in TERMS:
+        assert index.search(term)[1] == _expected(ids, term), term
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""증분 재계산(update_section_snapshot)이 전체 재계산과 같은 스냅샷을 만드는지 검사"""
+
+import random
+
+import numpy as np
+import pytest
+
+import grades
+
+def _row(rng, total_bucket=None):
+    if total_bucket is not None:
+        # 동점이 많이 생기도록 적은 종류의 행만 사용
+        return list(total_bucket[rng.randrange(len(total_bucket))])
+    return [rng.randint(0, 100), rng.randint(0, 10), rng.randint(0, 100)] + \
+        [rng.randint(0, 10) for _ in range(5)]
+
+def _assert_same(incremental, rebuilt):
+    assert incremental["student_ids"] == rebuilt["student_ids"]
+    assert np.array_equal(incremental["totals"], rebuilt["totals"])
+    assert dict(incremental["scores"]) == dict(rebuilt["scores"])
+    for key in ("totals", "ascending"):
+        assert np.array_equal(incremental["rank_index"][key], rebuilt["rank_index"][key])
+    assert incremental["rank_index"]["student_ids"] == rebuilt["rank_index"]["student_ids"]
+    assert dict(incremental["rank_index"]["ranks"]) == dict(rebuilt["rank_index"]["ranks"])
+    assert dict(incremental["rejected"]) == dict(rebuilt["rejected"])
+
+def test_restored_tie_keeps_data_order():
+    tied = [50, 5, 50, 5, 5, 5, 5, 5]
+    data = {f"{i:04d}": list(tied) for i in range(5)}
+    section = grades.build_section_snapshot(data)
+    changed = dict(data, **{"0002": [90, 5, 50, 5, 5, 5, 5, 5]})
+    section, _ = grades.update_section_snapshot(section, changed)
+    # 점수를 되돌리면 동점 안에서 원래 데이터 순서로 돌아와야 함
+    section, rescored = grades.update_section_snapshot(section, data)
+    assert rescored == 1
+    assert section["rank_index"]["student_ids"] == ("0000", "0001", "0002", "0003", "0004")
+    _assert_same(section, grades.build_section_snapshot(data))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_updates_match_rebuild(seed):
+    rng = random.Random(seed)
+    bucket = [_row(rng) for _ in range(4)] if seed % 2 else None
+    data = {f"{i:05d}": _row(rng, bucket) for i in range(300)}
+    section = grades.build_section_snapshot(data)
+    next_id = 300
+    for _ in range(5):
+        data = dict(data)
+        ids = list(data)
+        for sid in rng.sample(ids, 30):
+            data[sid] = _row(rng, bucket)             # 점수 변경
+        for sid in rng.sample(ids, 10):
+            del data[sid]                             # 삭제
+        for _ in range(15):
+            data[f"{next_id:05d}"] = _row(rng, bucket)  # 추가
+            next_id += 1
+        if seed % 4 == 3:
+            data[ids[0]] = [200, 0, 0, 0, 0, 0, 0, 0] if ids[0] in data else None  # 범위 밖 행
+            data = {sid: row for sid, row in data.items() if row is not None}
+        section, _ = grades.update_section_snapshot(section, data)
+        _assert_same(section, grades.build_section_snapshot(data))
+
+def test_reordered_data_matches_rebuild():
+    rng = random.Random(7)
+    bucket = [_row(rng) for _ in range(3)]
+    data = {f"{i:04d}": _row(rng, bucket) for i in range(100)}
+    section = grades.build_section_snapshot(data)
+    items = list(data.items())
+    rng.shuffle(items)
+    reordered = dict(items)
+    reordered[items[0][0]] = _row(rng)
+    section, _ = grades.update_section_snapshot(section, reordered)
+    _assert_same(section, grades.build_section_snapshot(reordered))
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""적재 검증: 잘못된 행의 제외와 보고, calc_score의 ValueError 검사"""
+
+import numpy as np
+import pytest
+
+import grades
+from grading_policy import get_policy
+from ingest import ingest_section, validate_rows
+
+GOOD = [78, 10, 44, 10, 9, 10, 9, 7]
+
+BAD_ROWS = {
+    "short": ([78, 10, 44], "잘못된 데이터 형식: 3개 요소 (8개 필요)"),
+    "long": (GOOD + [1], "잘못된 데이터 형식: 9개 요소 (8개 필요)"),
+    "text": ([78, "10", 44, 10, 9, 10, 9, 7], "숫자가 아닌 값이 포함되어 있습니다: '10'"),
+    "none": ([78, None, 44, 10, 9, 10, 9, 7], "숫자가 아닌 값이 포함되어 있습니다: None"),
+    "not_list": ("78,10,44", "성적 행이 리스트가 아닙니다: str"),
+    "nan": ([78, 10, float("nan"), 10, 9, 10, 9, 7], "유한하지 않은 점수: 기말고사=nan"),
+    "high": ([101, 10, 44, 10, 9, 10, 9, 7], "범위를 벗어난 점수: 중간고사=101 (0~100)"),
+    "negative": ([78, 10, 44, 10, -1, 10, 9, 7], "범위를 벗어난 점수: 연습과제 2=-1 (0~10)"),
+    "extra": ([78, 11, 44, 10, 9, 10, 9, 7], "범위를 벗어난 점수: 중간 EXTRA=11 (0~10)"),
+}
+
+def _section_data():
+    data = {f"{i:04d}": [i % 101, i % 11, (i * 3) % 101] + [i % 11] * 5 for i in range(50)}
+    for student_id, (row, _) in BAD_ROWS.items():
+        data[student_id] = row
+    return data
+
+def test_rejected_rows_are_excluded_and_reported():
+    data = _section_data()
+    section = grades.build_section_snapshot(data)
+    assert set(section["rejected"]) == set(BAD_ROWS)
+    for student_id, (row, reason) in BAD_ROWS.items():
+        assert section["rejected"][student_id]["reason"] == reason, student_id
+        assert section["rejected"][student_id]["row"] is row
+        assert student_id not in section["rows"] and student_id not in section["scores"]
+    # 나머지 행은 정상 행만 있을 때와 같은 총점·등수
+    clean = grades.build_section_snapshot({sid: row for sid, row in data.items() if sid not in BAD_ROWS})
+    assert section["student_ids"] == clean["student_ids"]
+    assert np.array_equal(section["totals"], clean["totals"])
+    assert dict(section["rank_index"]["ranks"]) == dict(clean["rank_index"]["ranks"])
+    assert section["stats"]["count"] == 50
+
+def test_get_rejected_rows_report():
+    snapshot = grades.build_snapshot({"1분반": _section_data(), "2분반": {"0001": GOOD}})
+    report = grades.get_rejected_rows(snapshot=snapshot)
+    assert [(item["class_name"], item["student_id"]) for item in report] == \
+        [("1분반", student_id) for student_id in BAD_ROWS]
+    assert grades.get_rejected_rows("2분반", snapshot) == []
+
+def test_fast_path_checks_ranges():
+    rows = np.array([GOOD, [78, 10, 44, 10, 9, 10, 9, 70], GOOD])
+    policy = get_policy()
+    matrix, valid, reasons = validate_rows(rows, 8, policy["min_scores"], policy["max_scores"], policy["labels"])
+    assert valid.tolist() == [True, False, True]
+    assert reasons == {1: "범위를 벗어난 점수: 연습과제 5=70 (0~10)"}
+    assert matrix[1].tolist() == [0] * 8 and matrix.dtype.kind == "i"
+    student_ids, kept, rejected = ingest_section({"a": GOOD, "b": rows[1].tolist()}, policy)
+    assert student_ids == ("a",) and kept.shape == (1, 8) and list(rejected) == ["b"]
+
+@pytest.mark.parametrize("student_id", list(BAD_ROWS))
+def test_calc_score_raises_for_invalid_rows(student_id):
+    # 기존 calc_score는 잘못된 행에 0.0(또는 범위 밖 점수의 계산값)을 반환했지만 이제 ValueError
+    row, reason = BAD_ROWS[student_id]
+    with pytest.raises(ValueError) as excinfo:
+        grades.calc_score(row)
+    assert str(excinfo.value) == reason
+
+def test_calc_score_valid_row():
+    assert grades.calc_score(GOOD) == 58.88
+
+def test_bool_scores_count_as_numbers_on_both_paths():
+    row = [78, True, 44, 10, 9, 10, 9, 7]
+    fast = grades.build_section_snapshot({"a": row})
+    slow = grades.build_section_snapshot({"a": row, "b": [1, 2]})
+    assert fast["scores"]["a"] == slow["scores"]["a"] == grades.calc_score([78, 1, 44, 10, 9, 10, 9, 7])
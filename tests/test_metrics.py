@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""Prometheus 파일 내보내기: 조회 경로 밖에서 기록하고 쓰기 오류를 삼키는지 검사"""
+
+import logging
+import os
+import time
+
+import metrics
+from metrics import PrometheusFileExporter
+
+def test_record_does_not_write_on_caller_thread(tmp_path):
+    path = tmp_path / "grades.prom"
+    exporter = PrometheusFileExporter(str(path), interval=0.05)
+    try:
+        exporter.record("counter", "app.rerun.app", 1)
+        assert not path.exists()
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.exists()
+    finally:
+        exporter.close()
+    assert not exporter._writer.is_alive()
+
+def test_write_errors_are_logged(tmp_path, caplog):
+    exporter = PrometheusFileExporter(str(tmp_path / "없는 디렉터리" / "grades.prom"))
+    with caplog.at_level(logging.ERROR, logger="grades.metrics"):
+        exporter.flush()
+    assert "Prometheus 측정 파일 기록 실패" in caplog.text
+
+def test_render_after_flush(tmp_path):
+    path = tmp_path / "grades.prom"
+    try:
+        metrics.configure(f"prometheus:{path}")
+        metrics.count("app.cache.summary_csv.miss")
+        metrics.observe("grades.calc_scores", 0.25)
+        metrics.flush()
+        text = path.read_text(encoding="utf-8")
+    finally:
+        metrics.configure("")
+        metrics.reset()
+    assert "grades_app_cache_summary_csv_miss_total 1" in text
+    assert "grades_grades_calc_scores_seconds_sum 0.250000000" in text
+    assert not any(name.startswith(".metrics-") for name in os.listdir(tmp_path))
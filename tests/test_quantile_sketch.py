@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""KLL 스케치의 순위 오차가 허용 범위(전체 인원 × error) 안에 있는지 검사"""
+
+import numpy as np
+import pytest
+
+from quantile_sketch import KLLSketch, build_sketch
+
+ERROR = 0.01
+
+def _datasets(n, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        "uniform": rng.random(n) * 100,
+        "normal": rng.normal(60, 15, n),
+        # 실제 총점처럼 소수 둘째 자리까지의 값 (동점이 많음)
+        "scores": np.round(rng.integers(0, 10_001, n) / 100, 2),
+        "sorted": np.sort(rng.random(n)),
+        "constant": np.full(n, 42.0),
+    }
+
+def _max_rank_error(sketch, values):
+    ascending = np.sort(values)
+    probes = np.unique(np.quantile(ascending, np.linspace(0, 1, 201)))
+    exact = np.searchsorted(ascending, probes, side="right")
+    approx = np.array([sketch.rank(value) for value in probes])
+    return int(np.abs(approx - exact).max())
+
+@pytest.mark.parametrize("seed", range(3))
+def test_rank_error_within_bound(seed):
+    n = 200_000
+    for name, values in _datasets(n, seed).items():
+        sketch = build_sketch(values, ERROR, seed)
+        assert sketch.count == n
+        assert sketch.rank(float("inf")) == n, name
+        assert _max_rank_error(sketch, values) <= n * ERROR, name
+        # 보관 값은 전체 인원보다 훨씬 적어야 함
+        assert sketch.retained < n // 50, name
+
+def test_merged_sketch_error_within_bound():
+    parts = [np.random.default_rng(seed).normal(50 + seed, 10, 60_000) for seed in range(5)]
+    merged = None
+    for seed, values in enumerate(parts):
+        sketch = build_sketch(values, ERROR, seed)
+        merged = sketch if merged is None else merged.merge(sketch)
+    values = np.concatenate(parts)
+    assert merged.count == len(values)
+    assert merged.rank(float("inf")) == len(values)
+    assert _max_rank_error(merged, values) <= len(values) * ERROR
+
+def test_small_input_is_exact():
+    values = np.array([3.0, 1.0, 2.0, 2.0])
+    sketch = build_sketch(values)
+    assert [sketch.rank(v) for v in (0.5, 1.0, 2.0, 3.0)] == [0, 1, 3, 4]
+    assert sketch.rank(2.0, inclusive=False) == 1
+    assert sketch.quantile(0.5) == 2.0
+
+def test_empty_sketch():
+    sketch = KLLSketch()
+    assert sketch.count == 0 and sketch.quantile(0.5) is None and sketch.rank(1.0) == 0
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""일괄 성적표 생성 결과의 학생 수가 실제로 기록한 학생 수와 같은지 검사"""
+
+import csv
+import io
+
+import pytest
+
+import grades
+import reports
+
+@pytest.mark.parametrize("chunk_size", [10, 7, 1000])
+def test_csv_student_count_matches_written(tmp_path, chunk_size):
+    snapshot = grades.get_snapshot()
+    result = reports.generate_reports(str(tmp_path), "csv", workers=0, chunk_size=chunk_size,
+                                      snapshot=snapshot, progress=False)
+    written = 0
+    for class_name, path in result["files"].items():
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+        student_ids = {row["학번"] for row in rows}
+        assert student_ids == set(snapshot["sections"][class_name]["student_ids"])
+        written += len(student_ids)
+    assert result["students"] == written
+    assert written == sum(len(section["student_ids"]) for section in snapshot["sections"].values())
+
+def test_html_student_count(tmp_path):
+    snapshot = grades.get_snapshot()
+    result = reports.generate_reports(str(tmp_path), "html", workers=0, chunk_size=10,
+                                      snapshot=snapshot, progress=False)
+    assert result["students"] == sum(len(section["student_ids"])
+                                     for section in snapshot["sections"].values())
+
+def _snapshot_with_rejected():
+    return grades.build_snapshot({
+        "1분반": dict(grades.grades_class1, **{"9998": [200, 0, 0, 0, 0, 0, 0, 0]}),
+        "2분반": dict(grades.grades_class2, **{"9999": [1, 2, 3]}),
+    })
+
+def test_process_pool_matches_in_process(tmp_path):
+    snapshot = _snapshot_with_rejected()
+    serial = reports.generate_reports(str(tmp_path / "serial"), "csv", workers=0, chunk_size=7,
+                                      snapshot=snapshot, progress=False)
+    pooled = reports.generate_reports(str(tmp_path / "pooled"), "csv", workers=2, chunk_size=7,
+                                      snapshot=snapshot, progress=False)
+    assert pooled["students"] == serial["students"]
+    assert pooled["rejected"] == serial["rejected"] == 2
+    for class_name, path in serial["files"].items():
+        with open(path, "rb") as f, open(pooled["files"][class_name], "rb") as g:
+            assert f.read() == g.read()
+
+def test_progress_total_excludes_rejected(tmp_path, monkeypatch):
+    trackers = []
+
+    class Recording(reports._Progress):
+        def __init__(self, total):
+            super().__init__(total, io.StringIO())
+            trackers.append(self)
+
+    monkeypatch.setattr(reports, "_Progress", Recording)
+    result = reports.generate_reports(str(tmp_path), "csv", workers=0,
+                                      snapshot=_snapshot_with_rejected())
+    assert trackers[0].total == trackers[0].done == result["students"]
+    assert "(100.0%)" in trackers[0].stream.getvalue().splitlines()[-1]
+
+def test_main_prints_missing_rate(monkeypatch, capsys):
+    monkeypatch.setattr(reports, "generate_reports", lambda *args: {
+        "files": {}, "students": 0, "rejected": 0, "bytes": 0, "seconds": 0, "students_per_s": None})
+    monkeypatch.setattr("sys.argv", ["reports.py", "--workers", "0"])
+    reports.main()
+    assert "-명/s" in capsys.readouterr().out
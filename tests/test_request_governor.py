@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""조회 요청 제어 검사 (토큰 버킷 채움, 같은 조회 묶기, 렌더링 자리, 간단한 결과)"""
+
+import threading
+
+import pytest
+
+import grades
+import request_governor
+from request_governor import (ADMITTED, DEBOUNCED, LIMITED, SessionGovernor, TokenBucket,
+                              minimal_result, render_slot)
+
+class FakeClock:
+    """테스트에서 직접 움직이는 시계"""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.5, capacity=3, clock=clock)
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+    assert bucket.retry_after() == pytest.approx(2.0)
+    clock.advance(1.0)
+    assert not bucket.take()
+    assert bucket.retry_after() == pytest.approx(1.0)
+    clock.advance(1.0)
+    assert bucket.take()
+    # 오래 쉬어도 capacity개까지만 모임
+    clock.advance(60.0)
+    assert [bucket.take() for _ in range(4)] == [True, True, True, False]
+
+def test_token_bucket_without_rate_never_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0, capacity=1, clock=clock)
+    assert bucket.take()
+    clock.advance(1000.0)
+    assert not bucket.take()
+    assert bucket.retry_after() == float("inf")
+
+def test_session_governor_debounces_same_lookup():
+    clock = FakeClock()
+    governor = SessionGovernor(rate=0.5, burst=2, debounce=2.0, clock=clock)
+    key = ("v1", "1분반", "2426")
+    assert governor.check(key) == (ADMITTED, 0.0)
+    governor.remember(key, "result")
+    clock.advance(1.9)
+    # 묶인 조회는 토큰을 쓰지 않음
+    assert governor.check(key) == (DEBOUNCED, 0.0)
+    assert governor.last_result == "result"
+    assert governor.bucket.tokens == 1
+    clock.advance(0.1)
+    assert governor.check(key) == (ADMITTED, 0.0)
+
+def test_session_governor_limits_burst():
+    clock = FakeClock()
+    governor = SessionGovernor(rate=0.5, burst=2, debounce=2.0, clock=clock)
+    for student_id in ("0001", "0002"):
+        assert governor.check(("v1", "1분반", student_id)) == (ADMITTED, 0.0)
+    decision, retry = governor.check(("v1", "1분반", "0003"))
+    assert decision == LIMITED
+    assert retry == pytest.approx(2.0)
+    clock.advance(retry)
+    assert governor.check(("v1", "1분반", "0003")) == (ADMITTED, 0.0)
+
+def test_render_slot_degrades_when_exhausted(monkeypatch):
+    monkeypatch.setattr(request_governor, "_render_slots", threading.BoundedSemaphore(1))
+    with render_slot(timeout=0) as first:
+        assert first
+        with render_slot(timeout=0) as second:
+            assert not second
+    # 자리를 얻지 못한 쪽은 반납하지 않으므로 BoundedSemaphore가 넘치지 않음
+    with render_slot(timeout=0) as again:
+        assert again
+
+def test_minimal_result_reads_snapshot_totals():
+    snapshot = grades.build_snapshot({
+        "1분반": {"0001": [90, 10, 90, 10, 10, 10, 10, 10], "0002": [50, 10, 50, 10, 10, 10, 10, 10]},
+    })
+    section = snapshot["sections"]["1분반"]
+    result = minimal_result(snapshot, "1분반", "0002")
+    assert result["total"] == section["scores"]["0002"]
+    assert result["rank"] == 2
+    assert result["total_students"] == 2
+    assert minimal_result(snapshot, "1분반", "9999") is None
+    assert minimal_result(snapshot, "없는분반", "0001") is None
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""배치 총점 계산(calc_scores)이 기존 한 학생 공식과 같은 값을 내는지 검사"""
+
+import numpy as np
+
+import grades
+from grading_policy import compile_policy, get_policy
+
+def legacy_calc_score(student_scores):
+    """기존 calc_score의 공식 (부동소수점 계산 후 round)"""
+    mid, mid_extra, final = student_scores[0], student_scores[1], student_scores[2]
+    exercises = student_scores[3:8]
+    total = (
+        (mid + mid_extra) * 33.33 / 100 +
+        final * 44.44 / 100 +
+        sum(exercises) * 22.22 / 100
+    )
+    return round(total, 2)
+
+def _random_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(0, 101, n),
+        rng.integers(0, 11, n),
+        rng.integers(0, 101, n),
+        rng.integers(0, 11, (n, 5)),
+    ])
+
+def test_batch_matches_legacy_formula():
+    matrix = _random_rows(20_000)
+    totals = grades.calc_scores(matrix)
+    expected = [legacy_calc_score(row) for row in matrix.tolist()]
+    assert totals.tolist() == expected
+
+def test_rounding_ties_match_legacy_formula():
+    # 정수 가중치 곱의 나머지가 정확히 절반(x.xx5)인 행을 모두 모아 검사
+    policy = get_policy()
+    matrix = _random_rows(50_000, seed=1)
+    weighted = matrix @ policy["int_weights"]
+    unit = 10 ** (2 + policy["weight_decimals"] - policy["rounding"])
+    ties = matrix[weighted % unit == unit // 2]
+    assert len(ties) > 0
+    totals = grades.calc_scores(ties)
+    assert totals.tolist() == [legacy_calc_score(row) for row in ties.tolist()]
+
+def test_calc_score_matches_batch():
+    matrix = _random_rows(500, seed=2)
+    totals = grades.calc_scores(matrix)
+    assert [grades.calc_score(row) for row in matrix.tolist()] == totals.tolist()
+
+def test_fractional_scores_use_formula():
+    rows = [[50.5, 3, 70, 1, 2, 3, 4, 5], [99.25, 10, 88.5, 10, 9.5, 8, 7, 6]]
+    totals = grades.calc_scores(np.array(rows))
+    assert totals.tolist() == [legacy_calc_score(row) for row in rows]
+
+def test_invalid_rows_are_zero():
+    matrix = _random_rows(4, seed=3)
+    valid = np.array([True, False, True, False])
+    totals = grades.calc_scores(matrix, valid)
+    assert totals[1] == 0.0 and totals[3] == 0.0
+    assert totals[0] == legacy_calc_score(matrix[0].tolist())
+
+def test_non_integral_weights_fall_back_to_float():
+    policy = compile_policy({
+        "name": "3등분",
+        "columns": ["a", "b"],
+        "components": [
+            {"name": "a", "columns": [0, 1], "weight": 100 / 3},
+            {"name": "b", "columns": [1, 2], "weight": 200 / 3},
+        ],
+        "rounding": 2,
+    })
+    matrix = np.array([[90, 60], [10, 20]])
+    totals = grades.calc_scores(matrix, None, policy)
+    expected = [round(a * (100 / 3) / 100 + b * (200 / 3) / 100, 2) for a, b in matrix.tolist()]
+    assert totals.tolist() == expected
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""분반 통계 병합 검사"""
+
+import numpy as np
+import pytest
+
+import grades
+from section_stats import QUANTILES, combine_sections
+
+def _sections(seed=0):
+    rng = np.random.default_rng(seed)
+    sections = []
+    for size in (120, 1, 333):
+        rows = np.column_stack([rng.integers(0, 101, size), rng.integers(0, 11, size),
+                                rng.integers(0, 101, size), rng.integers(0, 11, (size, 5))])
+        data = {f"{i:04d}": row for i, row in enumerate(rows.tolist())}
+        sections.append(grades.build_section_snapshot(data))
+    return sections
+
+def test_combined_stats_match_concatenated_totals():
+    sections = _sections()
+    totals = np.concatenate([section["totals"] for section in sections])
+    stats = combine_sections(sections)
+    assert stats["count"] == len(totals)
+    assert stats["avg"] == pytest.approx(totals.mean())
+    assert stats["std"] == pytest.approx(totals.std())
+    assert stats["min"] == totals.min() and stats["max"] == totals.max()
+    for q in QUANTILES:
+        assert stats["quantiles"][q] == pytest.approx(np.percentile(totals, q * 100))
+    assert sum(stats["histogram"]["counts"]) == len(totals)
+
+def test_combined_stats_cached_per_snapshot():
+    snapshot = grades.get_snapshot()
+    names = list(snapshot["sections"].keys())
+    _, first = grades.get_section_stats(snapshot, names)
+    _, second = grades.get_section_stats(snapshot, names)
+    assert first is second
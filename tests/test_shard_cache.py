@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""샤드 저장소 분반 캐시의 LRU 제거와, 분반 요약만 쓰는 조회가 분반 스냅샷을 올리지 않는지 검사"""
+
+import random
+import tracemalloc
+from collections import OrderedDict
+
+import pytest
+
+import grades
+from shard_store import open_shards, write_shards
+
+def _grades(seed, count=400):
+    rng = random.Random(seed)
+    section = {
+        f"{20250000 + i}": [rng.randint(0, 100), rng.randint(0, 10), rng.randint(0, 100)]
+        + [rng.randint(0, 10) for _ in range(5)]
+        for i in range(count)
+    }
+    section[f"{20250000 + count}"] = [200, 0, 0, 0, 0, 0, 0, 0]  # 범위 밖 행
+    return section
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(grades, "_shard_sections", OrderedDict())
+    monkeypatch.setattr(grades, "_shard_bytes", 0)
+    monkeypatch.setattr(grades, "_shard_summaries", {})
+    monkeypatch.setattr(grades, "_derived", {})
+    # 과목이 모두 달라서 통합 등수의 비교 범위는 자기 분반뿐
+    write_shards({(f"과목{k}", "2025-1", "1분반"): _grades(k) for k in range(3)}, str(tmp_path))
+    return grades.build_snapshot(open_shards(str(tmp_path)))
+
+def _cached():
+    return grades.get_shard_cache_info()["sections"]
+
+def test_lru_evicts_least_recently_used(snapshot, monkeypatch):
+    sections = snapshot["sections"]
+    first, second, third = list(sections)
+    sections[first]
+    nbytes = grades.get_shard_cache_info()["used_bytes"]
+    # 분반 두 개만 들어가는 예산
+    monkeypatch.setattr(grades, "SHARD_MEMORY_BUDGET_MB", nbytes * 2.5 / 2**20)
+    sections[second]
+    assert _cached() == [first, second]
+    sections[first]                              # 최근 조회로 이동
+    sections[third]
+    assert _cached() == [first, third]
+    assert grades.get_shard_cache_info()["used_bytes"] <= nbytes * 2.5
+    # 제거된 분반도 다시 조회하면 같은 결과로 다시 계산
+    totals = sections[second]["totals"]
+    assert _cached() == [third, second]
+    assert totals.tolist() == grades.build_section_snapshot(_grades(1))["totals"].tolist()
+
+def test_summary_queries_do_not_load_sections(snapshot):
+    sections = snapshot["sections"]
+    names = list(sections)
+    # 요약이 계산된 분반이 없으면 보고할 분반도 없음
+    assert grades.get_rejected_rows(snapshot=snapshot) == []
+    report = grades.get_rejected_rows(names[0], snapshot)
+    assert [item["student_id"] for item in report] == ["20250400"]
+    assert "범위" in report[0]["reason"]
+    overall = grades.get_approximate_rank(50.0, snapshot=snapshot)
+    assert overall["count"] == 3 * 400
+    assert _cached() == []
+    assert sorted(grades.get_shard_cache_info()["summaries"]) == sorted(names)
+    assert len(grades.get_rejected_rows(snapshot=snapshot)) == 3
+
+    # 통합 등수는 같은 과목·학기 분반만 읽음
+    rank = grades.get_global_rank("20250000", names[1], snapshot=snapshot)
+    assert _cached() == [names[1]]
+    assert rank == sections[names[1]]["rank_index"]["ranks"]["20250000"]
+
+def test_summaries_survive_eviction(snapshot, monkeypatch):
+    sections = snapshot["sections"]
+    names = list(sections)
+    monkeypatch.setattr(grades, "SHARD_MEMORY_BUDGET_MB", 0)
+    for name in names:
+        sections[name]
+    # 예산이 0이어도 방금 계산한 분반 하나는 유지
+    assert _cached() == [names[-1]]
+    assert sorted(grades.get_shard_cache_info()["summaries"]) == sorted(names)
+    sketch = grades.get_section_sketch(names[0], snapshot=snapshot)
+    assert sketch.count == 400
+    assert len(grades.get_rejected_rows(snapshot=snapshot)) == 3
+    assert _cached() == [names[-1]]
+
+def test_section_nbytes_covers_measured_memory():
+    data = _grades(0, count=5000)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        section = grades.build_section_snapshot(data)
+        estimate = grades._section_nbytes(section)
+        section["id_index"].build()
+        measured = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    # 딕셔너리·학번 문자열·검색 인덱스를 포함한 추정이 실제 사용량 이상, 크게 넘지 않음
+    assert measured <= estimate <= 2 * measured
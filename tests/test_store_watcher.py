@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""저장소 변경 감시: 실패한 갱신의 재시도와 감시 스레드 시작 검사"""
+
+import threading
+
+import pytest
+
+import grades
+from grade_store import write_store
+
+def test_failed_reload_is_retried(tmp_path, monkeypatch):
+    path = str(tmp_path / "grades.bin")
+    write_store({"1분반": {"0001": [1, 2, 3, 4, 5, 6, 7, 8]}}, path)
+    monkeypatch.setattr(grades, "_store_mtime", None)
+    calls = []
+
+    def reload(store):
+        calls.append(store.data_version)
+        if len(calls) == 1:
+            raise OSError("반쯤 쓰인 파일")
+        return {"1분반": 1}
+
+    monkeypatch.setattr(grades, "reload_grades", reload)
+    with pytest.raises(OSError):
+        grades.check_store_update(path)
+    # 실패한 변경은 기록되지 않아 다음 확인에서 다시 읽음
+    assert grades._store_mtime is None
+    assert grades.check_store_update(path) == {"1분반": 1}
+    assert grades.check_store_update(path) is None
+    assert len(calls) == 2
+
+def test_running_watcher_does_not_wait_for_reload(tmp_path, monkeypatch):
+    path = str(tmp_path / "grades.bin")
+    write_store({"1분반": {}}, path)
+    monkeypatch.setattr(grades, "_store_watcher", None)
+    watcher = grades.start_store_watcher(path, interval=3600)
+    assert watcher.is_alive()
+    result = []
+    # 갱신이 _reload_lock을 잡고 있어도 재실행마다 부르는 start_store_watcher는 바로 반환
+    with grades._reload_lock:
+        thread = threading.Thread(target=lambda: result.append(grades.start_store_watcher(path)))
+        thread.start()
+        thread.join(timeout=5)
+    assert result == [watcher]
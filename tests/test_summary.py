@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""요약 표·CSV 내보내기 검사"""
+
+import codecs
+
+import grades
+from summary import build_summary_frame, encode_summary_csv
+
+def _section():
+    data = {f"{i:04d}": [i % 101, i % 11, (i * 7) % 101, 1, 2, 3, 4, i % 11] for i in range(250)}
+    return grades.build_section_snapshot(data)
+
+def test_summary_frame_follows_rank_index():
+    section = _section()
+    summary_df, positions = build_summary_frame(section)
+    assert tuple(summary_df["학번"]) == section["rank_index"]["student_ids"]
+    assert list(summary_df["등수"]) == list(range(1, 251))
+    assert all(summary_df["학번"][row] == sid for sid, row in positions.items())
+
+def test_csv_encoding():
+    summary_df, _ = build_summary_frame(_section())
+    encoded = encode_summary_csv(summary_df)
+    assert encoded.startswith(codecs.BOM_UTF8 + "등수,학번,총점\n".encode("utf-8"))
+    assert encoded.decode("utf-8-sig").splitlines()[1:] == [
+        f"{row.등수},{row.학번},{row.총점}" for row in summary_df.itertuples()]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""what-if 시뮬레이션이 총점 엔진(calc_scores)·스냅샷과 같은 총점·등수를 내는지 검사"""
+
+import numpy as np
+import pytest
+
+import grades
+import what_if
+from grading_policy import DEFAULT_POLICY, compile_policy
+
+def _section(n=30_000, seed=0, fractional=False):
+    rng = np.random.default_rng(seed)
+    rows = np.column_stack([rng.integers(0, 101, n), rng.integers(0, 11, n),
+                            rng.integers(0, 101, n), rng.integers(0, 11, (n, 5))]).astype(np.float64)
+    if fractional:
+        rows[::7, 0] -= 0.5
+        rows[rows < 0] = 0
+    data = {f"{i:05d}": row for i, row in enumerate(rows.tolist())}
+    return grades.build_section_snapshot(data)
+
+def _policy_with(component_weights):
+    policy = dict(DEFAULT_POLICY)
+    policy["components"] = [dict(component) for component in DEFAULT_POLICY["components"]]
+    for component in policy["components"]:
+        if component["name"] in component_weights:
+            component["weight"] = component_weights[component["name"]]
+    return compile_policy(policy)
+
+def _competition_ranks(totals):
+    ascending = np.sort(totals)
+    return len(totals) - np.searchsorted(ascending, totals, side="right") + 1
+
+@pytest.mark.parametrize("fractional", [False, True])
+def test_baseline_matches_snapshot(fractional):
+    section = _section(fractional=fractional)
+    result = what_if.simulate_section(section, return_arrays=True)
+    baseline = result["baseline"]
+    assert np.array_equal(baseline["totals"], section["totals"])
+    ranks = section["rank_index"]["ranks"]
+    assert baseline["ranks"].tolist() == [ranks[sid] for sid in section["student_ids"]]
+    # 현재 가중치 시나리오는 기준선과 완전히 같아야 함
+    scenario = result["scenarios"][0]
+    assert np.array_equal(scenario["totals"], section["totals"])
+    assert scenario["rank_shift"]["changed"] == 0 and scenario["crossers_count"] == 0
+
+@pytest.mark.parametrize("fractional", [False, True])
+def test_scenarios_match_calc_scores(fractional):
+    section = _section(seed=1, fractional=fractional)
+    candidates = [
+        {"기말고사": 50, "연습과제 합계": 16.67},
+        {"중간고사 합계 (중간+EXTRA)": 30.005, "기말고사": 47.5},
+        {"연습과제 합계": 25},
+    ]
+    result = what_if.simulate_section(section, candidates, return_arrays=True)
+    for candidate, scenario in zip(candidates, result["scenarios"]):
+        expected = grades.calc_scores(section["matrix"], None, _policy_with(candidate))
+        assert np.array_equal(scenario["totals"], expected), candidate
+        assert np.array_equal(scenario["ranks"], _competition_ranks(expected))
+
+def test_grades_follow_cutoffs():
+    section = _section(n=5_000, seed=2)
+    cutoffs = [{"A": 85, "B": 72.5, "C": 60, "D": 45.01}, {"A": 90, "B": 80, "C": 70, "D": 60}]
+    result = what_if.simulate_section(section, [{"기말고사": 40}], cutoffs, return_arrays=True)
+    assert result["grades"] == ("A", "B", "C", "D", "F")
+    for cutoff, scenario in zip(cutoffs, result["scenarios"]):
+        totals = scenario["totals"]
+        expected = np.full(len(totals), 4)
+        for index, grade in reversed(list(enumerate(("A", "B", "C", "D")))):
+            expected[totals >= cutoff[grade]] = index
+        assert scenario["grade_index"].tolist() == expected.tolist()
+        assert sum(scenario["distribution"].values()) == len(totals)
+        assert scenario["crossers_count"] == int(np.count_nonzero(
+            scenario["grade_index"] != result["baseline"]["grade_index"]))
+
+def test_column_weight_matrix():
+    section = _section(n=2_000, seed=3)
+    weights = np.tile(section["policy"]["weights"], (2, 1))
+    weights[1, 2] = 50
+    weights[1, 3:8] = [5, 4, 3, 2, 2.22]   # 한 구성 항목 안에서 열마다 다른 가중치
+    result = what_if.simulate_section(section, weights, return_arrays=True)
+    assert np.array_equal(result["scenarios"][0]["totals"], section["totals"])
+    matrix = section["matrix"]
+    expected = [
+        round((row[0] + row[1]) * 33.33 / 100 + row[2] * 50 / 100 +
+              (row[3] * 5 / 100 + row[4] * 4 / 100 + row[5] * 3 / 100 + row[6] * 2 / 100
+               + row[7] * 2.22 / 100), 2)
+        for row in matrix.tolist()
+    ]
+    assert result["scenarios"][1]["totals"].tolist() == expected
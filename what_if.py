@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+가중치·학점 기준 변경 시뮬레이션 (what-if)
+
+"기말고사 비중을 50%로 올리면 등수와 통과율이 어떻게 바뀌나?" 같은 질문에 답하기 위해
+여러 가중치 후보와 학점 기준을 분반 전체에 한 번에 적용합니다. 총점은 (학생 × 열) 점수 행렬과
+(열 × 시나리오) 정수 가중치 행렬의 곱으로 계산하고, 현재 정책의 결과(기준선)와 비교하여
+등수 변화, 학점 분포, 학점 경계를 넘는 학생을 돌려줍니다.
+
+사용 예:
+    result = simulate("1분반", weights=[{"기말고사": 50, "연습과제 합계": 16.67}],
+                      cutoffs={"A": 90, "B": 80, "C": 70, "D": 60})
+
+    python what_if.py 1분반 scenarios.json -o result.json
+    (scenarios.json: {"weights": [{"기말고사": 50}, ...], "cutoffs": [{"A": 90, ...}, ...]})
+"""
+
+import argparse
+import json
+from collections.abc import Mapping
+
+import numpy as np
+
+import grades
+from grading_policy import weight_decimals
+
+# 기본 학점 기준 {학점: 최소 총점} (가장 낮은 기준 미만은 FAIL_GRADE)
+DEFAULT_CUTOFFS = {"A": 90, "B": 80, "C": 70, "D": 60}
+FAIL_GRADE = "F"
+
+# 한 번에 계산하는 (학생 수 × 시나리오 수) 최대 요소 수 (int64 기준 약 32MB)
+CHUNK_ELEMENTS = 4_000_000
+
+# 시나리오별로 돌려주는 경계 이동 학생 수 (전체 수는 crossers_count)
+MAX_CROSSERS = 100
+
+# float64가 정수를 정확히 표현하는 한계
+_FLOAT_EXACT = 2 ** 53
+
+# 등수를 계수 정렬로 계산할 최대 총점 범위 (반올림 단위 기준, 넘으면 정렬 사용)
+_COUNTING_RANGE = 1_000_000
+
+def scenario_weights(policy, weights):
+    """
+    가중치 후보를 (시나리오 × 열) 가중치 행렬로 변환
+
+    Args:
+        policy (Mapping): 컴파일된 성적 산출 정책
+        weights: 다음 중 하나
+            - None: 현재 정책의 가중치 한 개
+            - [{구성 항목 이름 또는 표시 이름: 가중치(%)}]: 지정하지 않은 항목은 현재 가중치
+            - (시나리오 × 열) 또는 (열,) 배열: 열별 가중치(%)
+
+    Returns:
+        numpy.ndarray: (시나리오 수 × 열 수) float64 가중치 행렬 (%)
+
+    Raises:
+        ValueError: 알 수 없는 구성 항목이거나 열 수가 정책과 다른 경우
+    """
+    if weights is None:
+        return policy["weights"][None, :].copy()
+    if isinstance(weights, Mapping):
+        weights = [weights]
+    if len(weights) and isinstance(weights[0], Mapping):
+        by_name = {}
+        for component in policy["components"]:
+            by_name[component["name"]] = component
+            by_name[component["label"]] = component
+        matrix = np.tile(policy["weights"], (len(weights), 1))
+        for i, scenario in enumerate(weights):
+            for name, weight in scenario.items():
+                component = by_name.get(name)
+                if component is None:
+                    raise ValueError(f"알 수 없는 구성 항목: {name} "
+                                     f"(가능: {', '.join(c['name'] for c in policy['components'])})")
+                matrix[i, component["start"]:component["stop"]] = weight
+        return matrix
+    matrix = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    if matrix.ndim != 2 or matrix.shape[1] != policy["columns"]:
+        raise ValueError(f"가중치 행렬은 (시나리오 수 × {policy['columns']}) 형태여야 합니다: {matrix.shape}")
+    return matrix
+
+def _cutoff_table(cutoffs):
+    """
+    학점 기준 목록을 (학점 이름, 시나리오 × 기준 수 배열)로 변환
+
+    Args:
+        cutoffs (Mapping | list): {학점: 최소 총점} 또는 그 리스트 (모두 같은 학점 이름)
+
+    Returns:
+        tuple: (학점 이름 튜플 (높은 학점부터, 마지막은 FAIL_GRADE), 기준 배열 (내림차순))
+
+    Raises:
+        ValueError: 학점 이름이 서로 다르거나 비어 있는 경우
+    """
+    if isinstance(cutoffs, Mapping):
+        cutoffs = [cutoffs]
+    if not cutoffs:
+        raise ValueError("학점 기준이 비어 있습니다")
+    labels = tuple(sorted(cutoffs[0], key=lambda label: -cutoffs[0][label]))
+    if not labels:
+        raise ValueError("학점 기준이 비어 있습니다")
+    for cutoff in cutoffs:
+        if set(cutoff) != set(labels):
+            raise ValueError(f"모든 학점 기준은 같은 학점을 가져야 합니다: {sorted(labels)} / {sorted(cutoff)}")
+    table = np.array([[float(cutoff[label]) for label in labels] for cutoff in cutoffs])
+    return labels + (FAIL_GRADE,), table
+
+def _total_units(matrix, weights, policy):
+    """
+    (시나리오 × 학생) 총점을 반올림 단위(10^-rounding)의 정수로 계산
+
+    grades.calc_scores와 같은 값을 냅니다. 정수 점수는 정수 가중치 행렬 곱으로 정확히 계산하고,
+    반올림 경계(x.xx5)인 칸과 소수 점수 행만 정책 공식(_reference_units)으로 다시 계산합니다.
+    가중치를 소수 6자리 안의 정수로 바꿀 수 없으면 부동소수점 곱 뒤 numpy 반올림을 사용합니다.
+
+    Args:
+        matrix (numpy.ndarray): 학생 수 × 열 수 점수 행렬
+        weights (numpy.ndarray): 시나리오 수 × 열 수 가중치 행렬 (%)
+        policy (Mapping): 컴파일된 정책 (반올림 자릿수, 구성 항목)
+
+    Returns:
+        numpy.ndarray: 시나리오 수 × 학생 수 int64 배열 (총점 × 10^rounding, 시나리오별 연속 행)
+    """
+    digits = policy["rounding"]
+    decimals = weight_decimals(weights)
+    if decimals is None:
+        weighted = (matrix.astype(np.float64) @ weights.T / 100).T
+        return np.rint(np.round(weighted, digits) * 10 ** digits).astype(np.int64)
+    if matrix.dtype.kind in "biu":
+        integral = None
+        int_matrix = matrix
+    else:
+        integral = np.all(matrix == np.floor(matrix), axis=1)
+        int_matrix = np.where(integral[:, None], matrix, 0)
+    int_weights = np.rint(weights * 10 ** decimals).astype(np.int64)
+    # 정수 가중치 곱 → 총점 × 10^(2 + decimals) (오차 없음)
+    bound = int(np.abs(int_matrix).max(initial=0)) * int(np.abs(int_weights).sum(axis=1).max(initial=0))
+    if bound < _FLOAT_EXACT:
+        # 모든 부분합이 2^53 미만의 정수이면 float64 행렬 곱(BLAS)도 정확함
+        raw = np.rint(int_weights.astype(np.float64) @ int_matrix.T.astype(np.float64)).astype(np.int64)
+    else:
+        raw = int_weights @ int_matrix.T.astype(np.int64)
+    shift = 2 + decimals - digits
+    if shift <= 0:
+        units = raw * 10 ** -shift
+        fallback = None
+    else:
+        unit = 10 ** shift
+        units, remainder = np.divmod(raw, unit)
+        units += remainder > unit // 2
+        fallback = remainder == unit // 2
+    if integral is not None and not integral.all():
+        fallback = ~integral[None, :] if fallback is None else fallback | ~integral[None, :]
+    if fallback is not None:
+        scenario_index, student_index = np.nonzero(fallback)
+        if len(student_index):
+            units[scenario_index, student_index] = _reference_units(
+                matrix, weights, policy, scenario_index, student_index)
+    return units
+
+def _reference_units(matrix, weights, policy, scenario_index, student_index):
+    """
+    정책 공식의 부동소수점 계산과 round로 (시나리오, 학생) 칸의 총점 단위 계산
+
+    grades._reference_total과 같은 순서로 계산합니다: 구성 항목 합계 × 가중치 / 100을 차례로 더함.
+    한 구성 항목 안의 열 가중치가 서로 다른 시나리오는 열마다 점수 × 가중치 / 100을 더합니다.
+    """
+    digits = policy["rounding"]
+    scores = matrix[student_index]
+    totals = np.zeros(len(student_index), dtype=np.float64)
+    for component in policy["components"]:
+        start, stop = component["start"], component["stop"]
+        block = weights[scenario_index, start:stop]
+        part = 0
+        by_column = 0
+        for column in range(start, stop):
+            part = part + scores[:, column]
+            by_column = by_column + scores[:, column] * block[:, column - start] / 100
+        uniform = np.all(block == block[:, :1], axis=1)
+        totals = totals + np.where(uniform, part * block[:, 0] / 100, by_column)
+    # Python round는 십진 표현 기준으로 반올림 (calc_score와 같음), 같은 값은 한 번만 반올림
+    distinct, inverse = np.unique(totals, return_inverse=True)
+    rounded = np.array([round(round(total, digits) * 10 ** digits) for total in distinct.tolist()],
+                       dtype=np.int64)
+    return rounded[inverse]
+
+def _competition_ranks(units):
+    """
+    정수 총점 배열의 등수 (자신보다 높은 점수의 개수 + 1)
+
+    총점 범위가 좁으면 계수 정렬(bincount)로, 넓으면 정렬과 이진 탐색으로 계산합니다.
+    """
+    n = len(units)
+    if n == 0:
+        return np.zeros(0, dtype=np.int32)
+    low = int(units.min())
+    span = int(units.max()) - low + 1
+    if span <= max(_COUNTING_RANGE, 4 * n):
+        offsets = units - low
+        # 자신 이하 점수의 개수 → 자신보다 높은 점수의 개수
+        at_or_below = np.cumsum(np.bincount(offsets, minlength=span))
+        return (n - at_or_below[offsets] + 1).astype(np.int32)
+    ascending = np.sort(units)
+    return (n - np.searchsorted(ascending, units, side="right") + 1).astype(np.int32)
+
+def _evaluate(units, threshold_units, grade_count):
+    """한 시나리오의 등수, 학점 번호(0이 가장 높은 학점), 학점별 인원"""
+    ranks = _competition_ranks(units)
+    # 자신보다 높은 기준의 수 → 학점 번호 (기준은 몇 개뿐이므로 비교가 이진 탐색보다 빠름)
+    grade_index = np.zeros(len(units), dtype=np.int8)
+    for threshold in threshold_units.tolist():
+        grade_index += units < threshold
+    distribution = np.bincount(grade_index, minlength=grade_count)
+    return ranks, grade_index, distribution
+
+def _top_by_rank(indices, ranks, limit):
+    """학생 번호 중 등수가 높은 limit명 (등수, 학생 순서로 정렬)"""
+    if limit <= 0:
+        return indices[:0]
+    if len(indices) > limit:
+        # 전체 정렬 대신 상위 limit개만 골라 정렬
+        indices = np.sort(indices[np.argpartition(ranks[indices], limit - 1)[:limit]])
+    return indices[np.argsort(ranks[indices], kind="stable")]
+
+def _threshold_units(thresholds, digits):
+    """학점 기준(내림차순)을 반올림 단위의 정수로 변환 (총점 ≥ 기준 ⇔ 단위 총점 ≥ 변환값)"""
+    return np.ceil(np.round(thresholds * 10 ** digits, 6)).astype(np.int64)
+
+def simulate_section(section, weights=None, cutoffs=None, baseline_cutoffs=None,
+                     max_crossers=MAX_CROSSERS, return_arrays=False):
+    """
+    분반 스냅샷에 여러 가중치·학점 기준 시나리오를 한 번에 적용
+
+    Args:
+        section (Mapping): 분반 스냅샷 (grades.build_section_snapshot 결과)
+        weights: 가중치 후보 (scenario_weights 참고, 기본값: 현재 정책 가중치)
+        cutoffs (Mapping | list, optional): 학점 기준 또는 시나리오별 학점 기준 리스트
+            (기본값: DEFAULT_CUTOFFS). 가중치와 학점 기준 중 하나가 한 개이면 모든 시나리오에 공통 적용
+        baseline_cutoffs (Mapping, optional): 기준선의 학점 기준 (기본값: 첫 번째 학점 기준)
+        max_crossers (int): 시나리오별로 돌려줄 경계 이동 학생 수 (시나리오 등수 순)
+        return_arrays (bool): 학생별 총점·등수·학점 배열 포함 여부 (메모리 사용 주의)
+
+    Returns:
+        dict: 시뮬레이션 결과
+            - count (int): 학생 수
+            - grades (tuple): 학점 이름 (높은 학점부터)
+            - baseline (dict): 현재 정책 가중치 결과 (weights, cutoffs, distribution, pass_rate)
+            - scenarios (list): 시나리오별 결과
+                - weights (list), cutoffs (dict): 적용한 가중치(열별 %)와 학점 기준
+                - distribution (dict): {학점: 인원}
+                - pass_rate (float): FAIL_GRADE가 아닌 학생 비율 (%)
+                - pass_rate_change (float): 기준선 대비 통과율 변화 (%p)
+                - rank_shift (dict): changed(등수가 바뀐 학생 수), mean_abs, max_rise, max_drop
+                - crossers_count, promoted, demoted (int): 학점이 바뀐 학생 수 (오름/내림)
+                - crossers (list): [{student_id, from, to, total_before, total_after,
+                                     rank_before, rank_after}]
+
+    Raises:
+        ValueError: 가중치·학점 기준 형식이 잘못되었거나 시나리오 수가 맞지 않는 경우
+    """
+    policy = section["policy"]
+    digits = policy["rounding"]
+    student_ids = section["student_ids"]
+    matrix = section["matrix"]
+    n = len(student_ids)
+
+    weight_matrix = scenario_weights(policy, weights)
+    labels, thresholds = _cutoff_table(DEFAULT_CUTOFFS if cutoffs is None else cutoffs)
+    scenario_count = max(len(weight_matrix), len(thresholds))
+    for name, rows in (("가중치", weight_matrix), ("학점 기준", thresholds)):
+        if len(rows) not in (1, scenario_count):
+            raise ValueError(f"{name} 시나리오 수({len(rows)})가 다른 쪽({scenario_count})과 맞지 않습니다")
+    if baseline_cutoffs is None:
+        baseline_thresholds = thresholds[0]
+    else:
+        baseline_labels, baseline_table = _cutoff_table(baseline_cutoffs)
+        if baseline_labels != labels:
+            raise ValueError("기준선 학점 기준은 시나리오와 같은 학점을 가져야 합니다")
+        baseline_thresholds = baseline_table[0]
+    scale = 10 ** digits
+
+    def cutoff_dict(row):
+        return {label: float(value) for label, value in zip(labels, row)}
+
+    def summarize(distribution):
+        counts = {label: int(count) for label, count in zip(labels, distribution.tolist())}
+        passed = n - counts[FAIL_GRADE]
+        return counts, round(passed / n * 100, 2) if n else 0.0
+
+    # 기준선: 스냅샷의 총점 그대로 (현재 정책 가중치의 시나리오는 변화 0)
+    base_units = np.rint(section["totals"] * scale).astype(np.int64)
+    base_ranks, base_grade, base_distribution = _evaluate(
+        base_units, _threshold_units(baseline_thresholds, digits), len(labels))
+    base_counts, base_pass_rate = summarize(base_distribution)
+    result = {
+        "count": n,
+        "grades": labels,
+        "baseline": {
+            "weights": policy["weights"].tolist(),
+            "cutoffs": cutoff_dict(baseline_thresholds),
+            "distribution": base_counts,
+            "pass_rate": base_pass_rate,
+        },
+        "scenarios": [],
+    }
+    if return_arrays:
+        result["baseline"].update(totals=base_units / scale, ranks=base_ranks, grade_index=base_grade)
+
+    chunk = max(1, CHUNK_ELEMENTS // max(n, 1))
+    for start in range(0, scenario_count, chunk):
+        stop = min(start + chunk, scenario_count)
+        if len(weight_matrix) == 1:
+            units_chunk = np.repeat(_total_units(matrix, weight_matrix, policy), stop - start, axis=0)
+        else:
+            units_chunk = _total_units(matrix, weight_matrix[start:stop], policy)
+        for offset, i in enumerate(range(start, stop)):
+            units = units_chunk[offset]
+            row = thresholds[i if len(thresholds) > 1 else 0]
+            ranks, grade_index, distribution = _evaluate(
+                units, _threshold_units(row, digits), len(labels))
+            counts, pass_rate = summarize(distribution)
+            shift = base_ranks - ranks
+            crossed = np.flatnonzero(grade_index != base_grade)
+            shown = _top_by_rank(crossed, ranks, max_crossers)
+            scenario = {
+                "index": i,
+                "weights": weight_matrix[i if len(weight_matrix) > 1 else 0].tolist(),
+                "cutoffs": cutoff_dict(row),
+                "distribution": counts,
+                "pass_rate": pass_rate,
+                "pass_rate_change": round(pass_rate - base_pass_rate, 2),
+                "rank_shift": {
+                    "changed": int(np.count_nonzero(shift)),
+                    "mean_abs": round(float(np.abs(shift).mean()), 3) if n else 0.0,
+                    "max_rise": int(shift.max()) if n else 0,
+                    "max_drop": int(-shift.min()) if n else 0,
+                },
+                "crossers_count": len(crossed),
+                "promoted": int(np.count_nonzero(grade_index[crossed] < base_grade[crossed])),
+                "demoted": int(np.count_nonzero(grade_index[crossed] > base_grade[crossed])),
+                "crossers": [
+                    {
+                        "student_id": student_ids[j],
+                        "from": labels[base_grade[j]],
+                        "to": labels[grade_index[j]],
+                        "total_before": base_units[j] / scale,
+                        "total_after": units[j] / scale,
+                        "rank_before": int(base_ranks[j]),
+                        "rank_after": int(ranks[j]),
+                    }
+                    for j in shown.tolist()
+                ],
+            }
+            if return_arrays:
+                scenario.update(totals=units / scale, ranks=ranks, grade_index=grade_index)
+            result["scenarios"].append(scenario)
+    return result
+
+def simulate(class_name, weights=None, cutoffs=None, baseline_cutoffs=None,
+             max_crossers=MAX_CROSSERS, return_arrays=False, snapshot=None):
+    """
+    분반에 여러 가중치·학점 기준 시나리오를 한 번에 적용 (simulate_section 참고)
+
+    Args:
+        class_name (str): 분반 이름
+        snapshot (Mapping, optional): 읽을 스냅샷 (기본값: 현재 스냅샷)
+        나머지 인자는 simulate_section과 같음
+
+    Returns:
+        dict: simulate_section 결과에 class_name, version 추가
+
+    Raises:
+        KeyError: 없는 분반
+        ValueError: 가중치·학점 기준 형식이 잘못된 경우
+    """
+    snapshot = snapshot or grades.get_snapshot()
+    if class_name not in snapshot["sections"]:
+        raise KeyError(class_name)
+    result = simulate_section(snapshot["sections"][class_name], weights, cutoffs, baseline_cutoffs,
+                              max_crossers, return_arrays)
+    return {"class_name": class_name, "version": snapshot["version"], **result}
+
+def main():
+    """명령행 진입점: 시나리오 파일로 시뮬레이션하고 요약 출력"""
+    parser = argparse.ArgumentParser(description="가중치·학점 기준 변경 시뮬레이션")
+    parser.add_argument("class_name", help="분반 이름")
+    parser.add_argument("scenarios", help='시나리오 JSON 파일 ({"weights": [...], "cutoffs": [...]})')
+    parser.add_argument("--max-crossers", type=int, default=MAX_CROSSERS,
+                        help="시나리오별 경계 이동 학생 수")
+    parser.add_argument("-o", "--output", help="전체 결과 JSON 파일 경로")
+    args = parser.parse_args()
+
+    with open(args.scenarios, encoding="utf-8") as f:
+        spec = json.load(f)
+    result = simulate(args.class_name, spec.get("weights"), spec.get("cutoffs"),
+                      spec.get("baseline_cutoffs"), args.max_crossers)
+    baseline = result["baseline"]
+    print(f"{result['class_name']} ({result['count']}명) 기준선: 통과율 {baseline['pass_rate']}% "
+          f"{baseline['distribution']}")
+    for scenario in result["scenarios"]:
+        shift = scenario["rank_shift"]
+        print(f"#{scenario['index']}: 통과율 {scenario['pass_rate']}% ({scenario['pass_rate_change']:+}%p) "
+              f"{scenario['distribution']} | 등수 변화 {shift['changed']}명 "
+              f"(평균 {shift['mean_abs']}, 최대 +{shift['max_rise']}/-{shift['max_drop']}) | "
+              f"학점 변경 {scenario['crossers_count']}명 (↑{scenario['promoted']} ↓{scenario['demoted']})")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
+
+if __name__ == "__main__":
+    main()